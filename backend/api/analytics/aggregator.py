@@ -3,8 +3,10 @@ Data aggregation utilities for analytics dashboard.
 Processes raw metrics and events into aggregated statistics for efficient display.
 """
 
-from django.db.models import Avg, Count, Max, F, Q, Sum
+from django.db.models import Avg, Count, Max, F, Q, Sum, Window
+from django.db.models.functions import RowNumber, TruncDate
 from django.contrib.auth.models import User
+from django.db import transaction
 from django.utils import timezone
 import datetime
 import json
@@ -16,6 +18,7 @@ from .models import (
     AuditEvent, 
     DailyMetricAggregate,
     QueryTypeAggregate,
+    QueryTypeSummary,
     SecurityEvent
 )
 
@@ -36,72 +39,98 @@ class MetricsAggregator:
             # Default to yesterday
             date = (timezone.now() - datetime.timedelta(days=1)).date()
         
-        # Define date range for the day
+        daily_agg = cls.aggregate_range(date, date + datetime.timedelta(days=1))[0]
+        
+        # Additional metrics
         start_datetime = datetime.datetime.combine(date, datetime.time.min)
         end_datetime = datetime.datetime.combine(date, datetime.time.max)
+        daily_agg.metadata = cls._calculate_additional_metrics(start_datetime, end_datetime)
         
-        # Get or create the daily aggregate object
-        daily_agg, created = DailyMetricAggregate.objects.get_or_create(date=date)
-        
-        # Count total queries
-        query_logs = UserActivityLog.objects.filter(
-            activity_type='query',
-            timestamp__gte=start_datetime,
-            timestamp__lte=end_datetime
-        )
-        daily_agg.total_queries = query_logs.count()
-        
-        # Count unique users
-        daily_agg.unique_users = UserActivityLog.objects.filter(
-            timestamp__gte=start_datetime,
-            timestamp__lte=end_datetime
-        ).values('user').distinct().count()
-        
-        # Calculate average response time
-        response_time_metrics = SystemMetric.objects.filter(
-            metric_type='response_time',
-            timestamp__gte=start_datetime,
-            timestamp__lte=end_datetime
-        )
-        if response_time_metrics.exists():
-            daily_agg.avg_response_time = response_time_metrics.aggregate(avg=Avg('value'))['avg']
-            daily_agg.max_response_time = response_time_metrics.aggregate(max=Max('value'))['max']
-        
-        # Count document uploads
-        daily_agg.document_uploads = UserActivityLog.objects.filter(
-            activity_type='document_upload',
-            timestamp__gte=start_datetime,
-            timestamp__lte=end_datetime
-        ).count()
+        return daily_agg
+    
+    @classmethod
+    def aggregate_range(cls, start_date, end_date):
+        """
+        Aggregate daily metrics for every day in [start_date, end_date).
+        Each source table is scanned once for the whole range and grouped
+        by day, then all DailyMetricAggregate rows are upserted together.
         
-        # Count document views
-        daily_agg.document_views = UserActivityLog.objects.filter(
-            activity_type='document_view',
-            timestamp__gte=start_datetime,
-            timestamp__lte=end_datetime
-        ).count()
+        Returns:
+            list: DailyMetricAggregate objects ordered by date
+        """
+        start_datetime = datetime.datetime.combine(start_date, datetime.time.min)
+        end_datetime = datetime.datetime.combine(end_date, datetime.time.min)
         
-        # Count errors
-        daily_agg.error_count = UserActivityLog.objects.filter(
-            status='failure',
-            timestamp__gte=start_datetime,
-            timestamp__lte=end_datetime
-        ).count()
+        # Activity counts per day in a single pass over the activity log
+        activity_by_day = {
+            row['day']: row
+            for row in UserActivityLog.objects.filter(
+                timestamp__gte=start_datetime,
+                timestamp__lt=end_datetime
+            ).annotate(day=TruncDate('timestamp')).values('day').annotate(
+                total_queries=Count('id', filter=Q(activity_type='query')),
+                unique_users=Count('user', distinct=True),
+                anonymous_entries=Count('id', filter=Q(user__isnull=True)),
+                document_uploads=Count('id', filter=Q(activity_type='document_upload')),
+                document_views=Count('id', filter=Q(activity_type='document_view')),
+                error_count=Count('id', filter=Q(status='failure')),
+            )
+        }
         
-        # Count PII detections
-        daily_agg.pii_detection_count = AuditEvent.objects.filter(
-            event_type='pii_detection',
-            timestamp__gte=start_datetime,
-            timestamp__lte=end_datetime
-        ).count()
+        # Average response time per day
+        response_times_by_day = {
+            row['day']: row['avg']
+            for row in SystemMetric.objects.filter(
+                metric_type='response_time',
+                timestamp__gte=start_datetime,
+                timestamp__lt=end_datetime
+            ).annotate(day=TruncDate('timestamp')).values('day').annotate(
+                avg=Avg('value'),
+            )
+        }
         
-        # Additional metrics
-        daily_agg.metadata = cls._calculate_additional_metrics(start_datetime, end_datetime)
+        # PII detections per day
+        pii_by_day = {
+            row['day']: row['count']
+            for row in AuditEvent.objects.filter(
+                event_type='pii_detection',
+                timestamp__gte=start_datetime,
+                timestamp__lt=end_datetime
+            ).annotate(day=TruncDate('timestamp')).values('day').annotate(count=Count('id'))
+        }
         
-        # Save the updated aggregate
-        daily_agg.save()
+        aggregates = []
+        date = start_date
+        while date < end_date:
+            activity = activity_by_day.get(date, {})
+            aggregates.append(
+                DailyMetricAggregate(
+                    date=date,
+                    total_queries=activity.get('total_queries', 0),
+                    # Anonymous activity counts as one distinct "user", matching
+                    # the previous values('user').distinct() semantics
+                    unique_users=activity.get('unique_users', 0) + (1 if activity.get('anonymous_entries') else 0),
+                    avg_response_time=response_times_by_day.get(date),
+                    document_uploads=activity.get('document_uploads', 0),
+                    document_views=activity.get('document_views', 0),
+                    error_count=activity.get('error_count', 0),
+                    pii_detection_count=pii_by_day.get(date, 0),
+                )
+            )
+            date += datetime.timedelta(days=1)
+        
+        DailyMetricAggregate.objects.bulk_create(
+            aggregates,
+            update_conflicts=True,
+            unique_fields=['date'],
+            update_fields=[
+                'total_queries', 'unique_users', 'avg_response_time',
+                'document_uploads', 'document_views', 'error_count',
+                'pii_detection_count',
+            ],
+        )
         
-        return daily_agg
+        return aggregates
     
     @classmethod
     def _calculate_additional_metrics(cls, start_datetime, end_datetime):
@@ -150,52 +179,39 @@ class MetricsAggregator:
         
         return metadata
     
+    # Category patterns used to classify query text
+    QUERY_CATEGORY_PATTERNS = {
+        'protocol': r'protocol|procedure|method|how to|steps|recipe',
+        'troubleshooting': r'error|issue|problem|fail|trouble|not working|debug',
+        'reagent': r'reagent|chemical|solution|buffer|media|enzyme',
+        'equipment': r'machine|device|equipment|instrument|apparatus',
+        'theory': r'theory|concept|principle|mechanism|explain',
+        'reference': r'paper|publication|journal|reference|cite|author',
+        'calculation': r'calculate|compute|equation|formula|concentration|dilution',
+        'safety': r'safety|hazard|danger|precaution|protection',
+        'technique': r'technique|assay|analysis|test|measurement',
+    }
+    
     @classmethod
-    def aggregate_query_types(cls, date=None, num_days=1):
+    def _categorize_queries(cls, query_texts):
         """
-        Analyze and aggregate query types/categories.
-        Groups queries into categories based on content analysis.
-        """
-        if date is None:
-            date = (timezone.now() - datetime.timedelta(days=1)).date()
-        
-        # Get date range
-        start_datetime = datetime.datetime.combine(date - datetime.timedelta(days=num_days-1), datetime.time.min)
-        end_datetime = datetime.datetime.combine(date, datetime.time.max)
-        
-        # Get all query activities with text
-        query_logs = UserActivityLog.objects.filter(
-            activity_type='query',
-            timestamp__gte=start_datetime,
-            timestamp__lte=end_datetime
-        ).exclude(metadata__query_text__isnull=True)
-        
-        # Define category patterns
-        category_patterns = {
-            'protocol': r'protocol|procedure|method|how to|steps|recipe',
-            'troubleshooting': r'error|issue|problem|fail|trouble|not working|debug',
-            'reagent': r'reagent|chemical|solution|buffer|media|enzyme',
-            'equipment': r'machine|device|equipment|instrument|apparatus',
-            'theory': r'theory|concept|principle|mechanism|explain',
-            'reference': r'paper|publication|journal|reference|cite|author',
-            'calculation': r'calculate|compute|equation|formula|concentration|dilution',
-            'safety': r'safety|hazard|danger|precaution|protection',
-            'technique': r'technique|assay|analysis|test|measurement',
-        }
+        Group query texts into categories.
         
+        Returns:
+            dict: category -> {'count': int, 'examples': list}
+        """
         # Initialize counters
-        category_data = {cat: {'count': 0, 'examples': []} for cat in category_patterns.keys()}
+        category_data = {cat: {'count': 0, 'examples': []} for cat in cls.QUERY_CATEGORY_PATTERNS.keys()}
         category_data['other'] = {'count': 0, 'examples': []}
         
         # Analyze each query
-        for log in query_logs:
-            query_text = log.metadata.get('query_text', '')
+        for query_text in query_texts:
             if not query_text:
                 continue
             
             # Check each category pattern
             categorized = False
-            for category, pattern in category_patterns.items():
+            for category, pattern in cls.QUERY_CATEGORY_PATTERNS.items():
                 if re.search(pattern, query_text, re.IGNORECASE):
                     category_data[category]['count'] += 1
                     if len(category_data[category]['examples']) < 5:  # Limit examples
@@ -209,20 +225,162 @@ class MetricsAggregator:
                 if len(category_data['other']['examples']) < 5:
                     category_data['other']['examples'].append(query_text[:100])
         
-        # Save aggregated data
+        return category_data
+    
+    @classmethod
+    def _save_query_types(cls, date, category_data):
+        """
+        Persist non-empty categories for a day, keeping cumulative counts
+        consistent for the day itself and every later day
+        """
         for category, data in category_data.items():
             if data['count'] > 0:
-                QueryTypeAggregate.objects.update_or_create(
-                    category=category,
-                    date=date,
-                    defaults={
-                        'count': data['count'],
-                        'examples': data['examples']
-                    }
-                )
+                with transaction.atomic():
+                    previous_count = QueryTypeAggregate.objects.filter(
+                        category=category,
+                        date=date
+                    ).values_list('count', flat=True).first() or 0
+                    
+                    cumulative_before = QueryTypeAggregate.objects.filter(
+                        category=category,
+                        date__lt=date
+                    ).order_by('-date').values_list('cumulative_count', flat=True).first() or 0
+                    
+                    QueryTypeAggregate.objects.update_or_create(
+                        category=category,
+                        date=date,
+                        defaults={
+                            'count': data['count'],
+                            'cumulative_count': cumulative_before + data['count'],
+                            'examples': data['examples']
+                        }
+                    )
+                    
+                    delta = data['count'] - previous_count
+                    if delta:
+                        QueryTypeAggregate.objects.filter(
+                            category=category,
+                            date__gt=date
+                        ).update(cumulative_count=F('cumulative_count') + delta)
+    
+    @classmethod
+    def get_query_type_totals(cls, start_date, end_date):
+        """
+        Get per-category query totals for [start_date, end_date] (inclusive).
+        Each total is the cumulative count at the end of the range minus the
+        cumulative count before its start, so the cost does not grow with
+        the length of the range.
+        
+        Returns:
+            list: {'category', 'total'} dicts ordered by total, descending
+        """
+        def latest_cumulative(**date_filter):
+            return dict(
+                QueryTypeAggregate.objects.filter(**date_filter).annotate(
+                    row_number=Window(
+                        expression=RowNumber(),
+                        partition_by=[F('category')],
+                        order_by=F('date').desc()
+                    )
+                ).filter(row_number=1).values_list('category', 'cumulative_count')
+            )
+        
+        at_end = latest_cumulative(date__lte=end_date)
+        before_start = latest_cumulative(date__lt=start_date)
+        
+        totals = [
+            {'category': category, 'total': cumulative - before_start.get(category, 0)}
+            for category, cumulative in at_end.items()
+        ]
+        return sorted(
+            [item for item in totals if item['total'] > 0],
+            key=lambda item: item['total'],
+            reverse=True
+        )
+    
+    @classmethod
+    def aggregate_query_types(cls, date=None, num_days=1):
+        """
+        Analyze and aggregate query types/categories.
+        Groups queries into categories based on content analysis.
+        """
+        if date is None:
+            date = (timezone.now() - datetime.timedelta(days=1)).date()
+        
+        # Get date range
+        start_datetime = datetime.datetime.combine(date - datetime.timedelta(days=num_days-1), datetime.time.min)
+        end_datetime = datetime.datetime.combine(date, datetime.time.max)
+        
+        # Get all query activities with text
+        query_logs = UserActivityLog.objects.filter(
+            activity_type='query',
+            timestamp__gte=start_datetime,
+            timestamp__lte=end_datetime
+        ).exclude(metadata__query_text__isnull=True)
+        
+        category_data = cls._categorize_queries(
+            log.metadata.get('query_text', '') for log in query_logs
+        )
+        
+        # Save aggregated data
+        cls._save_query_types(date, category_data)
         
         return category_data
     
+    @classmethod
+    def aggregate_query_types_range(cls, start_date, end_date):
+        """
+        Aggregate query types for every day in [start_date, end_date)
+        from a single scan of the activity log.
+        
+        Returns:
+            dict: date -> category data
+        """
+        start_datetime = datetime.datetime.combine(start_date, datetime.time.min)
+        end_datetime = datetime.datetime.combine(end_date, datetime.time.min)
+        
+        query_logs = UserActivityLog.objects.filter(
+            activity_type='query',
+            timestamp__gte=start_datetime,
+            timestamp__lt=end_datetime
+        ).exclude(metadata__query_text__isnull=True).annotate(
+            day=TruncDate('timestamp')
+        ).values_list('day', 'metadata')
+        
+        texts_by_day = {}
+        for day, metadata in query_logs:
+            texts_by_day.setdefault(day, []).append(metadata.get('query_text', ''))
+        
+        results = {}
+        for day, query_texts in texts_by_day.items():
+            results[day] = cls._categorize_queries(query_texts)
+            cls._save_query_types(day, results[day])
+        
+        return results
+    
+    @classmethod
+    def refresh_query_type_summary(cls):
+        """
+        Rebuild the rolling QueryTypeSummary table for the last
+        QueryTypeSummary.WINDOW_DAYS days (inclusive of today).
+        """
+        end_date = timezone.now().date()
+        start_date = end_date - datetime.timedelta(days=QueryTypeSummary.WINDOW_DAYS - 1)
+        
+        totals = cls.get_query_type_totals(start_date, end_date)
+        
+        refreshed_at = timezone.now()
+        summaries = [
+            QueryTypeSummary(category=item['category'], total=item['total'], refreshed_at=refreshed_at)
+            for item in totals
+        ]
+        
+        with transaction.atomic():
+            QueryTypeSummary.objects.all().delete()
+            QueryTypeSummary.objects.bulk_create(summaries)
+        
+        return len(summaries)
+    
     @classmethod
     def get_dashboard_summary(cls, days=7):
         """
@@ -11,6 +11,8 @@ from django.utils import timezone
 from django.conf import settings
 from django.db import transaction
 from django.contrib.auth.models import User, AnonymousUser
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.dateparse import parse_datetime
 
 from .models import (
     SystemMetric,
@@ -21,6 +23,9 @@ from .models import (
 
 logger = logging.getLogger(__name__)
 
+# Audit events are buffered here and written by flush_audit_events
+AUDIT_EVENT_BUFFER_KEY = 'audit_events'
+
 
 class MetricsCollector:
     """
@@ -396,6 +401,9 @@ class AuditCollector:
             ip_address: IP address related to the event (optional)
             severity: Event severity (info, warning, error, critical)
             details: Additional details as dictionary (optional)
+        
+        The event is queued in Redis for the next flush_audit_events run,
+        falling back to a direct insert if Redis is unavailable.
         """
         details = details or {}
         
@@ -403,20 +411,42 @@ class AuditCollector:
             # Don't store user object for anonymous users
             user_obj = None if isinstance(user, AnonymousUser) else user
             
-            AuditEvent.objects.create(
-                event_type=event_type,
-                user=user_obj,
-                timestamp=timezone.now(),
-                ip_address=ip_address,
-                description=description,
-                severity=severity,
-                details=details
-            )
+            data = {
+                'event_type': event_type,
+                'user_id': user_obj.pk if user_obj is not None else None,
+                'timestamp': timezone.now().isoformat(),
+                'ip_address': ip_address,
+                'description': description,
+                'severity': severity,
+                'details': details,
+            }
+            
+            try:
+                from django_redis import get_redis_connection
+                get_redis_connection('default').lpush(
+                    AUDIT_EVENT_BUFFER_KEY, json.dumps(data, cls=DjangoJSONEncoder)
+                )
+            except Exception as e:
+                logger.warning(f"Could not buffer audit event, writing directly: {str(e)}")
+                cls.build_audit_event(data).save()
             return True
         except Exception as e:
             logger.error(f"Error recording audit event: {str(e)}")
             return False
     
+    @classmethod
+    def build_audit_event(cls, data):
+        """Build an unsaved AuditEvent from a buffered entry"""
+        return AuditEvent(
+            event_type=data['event_type'],
+            user_id=data.get('user_id'),
+            timestamp=parse_datetime(data['timestamp']),
+            ip_address=data.get('ip_address'),
+            description=data['description'],
+            severity=data.get('severity', 'info'),
+            details=data.get('details') or {},
+        )
+    
     @classmethod
     def record_authentication_event(cls, success, user=None, username=None, 
                                    ip_address=None, details=None):
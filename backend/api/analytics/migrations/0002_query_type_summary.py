@@ -0,0 +1,36 @@
+# Generated by Django 4.2.10 on 2026-10-16 19:18
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api_analytics", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="QueryTypeSummary",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("category", models.CharField(max_length=50, unique=True)),
+                ("total", models.PositiveIntegerField(default=0)),
+                (
+                    "refreshed_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+            ],
+            options={
+                "ordering": ["-total"],
+            },
+        ),
+    ]
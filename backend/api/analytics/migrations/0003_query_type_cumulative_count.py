@@ -0,0 +1,27 @@
+from django.db import migrations, models
+
+
+def backfill_cumulative_counts(apps, schema_editor):
+    QueryTypeAggregate = apps.get_model("api_analytics", "QueryTypeAggregate")
+    running_totals = {}
+    updated = []
+    for aggregate in QueryTypeAggregate.objects.order_by("category", "date").iterator():
+        running_totals[aggregate.category] = running_totals.get(aggregate.category, 0) + aggregate.count
+        aggregate.cumulative_count = running_totals[aggregate.category]
+        updated.append(aggregate)
+    QueryTypeAggregate.objects.bulk_update(updated, ["cumulative_count"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api_analytics", "0002_query_type_summary"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="querytypeaggregate",
+            name="cumulative_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_cumulative_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+from django.db import migrations
+
+# Append-only event tables whose timestamp column grows monotonically
+BRIN_INDEXED_MODELS = ("SystemMetric", "AuditEvent", "SecurityEvent")
+
+
+def _brin_index_name(model):
+    return f"{model._meta.db_table}_timestamp_brin"
+
+
+def create_brin_indexes(apps, schema_editor):
+    # BRIN is PostgreSQL-only; other backends keep the B-tree timestamp index
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for model_name in BRIN_INDEXED_MODELS:
+        model = apps.get_model("api_analytics", model_name)
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS %s ON %s USING brin (%s)" % (
+                schema_editor.quote_name(_brin_index_name(model)),
+                schema_editor.quote_name(model._meta.db_table),
+                schema_editor.quote_name("timestamp"),
+            )
+        )
+
+
+def drop_brin_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for model_name in BRIN_INDEXED_MODELS:
+        model = apps.get_model("api_analytics", model_name)
+        schema_editor.execute(
+            "DROP INDEX IF EXISTS %s" % schema_editor.quote_name(_brin_index_name(model))
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api_analytics", "0003_query_type_cumulative_count"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_brin_indexes, drop_brin_indexes),
+    ]
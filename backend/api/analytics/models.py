@@ -166,6 +166,9 @@ class QueryTypeAggregate(models.Model):
     category = models.CharField(max_length=50)
     date = models.DateField()
     count = models.PositiveIntegerField(default=0)
+    # Running total of count for this category up to and including date,
+    # so any date range total is a difference of two rows
+    cumulative_count = models.PositiveIntegerField(default=0)
     avg_confidence = models.FloatField(null=True, blank=True)
     examples = models.JSONField(default=list, blank=True)
     
@@ -181,6 +184,26 @@ class QueryTypeAggregate(models.Model):
         return f"{self.category} queries for {self.date.strftime('%Y-%m-%d')}: {self.count}"
 
 
+class QueryTypeSummary(models.Model):
+    """
+    Rolling per-category query totals over the last WINDOW_DAYS days.
+    Rebuilt periodically from QueryTypeAggregate so the default analytics
+    range is a plain read instead of a GROUP BY on every request.
+    """
+    
+    WINDOW_DAYS = 30
+    
+    category = models.CharField(max_length=50, unique=True)
+    total = models.PositiveIntegerField(default=0)
+    refreshed_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        ordering = ['-total']
+    
+    def __str__(self):
+        return f"{self.category}: {self.total} queries (last {self.WINDOW_DAYS} days)"
+
+
 class SecurityEvent(models.Model):
     """
     Model for storing security-specific events.
@@ -7,9 +7,13 @@ import os
 import time
 import logging
 import psutil
+import requests
+import signal
 import socket
 from django.utils import timezone
 from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
 import multiprocessing
 import threading
 import traceback
@@ -18,6 +22,38 @@ from .models import SystemMetric, SystemStatusLog
 
 logger = logging.getLogger(__name__)
 
+# LLM health probe settings
+OPENAI_MODELS_URL = 'https://api.openai.com/v1/models'
+LLM_PROBE_TIMEOUT = 2.0
+LLM_STATUS_CACHE_KEY = 'monitor_llm_status'
+LLM_STATUS_CACHE_TIMEOUT = 60  # 1 minute
+
+# Probe dependencies are imported once at module load so the check_* methods
+# don't pay the import cost on every monitoring cycle. Missing optional
+# dependencies leave the symbol as None and the matching check reports 'down'.
+try:
+    import redis
+except ImportError:
+    redis = None
+
+try:
+    from celery.app.control import Control
+    from rna_backend.celery import app as celery_app
+except ImportError:
+    Control = None
+    celery_app = None
+
+try:
+    from ..ingestion.embeddings_utils import get_weaviate_client
+except ImportError:
+    get_weaviate_client = None
+
+try:
+    from ..offline import get_llm_client, is_offline_mode
+except ImportError:
+    get_llm_client = None
+    is_offline_mode = None
+
 
 class SystemMonitor:
     """
@@ -26,8 +62,17 @@ class SystemMonitor:
     """
     
     @classmethod
-    def collect_system_metrics(cls):
-        """Collect and store various system performance metrics"""
+    def collect_system_metrics(cls, save=True):
+        """
+        Collect and store various system performance metrics.
+        
+        Args:
+            save (bool): Persist the metrics immediately. Pass False when the
+                caller writes them as part of a larger transaction.
+        
+        Returns:
+            dict: SystemMetric objects keyed by metric_type
+        """
         metrics = []
         
         try:
@@ -74,7 +119,8 @@ class SystemMonitor:
             # Get process metrics
             process = psutil.Process(os.getpid())
             
-            # Process memory usage
+            # Process memory usage (percent derived from the system total
+            # already fetched above rather than a second virtual_memory() read)
             process_memory = process.memory_info()
             metrics.append(
                 SystemMetric(
@@ -83,7 +129,7 @@ class SystemMonitor:
                     unit='MB',
                     metadata={
                         'virtual': process_memory.vms / 1024 / 1024,
-                        'percent': process.memory_percent(),
+                        'percent': process_memory.rss / memory.total * 100.0,
                     }
                 )
             )
@@ -109,48 +155,59 @@ class SystemMonitor:
             )
             
             # Save all metrics
-            SystemMetric.objects.bulk_create(metrics)
-            return metrics
+            if save:
+                SystemMetric.objects.bulk_create(metrics)
+            return {m.metric_type: m for m in metrics}
         except Exception as e:
             logger.error(f"Error collecting system metrics: {e}")
-            return []
+            return {}
     
     @classmethod
-    def check_component_status(cls, component_name, check_function):
+    def _probe_component(cls, component_name, check_function):
         """
-        Check the status of a system component and record the result.
-        
-        Args:
-            component_name (str): Name of the component to check (from SystemStatusLog.COMPONENT_TYPES)
-            check_function (callable): Function that returns (status, message, details)
-                where status is one of 'healthy', 'degraded', 'down'
+        Run a component check without writing anything.
         
         Returns:
-            tuple: (success, status, message)
+            tuple: (unsaved SystemStatusLog, success, status, message)
         """
         try:
             status, message, details = check_function()
             
-            # Record the status
-            SystemStatusLog.objects.create(
+            log = SystemStatusLog(
                 component=component_name,
                 status=status,
                 message=message,
                 details=details or {}
             )
-            return True, status, message
+            return log, True, status, message
         except Exception as e:
             error_msg = f"Error checking {component_name} status: {str(e)}"
             logger.error(error_msg)
             
-            # Record the error
-            SystemStatusLog.objects.create(
+            log = SystemStatusLog(
                 component=component_name,
                 status='down',
                 message=error_msg,
                 details={'traceback': traceback.format_exc()}
             )
-            return False, 'down', error_msg
+            return log, False, 'down', error_msg
+    
+    @classmethod
+    def check_component_status(cls, component_name, check_function):
+        """
+        Check the status of a system component and record the result.
+        
+        Args:
+            component_name (str): Name of the component to check (from SystemStatusLog.COMPONENT_TYPES)
+            check_function (callable): Function that returns (status, message, details)
+                where status is one of 'healthy', 'degraded', 'down'
+        
+        Returns:
+            tuple: (success, status, message)
+        """
+        log, success, status, message = cls._probe_component(component_name, check_function)
+        log.save()
+        return success, status, message
     
     @classmethod
     def check_api_status(cls):
@@ -163,7 +220,8 @@ class SystemMonitor:
         # Simple self-check for API (if this code is running, the API is up)
         process = psutil.Process(os.getpid())
         cpu_percent = process.cpu_percent(interval=0.5)
-        memory_percent = process.memory_percent()
+        vmem = psutil.virtual_memory()
+        memory_percent = process.memory_info().rss / vmem.total * 100.0
         
         details = {
             'pid': os.getpid(),
@@ -187,8 +245,6 @@ class SystemMonitor:
         Returns:
             tuple: (status, message, details)
         """
-        from django.db import connection
-        
         try:
             # Simple query to check connection
             with connection.cursor() as cursor:
@@ -229,8 +285,8 @@ class SystemMonitor:
         Returns:
             tuple: (status, message, details)
         """
-        import redis
-        from django.core.cache import cache
+        if redis is None:
+            return 'down', 'Redis client library not installed', {}
         
         try:
             # Check if Django cache is using Redis
@@ -277,7 +333,8 @@ class SystemMonitor:
         Returns:
             tuple: (status, message, details)
         """
-        from ..ingestion.embeddings_utils import get_weaviate_client
+        if get_weaviate_client is None:
+            return 'down', 'Vector DB client library not available', {}
         
         try:
             # Get Weaviate client
@@ -329,25 +386,23 @@ class SystemMonitor:
         Returns:
             tuple: (status, message, details)
         """
-        from celery.app.control import Control
-        from rna_backend.celery import app as celery_app
+        if celery_app is None:
+            return 'down', 'Celery is not available', {}
         
         try:
             # Check if Celery workers are running
             control = Control(celery_app)
+            inspector = control.inspect(timeout=1.0)
             
             # Get active workers
             start_time = time.time()
-            workers = control.inspect().active()
+            workers = inspector.active()
             query_time_ms = (time.time() - start_time) * 1000
             
             if workers:
-                # Get worker statistics
-                stats = control.inspect().stats()
-                
-                # Count active tasks
+                # Count active tasks from the reply we already have
                 active_tasks = 0
-                for worker_name, tasks in control.inspect().active().items():
+                for worker_name, tasks in workers.items():
                     active_tasks += len(tasks)
                 
                 details = {
@@ -361,9 +416,16 @@ class SystemMonitor:
             else:
                 # Try to check if broker is reachable
                 try:
-                    connection = celery_app.connection()
-                    connection.ensure_connection(max_retries=1)
-                    connection.release()
+                    # Bound the probe to ~1s instead of the broker's default
+                    # connect timeout so a dead broker can't stall the cycle
+                    conn = celery_app.connection_for_read(
+                        connect_timeout=1.0,
+                        transport_options={'socket_timeout': 1.0, 'connect_timeout': 1.0},
+                    )
+                    try:
+                        conn.ensure_connection(max_retries=1, interval_start=0, timeout=1.0)
+                    finally:
+                        conn.release()
                     return 'degraded', 'Celery broker reachable but no active workers', {'broker_reachable': True}
                 except Exception as e:
                     return 'down', 'No Celery workers and broker unreachable', {'broker_error': str(e)}
@@ -378,7 +440,8 @@ class SystemMonitor:
         Returns:
             tuple: (status, message, details)
         """
-        from ..offline import get_llm_client, is_offline_mode
+        if get_llm_client is None:
+            return 'down', 'LLM client factory not available', {}
         
         try:
             # Get LLM client
@@ -394,56 +457,50 @@ class SystemMonitor:
                 details = {'mode': 'offline', 'model': settings.LOCAL_LLM_CONFIG.get('model_name', 'unknown')}
                 return 'healthy', 'Local LLM service available', details
             else:
-                # Try a simple API call
-                start_time = time.time()
+                cached = cache.get(LLM_STATUS_CACHE_KEY)
+                if cached:
+                    return cached
+                
+                # Authenticated GET against the models endpoint: verifies
+                # reachability and the API key without billing any tokens
                 try:
-                    response = client.models.list()
-                    query_time_ms = (time.time() - start_time) * 1000
-                    
-                    details = {
-                        'query_time_ms': query_time_ms,
-                        'mode': 'online',
-                        'model': settings.OPENAI_MODEL,
-                    }
-                    
-                    if query_time_ms > 1000:  # More than 1 second is slow
-                        return 'degraded', 'OpenAI API is responding slowly', details
-                    else:
-                        return 'healthy', 'OpenAI API is healthy', details
-                except Exception as e:
-                    # Try simplified test if models.list() is not available
-                    try:
-                        # Try a very small completion as a connectivity test
-                        response = client.chat.completions.create(
-                            model="gpt-3.5-turbo",
-                            messages=[{"role": "system", "content": "Say hello."}],
-                            max_tokens=1
-                        )
-                        query_time_ms = (time.time() - start_time) * 1000
-                        
-                        details = {
-                            'query_time_ms': query_time_ms,
-                            'mode': 'online',
-                            'model': settings.OPENAI_MODEL,
-                        }
-                        
-                        if query_time_ms > 1000:  # More than 1 second is slow
-                            return 'degraded', 'OpenAI API is responding slowly', details
-                        else:
-                            return 'healthy', 'OpenAI API is healthy', details
-                    except Exception as inner_e:
-                        return 'down', f'OpenAI API error: {str(inner_e)}', {'error': str(inner_e)}
+                    response = requests.get(
+                        OPENAI_MODELS_URL,
+                        headers={'Authorization': f'Bearer {settings.OPENAI_API_KEY}'},
+                        timeout=LLM_PROBE_TIMEOUT,
+                    )
+                except requests.RequestException as e:
+                    return 'down', f'OpenAI API error: {str(e)}', {'error': str(e)}
+                
+                query_time_ms = response.elapsed.total_seconds() * 1000
+                details = {
+                    'query_time_ms': query_time_ms,
+                    'mode': 'online',
+                    'model': settings.OPENAI_MODEL,
+                }
+                
+                if response.status_code != 200:
+                    details['status_code'] = response.status_code
+                    result = ('down', f'OpenAI API returned HTTP {response.status_code}', details)
+                elif query_time_ms > 1000:  # More than 1 second is slow
+                    result = ('degraded', 'OpenAI API is responding slowly', details)
+                else:
+                    result = ('healthy', 'OpenAI API is healthy', details)
+                
+                cache.set(LLM_STATUS_CACHE_KEY, result, LLM_STATUS_CACHE_TIMEOUT)
+                return result
         except Exception as e:
             return 'down', f'LLM service check error: {str(e)}', {'error': str(e)}
     
     @classmethod
-    def check_all_components(cls):
+    def _probe_all_components(cls):
         """
-        Check status of all system components.
+        Check every component without writing anything.
         
         Returns:
-            dict: Component status results
+            tuple: (list of unsaved SystemStatusLog, dict of component results)
         """
+        status_logs = []
         results = {}
         
         # Define components and their check functions
@@ -458,15 +515,55 @@ class SystemMonitor:
         
         # Check each component
         for component, check_func in components.items():
-            success, status, message = cls.check_component_status(component, check_func)
+            log, success, status, message = cls._probe_component(component, check_func)
+            status_logs.append(log)
             results[component] = {
                 'success': success,
                 'status': status,
                 'message': message,
             }
         
+        return status_logs, results
+    
+    @classmethod
+    def check_all_components(cls):
+        """
+        Check status of all system components.
+        
+        Returns:
+            dict: Component status results
+        """
+        status_logs, results = cls._probe_all_components()
+        SystemStatusLog.objects.bulk_create(status_logs)
         return results
     
+    @classmethod
+    def run_monitoring_cycle(cls, stop_event=None):
+        """
+        Collect metrics and check all components, then record everything in
+        a single transaction. Probes run before the transaction opens so no
+        lock is held while waiting on the network.
+        
+        Args:
+            stop_event (threading.Event): Optional event; if it is set once
+                metrics are collected, the component checks are skipped.
+        
+        Returns:
+            tuple: (dict of SystemMetric by metric_type, dict of component results)
+        """
+        metrics_by_type = cls.collect_system_metrics(save=False)
+        
+        if stop_event is not None and stop_event.is_set():
+            status_logs, results = [], {}
+        else:
+            status_logs, results = cls._probe_all_components()
+        
+        with transaction.atomic():
+            SystemMetric.objects.bulk_create(metrics_by_type.values())
+            SystemStatusLog.objects.bulk_create(status_logs)
+        
+        return metrics_by_type, results
+    
     @classmethod
     def get_system_health_summary(cls):
         """
@@ -595,11 +692,8 @@ class BackgroundMonitor:
         """Main monitoring loop"""
         while not self.stop_event.is_set():
             try:
-                # Collect system metrics
-                SystemMonitor.collect_system_metrics()
-                
-                # Check component health
-                SystemMonitor.check_all_components()
+                # Collect system metrics and check component health
+                SystemMonitor.run_monitoring_cycle(stop_event=self.stop_event)
                 
                 logger.debug("Background monitoring cycle completed")
             except Exception as e:
@@ -611,12 +705,39 @@ class BackgroundMonitor:
 
 # Global monitor instance
 monitor = None
+_sigterm_handler_installed = False
+
+def _install_sigterm_handler():
+    """
+    Signal the monitor thread to stop as soon as SIGTERM arrives, then hand
+    the signal on to whatever handler was registered before us.
+    Signal handlers can only be installed from the main thread.
+    """
+    global _sigterm_handler_installed
+    if _sigterm_handler_installed or threading.current_thread() is not threading.main_thread():
+        return
+    
+    previous_handler = signal.getsignal(signal.SIGTERM)
+    
+    def _handle_sigterm(signum, frame):
+        if monitor is not None:
+            monitor.stop_event.set()
+        
+        if callable(previous_handler):
+            previous_handler(signum, frame)
+        elif previous_handler == signal.SIG_DFL:
+            signal.signal(signum, signal.SIG_DFL)
+            os.kill(os.getpid(), signum)
+    
+    signal.signal(signal.SIGTERM, _handle_sigterm)
+    _sigterm_handler_installed = True
 
 def start_background_monitoring():
     """Start the background monitoring thread"""
     global monitor
     if monitor is None:
         monitor = BackgroundMonitor()
+    _install_sigterm_handler()
     monitor.start()
 
 def stop_background_monitoring():
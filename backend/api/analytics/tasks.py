@@ -4,15 +4,89 @@ Scheduled tasks for metrics calculation, report generation, and data cleanup.
 """
 
 from celery import shared_task
+from django.db import DataError, IntegrityError, transaction
 from django.utils import timezone
 import datetime
+import json
 import logging
 
 from .aggregator import MetricsAggregator
+from .collectors import AuditCollector, AUDIT_EVENT_BUFFER_KEY
 from .models import SystemMetric, UserActivityLog, AuditEvent
 
 logger = logging.getLogger(__name__)
 
+AUDIT_EVENT_BATCH_SIZE = 500
+
+# Buffered entries that can't be decoded or inserted are moved here for
+# inspection, keeping at most AUDIT_EVENT_DEAD_LETTER_LIMIT of the newest
+AUDIT_EVENT_DEAD_LETTER_KEY = 'audit_events:dead'
+AUDIT_EVENT_DEAD_LETTER_LIMIT = 10000
+
+
+def _dead_letter_audit_events(redis_client, raws):
+    """Move buffered entries to the dead-letter list"""
+    if raws:
+        pipe = redis_client.pipeline()
+        pipe.lpush(AUDIT_EVENT_DEAD_LETTER_KEY, *raws)
+        pipe.ltrim(AUDIT_EVENT_DEAD_LETTER_KEY, 0, AUDIT_EVENT_DEAD_LETTER_LIMIT - 1)
+        pipe.execute()
+
+
+def _build_audit_events(redis_client, batch):
+    """
+    Build unsaved AuditEvents from a batch of buffered entries.
+    Entries that can't be decoded are moved to the dead-letter list
+    rather than failing the batch.
+    
+    Returns:
+        tuple: (events, and the entries they were built from; both
+            oldest first)
+    """
+    events = []
+    decoded = []
+    dead = []
+    # LPUSH stores newest first, so reverse to insert oldest first
+    for raw in reversed(batch):
+        try:
+            events.append(AuditCollector.build_audit_event(json.loads(raw)))
+            decoded.append(raw)
+        except Exception as e:
+            logger.error(f"Dropping undecodable audit event: {str(e)}")
+            dead.append(raw)
+    
+    _dead_letter_audit_events(redis_client, dead)
+    return events, decoded
+
+
+def _insert_audit_events_individually(redis_client, events, raws):
+    """
+    Insert events one at a time after their batch insert was rejected,
+    moving the entries of rows the database refuses (e.g. a user_id
+    whose user was deleted) to the dead-letter list.
+    
+    Returns:
+        int: Number of events inserted
+    """
+    inserted = 0
+    dead = []
+    for index, (event, raw) in enumerate(zip(events, raws)):
+        try:
+            with transaction.atomic():
+                event.save()
+            inserted += 1
+        except (IntegrityError, DataError) as e:
+            logger.error(f"Dropping audit event rejected by the database: {str(e)}")
+            dead.append(raw)
+        except Exception:
+            # Put the entries not yet inserted back for the next run
+            redis_client.rpush(AUDIT_EVENT_BUFFER_KEY, *reversed(raws[index:]))
+            _dead_letter_audit_events(redis_client, dead)
+            raise
+    
+    _dead_letter_audit_events(redis_client, dead)
+    return inserted
+
 
 @shared_task
 def aggregate_daily_metrics(date_str=None):
@@ -39,6 +113,69 @@ def aggregate_daily_metrics(date_str=None):
         raise
 
 
+@shared_task
+def refresh_query_type_summary():
+    """
+    Rebuild the rolling per-category query totals read by the query
+    analytics endpoint.
+    """
+    try:
+        count = MetricsAggregator.refresh_query_type_summary()
+        logger.info(f"Refreshed query type summary: {count} categories")
+        return f"Refreshed {count} query categories"
+    except Exception as e:
+        logger.error(f"Error refreshing query type summary: {str(e)}")
+        raise
+
+
+@shared_task
+def flush_audit_events(batch_size=AUDIT_EVENT_BATCH_SIZE):
+    """
+    Move buffered audit events from Redis into the database.
+    Pops the oldest entries in batches and inserts each batch with a
+    single bulk_create. Entries that can't be decoded, or rows the
+    database rejects, are moved to AUDIT_EVENT_DEAD_LETTER_KEY instead of
+    blocking the buffer.
+    """
+    from django_redis import get_redis_connection
+    redis_client = get_redis_connection('default')
+    flushed = 0
+    
+    while True:
+        # Read and trim the oldest entries atomically (MULTI/EXEC)
+        pipe = redis_client.pipeline()
+        pipe.lrange(AUDIT_EVENT_BUFFER_KEY, -batch_size, -1)
+        pipe.ltrim(AUDIT_EVENT_BUFFER_KEY, 0, -batch_size - 1)
+        batch, _ = pipe.execute()
+        
+        if not batch:
+            break
+        
+        events, decoded = _build_audit_events(redis_client, batch)
+        try:
+            AuditEvent.objects.bulk_create(events, batch_size=batch_size)
+            flushed += len(events)
+        except (IntegrityError, DataError) as e:
+            # Some row is invalid; bulk_create inserted none of them, so
+            # find it by inserting one at a time
+            logger.warning(f"Audit event batch rejected, inserting individually: {str(e)}")
+            flushed += _insert_audit_events_individually(redis_client, events, decoded)
+        except Exception as e:
+            # Put the batch back at the old end of the list for the next run;
+            # undecodable entries are already in the dead-letter list
+            if decoded:
+                redis_client.rpush(AUDIT_EVENT_BUFFER_KEY, *reversed(decoded))
+            logger.error(f"Error flushing audit events: {str(e)}")
+            raise
+        
+        if len(batch) < batch_size:
+            break
+    
+    if flushed:
+        logger.info(f"Flushed {flushed} audit events")
+    return flushed
+
+
 @shared_task
 def cleanup_old_metrics(days_to_keep=90):
     """
@@ -75,11 +212,12 @@ def generate_weekly_report():
         end_date = timezone.now().date()
         start_date = end_date - datetime.timedelta(days=7)
         
-        # Ensure all daily aggregates are calculated
-        for i in range(7):
-            date = end_date - datetime.timedelta(days=i)
-            MetricsAggregator.aggregate_daily_metrics(date)
-            MetricsAggregator.aggregate_query_types(date)
+        # Ensure all daily aggregates for the past 7 days (inclusive of today)
+        # are calculated in one ranged pass
+        range_start = end_date - datetime.timedelta(days=6)
+        range_end = end_date + datetime.timedelta(days=1)
+        MetricsAggregator.aggregate_range(range_start, range_end)
+        MetricsAggregator.aggregate_query_types_range(range_start, range_end)
         
         # Generate summary
         summary = MetricsAggregator.get_dashboard_summary(days=7)
@@ -100,15 +238,12 @@ def monitor_system_performance():
     try:
         from .monitor import SystemMonitor
         
-        # Collect system metrics
-        metrics = SystemMonitor.collect_system_metrics()
-        
-        # Check component health
-        health_results = SystemMonitor.check_all_components()
+        # Collect system metrics and check component health
+        metrics_by_type, health_results = SystemMonitor.run_monitoring_cycle()
         
         # Log results
-        cpu_metric = next((m for m in metrics if m.metric_type == 'cpu_usage'), None)
-        memory_metric = next((m for m in metrics if m.metric_type == 'memory_usage'), None)
+        cpu_metric = metrics_by_type.get('cpu_usage')
+        memory_metric = metrics_by_type.get('memory_usage')
         
         cpu_value = cpu_metric.value if cpu_metric else 'unknown'
         memory_value = memory_metric.value if memory_metric else 'unknown'
@@ -123,7 +258,7 @@ def monitor_system_performance():
         logger.info(f"Component health: {status_counts}")
         
         return {
-            "metrics_count": len(metrics),
+            "metrics_count": len(metrics_by_type),
             "component_status": status_counts
         }
     except ImportError as e:
@@ -4,8 +4,11 @@ Provides data for the dashboard and analytics visualization.
 """
 
 from django.shortcuts import render
-from django.http import JsonResponse
+from django.db.models import CharField, Count, F, Window
+from django.db.models.functions import Cast, RowNumber
 from django.utils import timezone
+from django.core.cache import cache
+from django.views.decorators.cache import cache_page
 from django.views.decorators.http import require_GET
 from django.contrib.auth.decorators import user_passes_test
 from rest_framework.views import APIView
@@ -13,16 +16,27 @@ from rest_framework.response import Response
 from rest_framework import permissions, status
 import datetime
 import json
+import numpy as np
 
 from .models import (
     SystemMetric,
     AuditEvent,
     UserActivityLog,
     DailyMetricAggregate,
-    QueryTypeAggregate,
-    SecurityEvent
+    QueryTypeSummary,
+    SecurityEvent,
+    SystemStatusLog
 )
 from .aggregator import MetricsAggregator
+from .renderers import ORJSONRenderer, orjson_response, orjson_streaming_response
+
+# Dashboard data changes on the scale of minutes, so polled endpoints are
+# served from cache for a short window
+ANALYTICS_CACHE_TIMEOUT = 30  # seconds
+
+# Ranges at least this long are streamed rather than cached; cache_page
+# skips streaming responses
+ANALYTICS_STREAMING_MIN_DAYS = 180
 
 
 class DashboardDataView(APIView):
@@ -31,19 +45,47 @@ class DashboardDataView(APIView):
     Provides aggregated metrics for the dashboard visualization.
     """
     permission_classes = [permissions.IsAdminUser]
+    renderer_classes = [ORJSONRenderer]
     
     def get(self, request):
         """Get dashboard data for the specified time period"""
         days = int(request.query_params.get('days', 30))
         
-        # Get dashboard summary
-        summary = MetricsAggregator.get_dashboard_summary(days=days)
+        # Get dashboard summary, recomputed at most once per cache window
+        cache_key = f'analytics:dashboard:{days}'
+        summary = cache.get(cache_key)
+        if summary is None:
+            summary = MetricsAggregator.get_dashboard_summary(days=days)
+            cache.set(cache_key, summary, ANALYTICS_CACHE_TIMEOUT)
         
         return Response(summary)
 
 
+def _metric_series(metrics):
+    """
+    Convert (timestamp, value) rows into column-oriented chart data.
+    
+    Returns:
+        dict: {'timestamp': [...], 'value': [...]} with minute-resolution timestamps
+    """
+    rows = list(metrics)
+    if not rows:
+        return {'timestamp': [], 'value': []}
+    
+    timestamps, values = zip(*rows)
+    # Stored timestamps are UTC; drop tzinfo so numpy can parse them in bulk
+    timestamp_array = np.array(
+        [timestamp.replace(tzinfo=None) for timestamp in timestamps],
+        dtype='datetime64[m]'
+    )
+    formatted = np.char.replace(np.datetime_as_string(timestamp_array), 'T', ' ')
+    
+    return {'timestamp': formatted.tolist(), 'value': list(values)}
+
+
 @require_GET
 @user_passes_test(lambda u: u.is_staff)
+@cache_page(ANALYTICS_CACHE_TIMEOUT)
 def system_health_view(request):
     """
     View for system health metrics.
@@ -53,48 +95,41 @@ def system_health_view(request):
     end_time = timezone.now()
     start_time = end_time - datetime.timedelta(hours=6)
     
-    # Get recent system metrics
+    # Get recent system metrics (only the two columns the charts need)
     cpu_metrics = SystemMetric.objects.filter(
         metric_type='cpu_usage',
-        timestamp__gte=start_time,
-        timestamp__lte=end_time
-    ).order_by('timestamp')
+        timestamp__range=(start_time, end_time)
+    ).order_by('timestamp').values_list('timestamp', 'value')
     
     memory_metrics = SystemMetric.objects.filter(
         metric_type='memory_usage',
-        timestamp__gte=start_time,
-        timestamp__lte=end_time
-    ).order_by('timestamp')
-    
-    # Format data for charts
-    cpu_data = [
-        {
-            'timestamp': metric.timestamp.strftime('%Y-%m-%d %H:%M'),
-            'value': metric.value
-        }
-        for metric in cpu_metrics
-    ]
+        timestamp__range=(start_time, end_time)
+    ).order_by('timestamp').values_list('timestamp', 'value')
     
-    memory_data = [
-        {
-            'timestamp': metric.timestamp.strftime('%Y-%m-%d %H:%M'),
-            'value': metric.value
-        }
-        for metric in memory_metrics
-    ]
+    # Format data for charts as column-oriented series
+    cpu_data = _metric_series(cpu_metrics)
+    memory_data = _metric_series(memory_metrics)
+    
+    # Get latest status for each system component in a single query
+    latest_statuses = SystemStatusLog.objects.filter(
+        component__in=['api', 'db', 'vector_db', 'celery', 'redis', 'llm', 'embedding']
+    ).annotate(
+        row_number=Window(
+            expression=RowNumber(),
+            partition_by=[F('component')],
+            order_by=F('timestamp').desc()
+        )
+    ).filter(row_number=1).values_list('component', 'status', 'message', 'timestamp')
     
-    # Get latest metrics for each system component
     component_statuses = {}
-    for component in ['api', 'db', 'vector_db', 'celery', 'redis', 'llm', 'embedding']:
-        status = SystemStatusLog.objects.filter(component=component).order_by('-timestamp').first()
-        if status:
-            component_statuses[component] = {
-                'status': status.status,
-                'message': status.message,
-                'updated': status.timestamp.strftime('%Y-%m-%d %H:%M')
-            }
-    
-    return JsonResponse({
+    for component, component_status, message, timestamp in latest_statuses:
+        component_statuses[component] = {
+            'status': component_status,
+            'message': message,
+            'updated': timestamp.strftime('%Y-%m-%d %H:%M')
+        }
+    
+    return orjson_response({
         'cpu': cpu_data,
         'memory': memory_data,
         'components': component_statuses
@@ -103,6 +138,7 @@ def system_health_view(request):
 
 @require_GET
 @user_passes_test(lambda u: u.is_staff)
+@cache_page(ANALYTICS_CACHE_TIMEOUT)
 def query_analytics_view(request):
     """
     View for query analytics data.
@@ -112,34 +148,53 @@ def query_analytics_view(request):
     end_date = timezone.now().date()
     start_date = end_date - datetime.timedelta(days=days-1)
     
-    # Get query type distribution
-    query_types = QueryTypeAggregate.objects.filter(
-        date__gte=start_date,
-        date__lte=end_date
-    ).values('category').annotate(
-        total=Sum('count')
-    ).order_by('-total')
+    # Get query type distribution, served from the rolling summary when it
+    # covers the requested window and was rebuilt today
+    query_types = None
+    if days == QueryTypeSummary.WINDOW_DAYS:
+        query_types = list(
+            QueryTypeSummary.objects.filter(
+                refreshed_at__date=end_date
+            ).values('category', 'total').order_by('-total')
+        )
+    
+    if not query_types:
+        query_types = MetricsAggregator.get_query_type_totals(start_date, end_date)
     
-    # Get daily query counts
+    # Get daily query counts, with dates rendered as ISO strings by the DB
     daily_queries = DailyMetricAggregate.objects.filter(
-        date__gte=start_date,
-        date__lte=end_date
-    ).values('date', 'total_queries')
+        date__range=(start_date, end_date)
+    ).annotate(
+        date_str=Cast('date', output_field=CharField())
+    ).values_list('date_str', 'total_queries')
     
-    # Format data for response
-    return JsonResponse({
+    data = {
         'query_types': list(query_types),
-        'daily_queries': list(daily_queries),
         'period': {
             'start': start_date.strftime('%Y-%m-%d'),
             'end': end_date.strftime('%Y-%m-%d'),
             'days': days
         }
-    })
+    }
+    
+    # Stream the daily series for long ranges instead of buffering it
+    if days >= ANALYTICS_STREAMING_MIN_DAYS:
+        return orjson_streaming_response(data, 'daily_queries', (
+            {'date': date_str, 'total_queries': total_queries}
+            for date_str, total_queries in daily_queries.iterator(chunk_size=500)
+        ))
+    
+    # Format data for response
+    data['daily_queries'] = [
+        {'date': date_str, 'total_queries': total_queries}
+        for date_str, total_queries in daily_queries
+    ]
+    return orjson_response(data)
 
 
 @require_GET
 @user_passes_test(lambda u: u.is_staff)
+@cache_page(ANALYTICS_CACHE_TIMEOUT)
 def security_analytics_view(request):
     """
     View for security analytics data.
@@ -149,32 +204,33 @@ def security_analytics_view(request):
     end_date = timezone.now()
     start_date = end_date - datetime.timedelta(days=days)
     
-    # Get security events
-    security_events = SecurityEvent.objects.filter(
-        timestamp__gte=start_date,
-        timestamp__lte=end_date
+    # Three small grouped queries on the request's own connection
+    security_events = list(SecurityEvent.objects.filter(
+        timestamp__range=(start_date, end_date)
     ).values('event_type', 'severity').annotate(
         count=Count('id')
-    )
+    ))
     
-    # Get audit events
-    audit_events = AuditEvent.objects.filter(
-        timestamp__gte=start_date,
-        timestamp__lte=end_date
+    audit_events = list(AuditEvent.objects.filter(
+        timestamp__range=(start_date, end_date)
     ).values('event_type', 'severity').annotate(
         count=Count('id')
-    )
+    ))
     
-    # Get PII detection trends
+    # PII detection trends, with dates rendered as ISO strings by the DB
     pii_trend = DailyMetricAggregate.objects.filter(
-        date__gte=start_date.date(),
-        date__lte=end_date.date()
-    ).values('date', 'pii_detection_count')
-    
-    return JsonResponse({
-        'security_events': list(security_events),
-        'audit_events': list(audit_events),
-        'pii_trend': list(pii_trend),
+        date__range=(start_date.date(), end_date.date())
+    ).annotate(
+        date_str=Cast('date', output_field=CharField())
+    ).values_list('date_str', 'pii_detection_count')
+    
+    return orjson_response({
+        'security_events': security_events,
+        'audit_events': audit_events,
+        'pii_trend': [
+            {'date': date_str, 'pii_detection_count': count}
+            for date_str, count in pii_trend
+        ],
         'period': {
             'start': start_date.strftime('%Y-%m-%d'),
             'end': end_date.strftime('%Y-%m-%d'),
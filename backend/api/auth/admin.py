@@ -3,7 +3,7 @@ Admin configuration for authentication models.
 """
 
 from django.contrib import admin
-from .models import UserRole, UserPermission, AccessAttempt
+from .models import UserRole, UserPermission, UserProfile, AccessAttempt
 
 
 @admin.register(UserRole)
@@ -15,6 +15,16 @@ class UserRoleAdmin(admin.ModelAdmin):
     raw_id_fields = ('user', 'created_by')
 
 
+@admin.register(UserProfile)
+class UserProfileAdmin(admin.ModelAdmin):
+    list_display = ('user', 'primary_role')
+    list_filter = ('primary_role',)
+    search_fields = ('user__username', 'user__email')
+    raw_id_fields = ('user',)
+    # Derived from UserRole rows by signal
+    readonly_fields = ('primary_role',)
+
+
 @admin.register(UserPermission)
 class UserPermissionAdmin(admin.ModelAdmin):
     list_display = ('user', 'permission', 'created_at', 'granted_by')
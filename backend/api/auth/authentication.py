@@ -0,0 +1,115 @@
+"""
+Authentication classes for the RNA Lab Navigator.
+"""
+
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+# Cache keys; entries are deleted by signals when the user or profile changes
+AUTH_USER_CACHE_KEY = 'auth:user:{user_id}'
+AUTH_USER_CACHE_TIMEOUT = 60  # seconds
+
+# User fields kept in the cache entry; the rest, password included, are
+# deferred on the rebuilt user and loaded from the database if accessed
+AUTH_USER_CACHED_FIELDS = ('id', 'username', 'is_active', 'is_staff', 'is_superuser')
+
+
+class ProfileJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that loads the user's profile in the same query,
+    so primary-role permission checks need no further database access.
+    The fields authentication needs are cached briefly, never the password
+    hash; token signature and expiry, and the base class's user checks,
+    still run on every request.
+    """
+    
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+        
+        cache_key = AUTH_USER_CACHE_KEY.format(user_id=user_id)
+        cached = cache.get(cache_key)
+        if cached is None:
+            try:
+                user = self.user_model.objects.select_related('profile').get(
+                    **{api_settings.USER_ID_FIELD: user_id}
+                )
+            except self.user_model.DoesNotExist:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            cached = self._cache_entry(user)
+            cache.set(cache_key, cached, AUTH_USER_CACHE_TIMEOUT)
+        else:
+            user = self._user_from_cache_entry(cached)
+        
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        
+        # The cache entry is dropped when the user is saved, so a password
+        # change is seen here at once
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != cached['password_hash']:
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+        
+        return user
+    
+    def _cache_entry(self, user):
+        """
+        Build the cache entry for a user loaded with its profile.
+        
+        Args:
+            user: User instance loaded with select_related('profile')
+            
+        Returns:
+            Dict of the cached user fields, the profile fields (or None) and
+            the hash of the password the revoke claim is checked against
+        """
+        profile = getattr(user, 'profile', None)
+        return {
+            'fields': {name: getattr(user, name) for name in AUTH_USER_CACHED_FIELDS},
+            'profile': (
+                {'id': profile.id, 'primary_role': profile.primary_role}
+                if profile is not None else None
+            ),
+            'password_hash': get_md5_hash_password(user.password),
+        }
+    
+    def _user_from_cache_entry(self, cached):
+        """
+        Rebuild a user from its cache entry, with the profile attached.
+        
+        Args:
+            cached: Dict built by _cache_entry
+            
+        Returns:
+            User instance with only the cached fields loaded
+        """
+        fields = cached['fields']
+        db = self.user_model.objects.db
+        # from_db expects the values in the model's field order
+        field_names = [
+            field.attname for field in self.user_model._meta.concrete_fields
+            if field.attname in fields
+        ]
+        user = self.user_model.from_db(
+            db, field_names, [fields[name] for name in field_names]
+        )
+        
+        profile = None
+        if cached['profile'] is not None:
+            profile_model = self.user_model.profile.related.related_model
+            profile = profile_model.from_db(
+                db, ['id', 'user_id', 'primary_role'],
+                [cached['profile']['id'], user.pk, cached['profile']['primary_role']]
+            )
+        self.user_model.profile.related.set_cached_value(user, profile)
+        return user
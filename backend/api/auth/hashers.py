@@ -0,0 +1,17 @@
+"""
+Password hashers for the RNA Lab Navigator.
+"""
+
+from django.contrib.auth.hashers import Argon2PasswordHasher
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    Argon2id with a lower time cost and 64 MiB of memory.
+    Roughly twice as fast per hash as the PBKDF2 default while remaining
+    memory-hard. Hashes use the standard 'argon2' algorithm name, so existing
+    Argon2 hashes verify and are upgraded on next login.
+    """
+    time_cost = 2
+    memory_cost = 65536  # KiB
+    parallelism = 2
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.10 on 2026-10-16 19:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api_auth", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="accessattempt",
+            index=models.Index(
+                fields=["ip_address", "timestamp"],
+                name="api_auth_ac_ip_addr_e83eb6_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="userpermission",
+            index=models.Index(
+                fields=["user", "permission"], name="api_auth_us_user_id_d6911c_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="userrole",
+            index=models.Index(
+                fields=["user", "role"], name="api_auth_us_user_id_ce1839_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="userrole",
+            index=models.Index(fields=["role"], name="api_auth_us_role_c10924_idx"),
+        ),
+    ]
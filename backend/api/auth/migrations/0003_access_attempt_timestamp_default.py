@@ -0,0 +1,18 @@
+# Generated by Django 4.2.10 on 2026-10-16 19:21
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api_auth", "0002_rbac_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="accessattempt",
+            name="timestamp",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 4.2.10 on 2026-10-16 19:29
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def create_profiles(apps, schema_editor):
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split("."))
+    UserRole = apps.get_model("api_auth", "UserRole")
+    UserProfile = apps.get_model("api_auth", "UserProfile")
+
+    # Highest-privilege role first, matching UserRole.ROLE_CHOICES
+    ranking = ["admin", "manager", "researcher", "assistant", "student", "guest"]
+    roles_by_user = {}
+    for user_id, role in UserRole.objects.values_list("user_id", "role"):
+        roles_by_user.setdefault(user_id, set()).add(role)
+
+    profiles = [
+        UserProfile(
+            user_id=user_id,
+            primary_role=next(
+                (role for role in ranking if role in roles_by_user.get(user_id, ())),
+                "guest",
+            ),
+        )
+        for user_id in User.objects.values_list("pk", flat=True)
+    ]
+    UserProfile.objects.bulk_create(profiles, batch_size=500)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("api_auth", "0003_access_attempt_timestamp_default"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserProfile",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "primary_role",
+                    models.CharField(
+                        choices=[
+                            ("admin", "Administrator"),
+                            ("manager", "Lab Manager"),
+                            ("researcher", "Researcher"),
+                            ("assistant", "Lab Assistant"),
+                            ("student", "Student"),
+                            ("guest", "Guest"),
+                        ],
+                        default="guest",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="profile",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "User Profile",
+                "verbose_name_plural": "User Profiles",
+            },
+        ),
+        migrations.RunPython(create_profiles, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.10 on 2026-10-16 19:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api_auth", "0004_user_profile"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="userpermission",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="userperm_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="userrole",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="userrole_created_idx"
+            ),
+        ),
+    ]
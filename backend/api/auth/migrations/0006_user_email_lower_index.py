@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.db import migrations
+
+INDEX_NAME = "user_email_lower_idx"
+
+
+def create_email_index(apps, schema_editor):
+    # auth.User belongs to django.contrib.auth, so the index is added with
+    # SQL here rather than through the model's Meta.indexes
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split("."))
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS %s ON %s (LOWER(%s))" % (
+            schema_editor.quote_name(INDEX_NAME),
+            schema_editor.quote_name(User._meta.db_table),
+            schema_editor.quote_name("email"),
+        )
+    )
+
+
+def drop_email_index(apps, schema_editor):
+    schema_editor.execute("DROP INDEX IF EXISTS %s" % schema_editor.quote_name(INDEX_NAME))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        # Run after the last auth migration; SQLite rebuilds tables on
+        # alteration, which would drop an index created before it
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("api_auth", "0005_role_permission_created_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_email_index, drop_email_index),
+    ]
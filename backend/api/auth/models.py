@@ -5,6 +5,12 @@ Provides models for user roles and permissions management.
 
 from django.db import models
 from django.contrib.auth.models import User
+from django.utils import timezone
+
+# Version tokens used as ETags for the management lists; the auth signals
+# delete them whenever a role, permission or user changes
+ROLE_LIST_VERSION_KEY = 'auth:roles:version'
+PERMISSION_LIST_VERSION_KEY = 'auth:permissions:version'
 
 
 class UserRole(models.Model):
@@ -34,6 +40,11 @@ class UserRole(models.Model):
     
     class Meta:
         unique_together = ['user', 'role']
+        indexes = [
+            models.Index(fields=['user', 'role']),
+            models.Index(fields=['role']),
+            models.Index(fields=['-created_at', '-id'], name='userrole_created_idx'),
+        ]
         verbose_name = 'User Role'
         verbose_name_plural = 'User Roles'
     
@@ -41,6 +52,43 @@ class UserRole(models.Model):
         return f"{self.user.username} - {self.get_role_display()}"
 
 
+class UserProfile(models.Model):
+    """
+    Per-user profile holding denormalized RBAC data.
+    primary_role is the user's highest-ranked role, kept in sync by signals,
+    so the common role checks can be answered from the user row alone.
+    """
+    
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
+    primary_role = models.CharField(max_length=20, choices=UserRole.ROLE_CHOICES, default='guest')
+    
+    class Meta:
+        verbose_name = 'User Profile'
+        verbose_name_plural = 'User Profiles'
+    
+    def __str__(self):
+        return f"{self.user.username} - {self.get_primary_role_display()}"
+    
+    @classmethod
+    def refresh_primary_role(cls, user):
+        """
+        Recompute a user's primary role from their UserRole rows.
+        ROLE_CHOICES is ordered from highest to lowest privilege.
+        """
+        roles = set(UserRole.objects.filter(user=user).values_list('role', flat=True))
+        primary_role = next(
+            (role for role, _ in UserRole.ROLE_CHOICES if role in roles),
+            'guest'
+        )
+        cls.objects.filter(user=user).update(primary_role=primary_role)
+        
+        # Keep an already-loaded profile on this user object in step
+        if User.profile.is_cached(user):
+            user.profile.primary_role = primary_role
+        
+        return primary_role
+
+
 class UserPermission(models.Model):
     """
     Defines user-specific permissions.
@@ -69,6 +117,10 @@ class UserPermission(models.Model):
     
     class Meta:
         unique_together = ['user', 'permission']
+        indexes = [
+            models.Index(fields=['user', 'permission']),
+            models.Index(fields=['-created_at', '-id'], name='userperm_created_idx'),
+        ]
         verbose_name = 'User Permission'
         verbose_name_plural = 'User Permissions'
     
@@ -85,13 +137,16 @@ class AccessAttempt(models.Model):
     ip_address = models.GenericIPAddressField(null=True, blank=True)
     user_agent = models.TextField(null=True, blank=True)
     path = models.CharField(max_length=255)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    timestamp = models.DateTimeField(default=timezone.now)
     is_successful = models.BooleanField(default=False)
     
     class Meta:
         verbose_name = 'Access Attempt'
         verbose_name_plural = 'Access Attempts'
         ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['ip_address', 'timestamp']),
+        ]
     
     def __str__(self):
         return f"{self.username or 'Unknown'} - {self.ip_address} - {'Success' if self.is_successful else 'Failure'}"
\ No newline at end of file
@@ -3,13 +3,62 @@ Custom permission classes for the RNA Lab Navigator.
 Provides permission classes for role-based access control (RBAC).
 """
 
+from django.core.cache import cache
+from django.db.models import CharField, Value
 from rest_framework import permissions
 from .models import UserRole, UserPermission
 
+# Role sets that satisfy each level of the role hierarchy
+MANAGER_ROLES = frozenset({'admin', 'manager'})
+RESEARCHER_ROLES = frozenset({'admin', 'manager', 'researcher'})
 
-class IsAdmin(permissions.BasePermission):
+# Cache keys; entries are deleted by signals when roles or permissions change
+RBAC_CACHE_KEY = 'rbac:{user_id}'
+RBAC_CACHE_TIMEOUT = 30  # seconds
+
+
+def _get_user_rbac(request):
     """
-    Permission class that checks if the user has admin role.
+    Return the (roles, permissions) sets for the requesting user.
+    Memoized on the request, so stacking several permission classes on a
+    view costs a single lookup, and cached across requests briefly.
+    """
+    if not hasattr(request, '_rbac_cache'):
+        cache_key = RBAC_CACHE_KEY.format(user_id=request.user.pk)
+        rbac = cache.get(cache_key)
+        if rbac is None:
+            # Roles and permissions come back tagged in a single UNION ALL query
+            role_rows = UserRole.objects.filter(user=request.user).annotate(
+                kind=Value('role', output_field=CharField())
+            ).values_list('kind', 'role')
+            permission_rows = UserPermission.objects.filter(user=request.user).annotate(
+                kind=Value('permission', output_field=CharField())
+            ).values_list('kind', 'permission')
+            
+            roles, perms = set(), set()
+            for kind, name in role_rows.union(permission_rows, all=True):
+                (roles if kind == 'role' else perms).add(name)
+            rbac = (roles, perms)
+            cache.set(cache_key, rbac, RBAC_CACHE_TIMEOUT)
+        request._rbac_cache = rbac
+    return request._rbac_cache
+
+
+def _get_primary_role(request):
+    """
+    Return the user's denormalized primary role, or None if they have no
+    profile. Free when the profile was loaded with the user.
+    """
+    profile = getattr(request.user, 'profile', None)
+    return profile.primary_role if profile is not None else None
+
+
+class RBACPermission(permissions.BasePermission):
+    """
+    Base class for role-based permission checks.
+    Resolves the cheap, in-memory cases (anonymous users, superusers and
+    checks decidable from the primary role) before the full role and
+    permission lookup touches the database.
     """
     
     def has_permission(self, request, view):
@@ -20,121 +69,122 @@ class IsAdmin(permissions.BasePermission):
         if request.user.is_superuser:
             return True
         
-        # Check if user has admin role
-        return UserRole.objects.filter(user=request.user, role='admin').exists()
+        primary_role = _get_primary_role(request)
+        if primary_role is not None:
+            decision = self.has_primary_role_permission(primary_role)
+            if decision is not None:
+                return decision
+        
+        roles, perms = _get_user_rbac(request)
+        return self.has_rbac_permission(roles, perms)
+    
+    def has_primary_role_permission(self, primary_role):
+        """
+        Decide access from the user's highest-ranked role alone.
+        Returns None when the full role and permission sets are needed.
+        """
+        return None
+    
+    def has_rbac_permission(self, roles, perms):
+        """Decide access from the user's role and permission sets"""
+        return False
 
 
-class IsLabManager(permissions.BasePermission):
+class IsAdmin(RBACPermission):
+    """
+    Permission class that checks if the user has admin role.
+    """
+    
+    def has_primary_role_permission(self, primary_role):
+        return primary_role == 'admin'
+    
+    def has_rbac_permission(self, roles, perms):
+        return 'admin' in roles
+
+
+class IsLabManager(RBACPermission):
     """
     Permission class that checks if the user has lab manager role.
     """
     
-    def has_permission(self, request, view):
-        if not request.user or not request.user.is_authenticated:
-            return False
-        
-        # Super users and admins have all permissions
-        if request.user.is_superuser:
-            return True
-        
-        if UserRole.objects.filter(user=request.user, role='admin').exists():
-            return True
-        
-        # Check if user has lab manager role
-        return UserRole.objects.filter(user=request.user, role='manager').exists()
+    def has_primary_role_permission(self, primary_role):
+        return primary_role in MANAGER_ROLES
+    
+    def has_rbac_permission(self, roles, perms):
+        # Admins and lab managers qualify
+        return not MANAGER_ROLES.isdisjoint(roles)
 
 
-class IsResearcher(permissions.BasePermission):
+class IsResearcher(RBACPermission):
     """
     Permission class that checks if the user has researcher role.
     """
     
-    def has_permission(self, request, view):
-        if not request.user or not request.user.is_authenticated:
-            return False
-        
-        # Super users, admins, and lab managers have all permissions
-        if request.user.is_superuser:
-            return True
-        
-        if UserRole.objects.filter(user=request.user, role__in=['admin', 'manager']).exists():
-            return True
-        
-        # Check if user has researcher role
-        return UserRole.objects.filter(user=request.user, role='researcher').exists()
+    def has_primary_role_permission(self, primary_role):
+        return primary_role in RESEARCHER_ROLES
+    
+    def has_rbac_permission(self, roles, perms):
+        # Admins, lab managers and researchers qualify
+        return not RESEARCHER_ROLES.isdisjoint(roles)
 
 
-class HasRolePermission(permissions.BasePermission):
+class HasRolePermission(RBACPermission):
     """
     Permission class that checks if the user has one of the specified roles.
     """
     
+    allowed_roles = RESEARCHER_ROLES
+    
     def __init__(self, allowed_roles=None):
-        self.allowed_roles = allowed_roles or ['admin', 'manager', 'researcher']
+        if allowed_roles:
+            self.allowed_roles = frozenset(allowed_roles)
     
-    def has_permission(self, request, view):
-        if not request.user or not request.user.is_authenticated:
-            return False
-        
-        # Super users have all permissions
-        if request.user.is_superuser:
-            return True
-        
-        # Check if user has any of the allowed roles
-        return UserRole.objects.filter(user=request.user, role__in=self.allowed_roles).exists()
+    def has_rbac_permission(self, roles, perms):
+        return not self.allowed_roles.isdisjoint(roles)
 
 
-class HasSpecificPermission(permissions.BasePermission):
+class HasSpecificPermission(RBACPermission):
     """
     Permission class that checks if the user has a specific permission.
     """
     
+    required_permission = None
+    
     def __init__(self, required_permission=None):
-        self.required_permission = required_permission
+        if required_permission:
+            self.required_permission = required_permission
     
-    def has_permission(self, request, view):
-        if not request.user or not request.user.is_authenticated:
-            return False
-        
-        # Super users have all permissions
-        if request.user.is_superuser:
-            return True
-        
+    def has_primary_role_permission(self, primary_role):
+        # Admins have all permissions; anyone else needs the permission set
+        return True if primary_role == 'admin' else None
+    
+    def has_rbac_permission(self, roles, perms):
         # Admins have all permissions
-        if UserRole.objects.filter(user=request.user, role='admin').exists():
+        if 'admin' in roles:
             return True
         
-        # Check if user has required permission
         if not self.required_permission:
             return False
         
-        return UserPermission.objects.filter(
-            user=request.user, 
-            permission=self.required_permission
-        ).exists()
+        return self.required_permission in perms
 
 
 # Common permission compositions
 class CanUploadDocuments(HasSpecificPermission):
-    def __init__(self):
-        super().__init__(required_permission='can_upload')
+    required_permission = 'can_upload'
 
 
 class CanDeleteDocuments(HasSpecificPermission):
-    def __init__(self):
-        super().__init__(required_permission='can_delete')
+    required_permission = 'can_delete'
 
 
 class CanModifyDocuments(HasSpecificPermission):
-    def __init__(self):
-        super().__init__(required_permission='can_modify')
+    required_permission = 'can_modify'
 
 
 class CanViewAnalytics(HasSpecificPermission):
-    def __init__(self):
-        super().__init__(required_permission='can_view_analytics')
+    required_permission = 'can_view_analytics'
 
 
 class CanManageUsers(HasSpecificPermission):
-    def __init__(self):
-        super().__init__(required_permission='can_manage_users')
\ No newline at end of file
+    required_permission = 'can_manage_users'
@@ -3,7 +3,6 @@ Authentication serializers for the RNA Lab Navigator.
 Provides serializers for user registration, profile management, and password management.
 """
 
-import re
 from django.contrib.auth.models import User
 from django.contrib.auth.password_validation import validate_password
 from django.utils.http import urlsafe_base64_decode
@@ -86,16 +85,22 @@ class UserProfileSerializer(serializers.ModelSerializer):
         read_only_fields = ('id', 'username', 'date_joined', 'last_login', 
                            'roles', 'permissions')
     
+    def update(self, instance, validated_data):
+        # UPDATE only the submitted columns; save() still sends post_save,
+        # which the auth cache invalidation relies on
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save(update_fields=list(validated_data))
+        return instance
+    
     def get_roles(self, obj):
-        from .models import UserRole
-        roles = UserRole.objects.filter(user=obj)
-        return [{'role': role.role, 'name': role.get_role_display()} for role in roles]
+        # Reads from the prefetch cache when the caller used prefetch_related('roles')
+        return [{'role': role.role, 'name': role.get_role_display()} for role in obj.roles.all()]
     
     def get_permissions(self, obj):
-        from .models import UserPermission
-        permissions = UserPermission.objects.filter(user=obj)
+        # Reads from the prefetch cache when the caller used prefetch_related('permissions')
         return [{'permission': perm.permission, 'name': perm.get_permission_display()} 
-                for perm in permissions]
+                for perm in obj.permissions.all()]
 
 
 class ChangePasswordSerializer(serializers.Serializer):
@@ -2,10 +2,18 @@
 Signal handlers for authentication models.
 """
 
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.contrib.auth.models import User
-from .models import UserRole, UserPermission
+from django.contrib.auth.signals import user_login_failed
+from django.core.cache import cache
+from .models import (
+    UserRole, UserPermission, UserProfile, ROLE_LIST_VERSION_KEY, PERMISSION_LIST_VERSION_KEY
+)
+from .tasks import record_access_attempt
+from .authentication import AUTH_USER_CACHE_KEY
+from .permissions import RBAC_CACHE_KEY
 
 
 @receiver(post_save, sender=User)
@@ -15,17 +23,81 @@ def create_default_user_role(sender, instance, created, **kwargs):
     New users get the 'guest' role by default.
     """
     if created:
-        # Check if this is the first user (likely an admin/superuser)
-        if User.objects.count() == 1:
-            UserRole.objects.create(
-                user=instance,
-                role='admin',
-                description='System administrator (first user)'
-            )
+        # Check if this is the first user (likely an admin/superuser);
+        # EXISTS stops at the first other row instead of counting the table
+        if not User.objects.exclude(pk=instance.pk).exists():
+            role = 'admin'
+            description = 'System administrator (first user)'
         else:
             # Regular new users get 'guest' role
+            role = 'guest'
+            description = 'Default role for new users'
+        
+        def assign_default_role():
+            UserProfile.objects.create(user=instance, primary_role=role)
             UserRole.objects.create(
                 user=instance,
-                role='guest',
-                description='Default role for new users'
-            )
\ No newline at end of file
+                role=role,
+                description=description
+            )
+        
+        # Insert the profile and role once the user row is committed
+        transaction.on_commit(assign_default_role)
+
+
+@receiver(post_save, sender=UserRole)
+@receiver(post_delete, sender=UserRole)
+def update_primary_role(sender, instance, **kwargs):
+    """
+    Keeps UserProfile.primary_role in sync with the user's roles.
+    """
+    UserProfile.refresh_primary_role(instance.user)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+@receiver(post_save, sender=UserRole)
+@receiver(post_delete, sender=UserRole)
+@receiver(post_save, sender=UserPermission)
+@receiver(post_delete, sender=UserPermission)
+def invalidate_auth_cache(sender, instance, **kwargs):
+    """
+    Drops the cached user and RBAC sets when a user, role or permission
+    changes, so permission checks never act on stale grants. Also retires
+    the ETags of the management lists that show the changed rows.
+    """
+    if sender is User:
+        # Nothing can be cached yet for a user that was just created
+        if kwargs.get('created'):
+            return
+        user_id = instance.pk
+        # Usernames and emails appear in both lists
+        list_keys = [ROLE_LIST_VERSION_KEY, PERMISSION_LIST_VERSION_KEY]
+    elif sender is UserRole:
+        user_id = instance.user_id
+        list_keys = [ROLE_LIST_VERSION_KEY]
+    else:
+        user_id = instance.user_id
+        list_keys = [PERMISSION_LIST_VERSION_KEY]
+    
+    cache.delete_many([
+        AUTH_USER_CACHE_KEY.format(user_id=user_id),
+        RBAC_CACHE_KEY.format(user_id=user_id),
+        *list_keys,
+    ])
+
+
+@receiver(user_login_failed)
+def record_failed_login(sender, credentials, request=None, **kwargs):
+    """
+    Records failed logins as AccessAttempt rows.
+    Attempts are buffered and written in batches by flush_access_attempts.
+    """
+    meta = request.META if request is not None else {}
+    record_access_attempt(
+        username=credentials.get('username'),
+        ip_address=meta.get('REMOTE_ADDR'),
+        user_agent=meta.get('HTTP_USER_AGENT'),
+        path=request.path if request is not None else '',
+        is_successful=False,
+    )
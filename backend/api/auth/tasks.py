@@ -0,0 +1,197 @@
+"""
+Celery tasks for authentication bookkeeping.
+Access attempts are buffered in Redis and written to the database in batches
+so that recording them never adds a database write to the auth request path.
+Password reset emails are likewise sent by a worker rather than the view.
+"""
+
+from celery import shared_task
+from celery.exceptions import MaxRetriesExceededError
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.auth.tokens import default_token_generator
+from django.core.mail import send_mail
+from django.utils import timezone
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+from django.utils.dateparse import parse_datetime
+from functools import lru_cache
+import json
+import logging
+
+from .models import AccessAttempt
+
+logger = logging.getLogger(__name__)
+
+ACCESS_ATTEMPT_BUFFER_KEY = 'access_attempts'
+ACCESS_ATTEMPT_BATCH_SIZE = 500
+
+# Buffered entries that can't be decoded are moved here for inspection,
+# keeping at most ACCESS_ATTEMPT_DEAD_LETTER_LIMIT of the newest
+ACCESS_ATTEMPT_DEAD_LETTER_KEY = 'access_attempts:dead'
+ACCESS_ATTEMPT_DEAD_LETTER_LIMIT = 10000
+
+
+def _get_redis_connection():
+    """Return the raw Redis client behind the default cache"""
+    from django_redis import get_redis_connection
+    return get_redis_connection('default')
+
+
+@lru_cache(maxsize=4096)
+def uidb64_for(pk):
+    """
+    Return the base64 uid used in password reset links.
+    The encoding of a pk never changes, so it is computed once per pk.
+    """
+    return urlsafe_base64_encode(force_bytes(pk))
+
+
+def _build_access_attempt(data):
+    """Build an unsaved AccessAttempt from a buffered entry"""
+    return AccessAttempt(
+        user_id=data.get('user_id'),
+        username=data.get('username'),
+        ip_address=data.get('ip_address'),
+        user_agent=data.get('user_agent'),
+        path=(data.get('path') or '')[:255],
+        timestamp=parse_datetime(data['timestamp']),
+        is_successful=data.get('is_successful', False),
+    )
+
+
+def _build_access_attempts(redis_client, batch):
+    """
+    Build unsaved AccessAttempts from a batch of buffered entries.
+    Entries that can't be decoded are moved to the dead-letter list
+    rather than failing the batch.
+    
+    Returns:
+        tuple: (attempts, oldest first; the entries they were built from,
+            in buffer order)
+    """
+    attempts = []
+    decoded = []
+    dead = []
+    # LPUSH stores newest first, so reverse to insert oldest first
+    for raw in reversed(batch):
+        try:
+            attempts.append(_build_access_attempt(json.loads(raw)))
+            decoded.append(raw)
+        except Exception as e:
+            logger.error(f"Dropping undecodable access attempt: {str(e)}")
+            dead.append(raw)
+    
+    if dead:
+        pipe = redis_client.pipeline()
+        pipe.lpush(ACCESS_ATTEMPT_DEAD_LETTER_KEY, *dead)
+        pipe.ltrim(ACCESS_ATTEMPT_DEAD_LETTER_KEY, 0, ACCESS_ATTEMPT_DEAD_LETTER_LIMIT - 1)
+        pipe.execute()
+    return attempts, decoded[::-1]
+
+
+def record_access_attempt(username=None, ip_address=None, user_agent=None, path='',
+                          is_successful=False, user=None):
+    """
+    Queue an access attempt for the next flush_access_attempts run.
+    Falls back to a direct insert if Redis is unavailable.
+    """
+    data = {
+        'user_id': user.pk if user is not None else None,
+        'username': username,
+        'ip_address': ip_address,
+        'user_agent': user_agent,
+        'path': path,
+        'timestamp': timezone.now().isoformat(),
+        'is_successful': is_successful,
+    }
+    
+    try:
+        _get_redis_connection().lpush(ACCESS_ATTEMPT_BUFFER_KEY, json.dumps(data))
+    except Exception as e:
+        logger.warning(f"Could not buffer access attempt, writing directly: {str(e)}")
+        _build_access_attempt(data).save()
+
+
+@shared_task
+def flush_access_attempts(batch_size=ACCESS_ATTEMPT_BATCH_SIZE):
+    """
+    Move buffered access attempts from Redis into the database.
+    Pops the oldest entries in batches and inserts each batch with a
+    single bulk_create. Entries that can't be decoded are moved to
+    ACCESS_ATTEMPT_DEAD_LETTER_KEY instead of blocking the buffer.
+    """
+    redis_client = _get_redis_connection()
+    flushed = 0
+    
+    while True:
+        # Read and trim the oldest entries atomically (MULTI/EXEC)
+        pipe = redis_client.pipeline()
+        pipe.lrange(ACCESS_ATTEMPT_BUFFER_KEY, -batch_size, -1)
+        pipe.ltrim(ACCESS_ATTEMPT_BUFFER_KEY, 0, -batch_size - 1)
+        batch, _ = pipe.execute()
+        
+        if not batch:
+            break
+        
+        attempts, decoded = _build_access_attempts(redis_client, batch)
+        try:
+            AccessAttempt.objects.bulk_create(attempts, batch_size=batch_size)
+        except Exception as e:
+            # Put the batch back at the old end of the list for the next run;
+            # undecodable entries are already in the dead-letter list
+            if decoded:
+                redis_client.rpush(ACCESS_ATTEMPT_BUFFER_KEY, *decoded)
+            logger.error(f"Error flushing access attempts: {str(e)}")
+            raise
+        
+        flushed += len(attempts)
+        if len(batch) < batch_size:
+            break
+    
+    if flushed:
+        logger.info(f"Flushed {flushed} access attempts")
+    return flushed
+
+
+@shared_task(bind=True, max_retries=3)
+def send_password_reset_email(self, user_id):
+    """
+    Email a password reset link to a user.
+    The token is generated here rather than passed in, so it never sits in
+    the broker or appears in task logs. A user_id of None (an unknown
+    email) is accepted and ignored.
+    """
+    if user_id is None:
+        return False
+    
+    try:
+        user = User.objects.get(pk=user_id)
+    except User.DoesNotExist:
+        logger.warning(f"Password reset requested for missing user {user_id}")
+        return False
+    
+    # The token mixes in the password hash and last login, so only the uid is cached
+    token = default_token_generator.make_token(user)
+    uid = uidb64_for(user.pk)
+    
+    # Create reset URL (frontend should handle this route)
+    reset_url = f"{settings.SITE_URL}/reset-password/{uid}/{token}/"
+    
+    try:
+        send_mail(
+            subject="RNA Navigator: Reset Password",
+            message=f"Please click the following link to reset your password: {reset_url}",
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            recipient_list=[user.email],
+            fail_silently=False,
+        )
+    except Exception as e:
+        logger.error(f"Error sending password reset email to user {user_id}: {str(e)}")
+        try:
+            self.retry(countdown=60)
+        except MaxRetriesExceededError:
+            logger.error(f"Max retries exceeded sending password reset email to user {user_id}")
+        raise
+    
+    return True
@@ -5,15 +5,19 @@ Provides API endpoints for user registration, profile management, and password m
 
 from django.contrib.auth.models import User
 from django.contrib.auth.tokens import default_token_generator
-from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
-from django.utils.encoding import force_bytes, force_str
-from django.core.mail import send_mail
-from django.conf import settings
+from django.utils.http import urlsafe_base64_decode
+from django.utils.encoding import force_str
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.shortcuts import get_object_or_404
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+from django.db.models import F, prefetch_related_objects
+from django.db.models.functions import Lower
 
 from rest_framework import status, serializers
 from rest_framework.views import APIView
+from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework_simplejwt.tokens import RefreshToken
@@ -25,11 +29,15 @@ from .serializers import (
     PasswordResetRequestSerializer,
     PasswordResetConfirmSerializer,
 )
-from .models import UserRole, UserPermission, AccessAttempt
+from .models import (
+    UserRole, UserPermission, AccessAttempt, ROLE_LIST_VERSION_KEY, PERMISSION_LIST_VERSION_KEY
+)
 from .permissions import IsAdmin, IsLabManager, CanManageUsers
+from .tasks import send_password_reset_email
 
 from api.security.rate_limiting import track_rate_limit
 from api.analytics.collectors import AuditCollector, SecurityCollector
+import uuid
 
 
 class UserRegistrationView(APIView):
@@ -79,14 +87,19 @@ class UserProfileView(APIView):
     """
     permission_classes = [IsAuthenticated]
     
+    def get_object(self, request):
+        """Return the requesting user with roles and permissions prefetched"""
+        prefetch_related_objects([request.user], 'roles', 'permissions')
+        return request.user
+    
     def get(self, request):
         """Get user profile details"""
-        serializer = UserProfileSerializer(request.user)
+        serializer = UserProfileSerializer(self.get_object(request))
         return Response(serializer.data)
     
     def put(self, request):
         """Update user profile details"""
-        serializer = UserProfileSerializer(request.user, data=request.data, partial=True)
+        serializer = UserProfileSerializer(self.get_object(request), data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
             
@@ -124,7 +137,7 @@ class ChangePasswordView(APIView):
         if serializer.is_valid():
             # Change the password
             request.user.set_password(serializer.validated_data['new_password'])
-            request.user.save()
+            request.user.save(update_fields=['password'])
             
             # Log the password change event
             ip_address = request.META.get('REMOTE_ADDR')
@@ -159,37 +172,24 @@ class PasswordResetRequestView(APIView):
         if serializer.is_valid():
             email = serializer.validated_data['email']
             
-            try:
-                user = User.objects.get(email=email)
-                
-                # Generate token
-                token = default_token_generator.make_token(user)
-                uid = urlsafe_base64_encode(force_bytes(user.pk))
-                
-                # Create reset URL (frontend should handle this route)
-                reset_url = f"{settings.SITE_URL}/reset-password/{uid}/{token}/"
-                
-                # Send email with reset URL
-                send_mail(
-                    subject="RNA Navigator: Reset Password",
-                    message=f"Please click the following link to reset your password: {reset_url}",
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    recipient_list=[email],
-                    fail_silently=False,
-                )
-                
-                # Log the password reset request (without revealing if user exists for security)
-                ip_address = request.META.get('REMOTE_ADDR')
-                AuditCollector.record_audit_event(
-                    event_type="user_management",
-                    description=f"Password reset requested for email: {email}",
-                    user=None,
-                    ip_address=ip_address,
-                    severity="info"
-                )
-            except User.DoesNotExist:
-                # For security, don't reveal if user exists or not
-                pass
+            # Matches the LOWER(email) index, so this is an index probe
+            user_id = User.objects.alias(
+                email_lower=Lower('email')
+            ).filter(email_lower=email.lower()).values_list('pk', flat=True).first()
+            
+            # Hits and misses do the same work so response timing doesn't reveal
+            # whether the email exists; the worker skips unknown users
+            send_password_reset_email.delay(user_id)
+            
+            # Log the password reset request (without revealing if user exists for security)
+            ip_address = request.META.get('REMOTE_ADDR')
+            AuditCollector.record_audit_event(
+                event_type="user_management",
+                description=f"Password reset requested for email: {email}",
+                user=None,
+                ip_address=ip_address,
+                severity="info"
+            )
             
             # For security, always return success regardless of whether user exists
             return Response({"detail": "Password reset email has been sent if the email exists."}, 
@@ -230,7 +230,7 @@ class PasswordResetConfirmView(APIView):
                 
                 # Reset password
                 user.set_password(new_password)
-                user.save()
+                user.save(update_fields=['password'])
                 
                 # Log the password reset
                 ip_address = request.META.get('REMOTE_ADDR')
@@ -251,6 +251,24 @@ class PasswordResetConfirmView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+def _list_version_etag(version_key):
+    """
+    Build a condition() etag function that returns the list's current
+    version token, minting a new one if it has been invalidated.
+    """
+    def etag_func(request, *args, **kwargs):
+        return cache.get_or_set(version_key, lambda: uuid.uuid4().hex, None)
+    return etag_func
+
+
+class ManagementListPagination(LimitOffsetPagination):
+    """
+    Pagination for the role and permission management lists.
+    """
+    default_limit = 50
+    max_limit = 500
+
+
 # Role Management Views
 class RoleManagementSerializer(serializers.ModelSerializer):
     """
@@ -271,11 +289,19 @@ class UserRoleListView(APIView):
     """
     permission_classes = [IsAuthenticated, IsAdmin | CanManageUsers]
     
+    @method_decorator(condition(etag_func=_list_version_etag(ROLE_LIST_VERSION_KEY)))
     def get(self, request):
         """List all user roles"""
-        roles = UserRole.objects.all().select_related('user')
-        serializer = RoleManagementSerializer(roles, many=True)
-        return Response(serializer.data)
+        # Read-only path: fetch plain rows shaped like RoleManagementSerializer
+        # output, skipping model instantiation and per-field serialization
+        roles = UserRole.objects.annotate(
+            username=F('user__username'),
+            email=F('user__email')
+        ).values(*RoleManagementSerializer.Meta.fields).order_by('-created_at', '-id')
+        
+        paginator = ManagementListPagination()
+        page = paginator.paginate_queryset(roles, request, view=self)
+        return paginator.get_paginated_response(page)
     
     def post(self, request):
         """Create a new user role"""
@@ -300,7 +326,7 @@ class UserRoleListView(APIView):
                 }
             )
             
-            return Response(RoleManagementSerializer(role).data, status=status.HTTP_201_CREATED)
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -312,7 +338,8 @@ class UserRoleDetailView(APIView):
     permission_classes = [IsAuthenticated, IsAdmin | CanManageUsers]
     
     def get_object(self, pk):
-        return get_object_or_404(UserRole, pk=pk)
+        # Every handler reads the user's username, so join it in up front
+        return get_object_or_404(UserRole.objects.select_related('user'), pk=pk)
     
     def get(self, request, pk):
         """Retrieve a user role"""
@@ -388,11 +415,19 @@ class UserPermissionListView(APIView):
     """
     permission_classes = [IsAuthenticated, IsAdmin | CanManageUsers]
     
+    @method_decorator(condition(etag_func=_list_version_etag(PERMISSION_LIST_VERSION_KEY)))
     def get(self, request):
         """List all user permissions"""
-        permissions = UserPermission.objects.all().select_related('user')
-        serializer = PermissionManagementSerializer(permissions, many=True)
-        return Response(serializer.data)
+        # Read-only path: fetch plain rows shaped like PermissionManagementSerializer
+        # output, skipping model instantiation and per-field serialization
+        permissions = UserPermission.objects.annotate(
+            username=F('user__username'),
+            email=F('user__email')
+        ).values(*PermissionManagementSerializer.Meta.fields).order_by('-created_at', '-id')
+        
+        paginator = ManagementListPagination()
+        page = paginator.paginate_queryset(permissions, request, view=self)
+        return paginator.get_paginated_response(page)
     
     def post(self, request):
         """Create a new user permission"""
@@ -416,7 +451,7 @@ class UserPermissionListView(APIView):
                 }
             )
             
-            return Response(PermissionManagementSerializer(permission).data, status=status.HTTP_201_CREATED)
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -428,7 +463,8 @@ class UserPermissionDetailView(APIView):
     permission_classes = [IsAuthenticated, IsAdmin | CanManageUsers]
     
     def get_object(self, pk):
-        return get_object_or_404(UserPermission, pk=pk)
+        # Every handler reads the user's username, so join it in up front
+        return get_object_or_404(UserPermission.objects.select_related('user'), pk=pk)
     
     def get(self, request, pk):
         """Retrieve a user permission"""
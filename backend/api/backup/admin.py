@@ -9,16 +9,16 @@ from django.template.response import TemplateResponse
 from django.urls import path
 from django.utils.html import format_html
 from django.contrib import messages
-import os
+from django.core.cache import cache
 import json
-from datetime import datetime
 
 from .tasks import (
     backup_postgres_database,
     backup_weaviate_database,
     backup_media_files,
     run_full_backup,
-    BACKUP_PATHS
+    build_backup_index,
+    BACKUP_INDEX_CACHE_KEY
 )
 
 class BackupAdmin(admin.ModelAdmin):
@@ -69,64 +69,18 @@ class BackupAdmin(admin.ModelAdmin):
         context['backups'] = backups
         
         # Use custom template
-        from django.template.response import TemplateResponse
         return TemplateResponse(request, 'admin/backup_list.html', context)
     
     def get_backup_list(self):
-        """Get list of backups from disk."""
-        backups = []
-        
-        for backup_type, backup_path in BACKUP_PATHS.items():
-            if not os.path.exists(backup_path):
-                continue
-                
-            for item in os.listdir(backup_path):
-                item_path = os.path.join(backup_path, item)
-                
-                # Skip directories for postgres and media backups
-                if backup_type != 'weaviate' and os.path.isdir(item_path):
-                    continue
-                    
-                # Get file stats
-                try:
-                    stats = os.stat(item_path)
-                    created_at = datetime.fromtimestamp(stats.st_ctime)
-                    size_bytes = stats.st_size if os.path.isfile(item_path) else self._get_dir_size(item_path)
-                    
-                    backups.append({
-                        'backup_id': item,
-                        'backup_type': backup_type,
-                        'created_at': created_at,
-                        'path': item_path,
-                        'size_bytes': size_bytes,
-                        'size': self._format_size(size_bytes),
-                        'status': 'completed'
-                    })
-                except Exception as e:
-                    print(f"Error processing backup {item_path}: {e}")
-        
-        # Sort by creation time, newest first
-        backups.sort(key=lambda x: x['created_at'], reverse=True)
+        """
+        Get list of backups from the index built by refresh_backup_index.
+        The index is only built here if no worker has produced it yet.
+        """
+        backups = cache.get(BACKUP_INDEX_CACHE_KEY)
+        if backups is None:
+            backups = build_backup_index()
         return backups
     
-    def _get_dir_size(self, path):
-        """Get size of directory contents."""
-        total_size = 0
-        for dirpath, dirnames, filenames in os.walk(path):
-            for f in filenames:
-                fp = os.path.join(dirpath, f)
-                if os.path.exists(fp):
-                    total_size += os.path.getsize(fp)
-        return total_size
-    
-    def _format_size(self, size_bytes):
-        """Format bytes as human-readable size."""
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if size_bytes < 1024:
-                return f"{size_bytes:.2f} {unit}"
-            size_bytes /= 1024
-        return f"{size_bytes:.2f} PB"
-    
     def backup_id(self, obj):
         """Display backup ID."""
         return obj.get('backup_id', 'Unknown')
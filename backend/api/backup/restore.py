@@ -7,15 +7,135 @@ import os
 import subprocess
 import shutil
 import logging
+import gzip
+import json
+import tarfile
 import tempfile
-import requests
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from django.conf import settings
 import boto3
 from botocore.exceptions import ClientError
 
+from .tasks import _HashingReader, check_pg_arg, get_pg_env, get_s3_client, remove_replaced_media_dir, start_pipeline, wait_for_weaviate_operation, weaviate_response_status, MEDIA_MANIFEST_NAME, WEAVIATE_RESTORE_TIMEOUT, WEAVIATE_SESSION, ZSTD_EXTENSION
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Upper bound on parallel pg_restore jobs; each job holds its own connection
+PG_RESTORE_MAX_JOBS = 8
+
+# Parallel object downloads when restoring a per-file media backup
+MEDIA_RESTORE_WORKERS = 16
+
+
+def _recreate_database(db_settings, db_name, env):
+    """Drop the target database if it exists and create it empty"""
+    drop_cmd = [
+        'dropdb',
+        '--host', db_settings['HOST'],
+        '--port', db_settings['PORT'],
+        '--username', db_settings['USER'],
+        '--if-exists',
+        db_name
+    ]
+    
+    create_cmd = [
+        'createdb',
+        '--host', db_settings['HOST'],
+        '--port', db_settings['PORT'],
+        '--username', db_settings['USER'],
+        db_name
+    ]
+    
+    # Execute drop command
+    logger.info("Dropping existing database...")
+    result = subprocess.run(drop_cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    
+    if result.returncode != 0:
+        logger.warning(f"Warning while dropping database: {result.stderr.decode('utf-8')}")
+    
+    # Execute create command
+    logger.info("Creating new database...")
+    result = subprocess.run(create_cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    
+    if result.returncode != 0:
+        error_msg = result.stderr.decode('utf-8')
+        logger.error(f"Error creating database: {error_msg}")
+        raise Exception(f"createdb failed: {error_msg}")
+
+
+def _pg_restore_cmd(db_settings, db_name, *args):
+    """Build a pg_restore command line for the target database"""
+    return [
+        'pg_restore',
+        '--host', db_settings['HOST'],
+        '--port', db_settings['PORT'],
+        '--username', db_settings['USER'],
+        '--dbname', db_name,
+        '--no-owner',
+        '--no-privileges',
+        *args
+    ]
+
+
+def _check_pg_restore_result(returncode, error_msg):
+    """Raise if pg_restore failed; pg_restore also exits non-zero on warnings"""
+    if returncode != 0:
+        logger.error(f"Error during restore: {error_msg}")
+        # Check if there are just some warnings but restore was successful
+        if "ERROR:" in error_msg:
+            raise Exception(f"pg_restore failed: {error_msg}")
+        else:
+            logger.warning(f"pg_restore completed with warnings: {error_msg}")
+
+
+def _decompress_zstd(backup_path):
+    """
+    Decompress a .zst backup into a temporary file beside it.
+    
+    Returns:
+        str: Path to the decompressed file; the caller removes it
+    """
+    fd, archive_path = tempfile.mkstemp(dir=os.path.dirname(backup_path), suffix='.sql')
+    os.close(fd)
+    
+    logger.info(f"Decompressing {backup_path}...")
+    result = subprocess.run(
+        ['zstd', '-d', '-q', '-f', '-T0', '-o', archive_path, backup_path],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+    )
+    
+    if result.returncode != 0:
+        os.remove(archive_path)
+        raise Exception(f"zstd failed: {result.stderr.decode('utf-8')}")
+    
+    return archive_path
+
+
+def _extract_archive(backup_path, extract_dir):
+    """
+    Extract a tar archive with the native tar binary, decompressing with
+    multithreaded pigz or zstd when the archive uses one of their formats
+    and the tool is installed. Falls back to shutil.unpack_archive when
+    tar isn't available.
+    """
+    tar_path = shutil.which('tar')
+    if not tar_path:
+        shutil.unpack_archive(backup_path, extract_dir)
+        return
+    
+    cmd = [tar_path, '-xf', backup_path, '-C', extract_dir]
+    if backup_path.endswith(('.tar.gz', '.tgz')) and shutil.which('pigz'):
+        cmd[1:1] = ['-I', 'pigz']
+    elif backup_path.endswith(f".tar{ZSTD_EXTENSION}") and shutil.which('zstd'):
+        cmd[1:1] = ['-I', 'zstd -T0']
+    # Otherwise tar detects the compression itself
+    
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        raise Exception(f"tar failed: {result.stderr.decode('utf-8')}")
+
 
 def restore_postgres_from_backup(backup_path, database_name=None):
     """
@@ -31,75 +151,35 @@ def restore_postgres_from_backup(backup_path, database_name=None):
     try:
         # Get database settings
         db_settings = settings.DATABASES['default']
-        db_name = database_name or db_settings['NAME']
+        db_name = check_pg_arg(database_name or db_settings['NAME'], 'database name')
         
         logger.info(f"Starting PostgreSQL restore to database {db_name} from {backup_path}")
         
-        # Set environment variables for pg_restore
-        env = os.environ.copy()
-        env['PGPASSWORD'] = db_settings['PASSWORD']
-        
-        # First, drop and recreate the database
-        drop_cmd = [
-            'dropdb',
-            '--host', db_settings['HOST'],
-            '--port', db_settings['PORT'],
-            '--username', db_settings['USER'],
-            '--if-exists',
-            db_name
-        ]
-        
-        create_cmd = [
-            'createdb',
-            '--host', db_settings['HOST'],
-            '--port', db_settings['PORT'],
-            '--username', db_settings['USER'],
-            db_name
-        ]
-        
-        # Then restore from backup
-        restore_cmd = [
-            'pg_restore',
-            '--host', db_settings['HOST'],
-            '--port', db_settings['PORT'],
-            '--username', db_settings['USER'],
-            '--dbname', db_name,
-            '--no-owner',
-            '--no-privileges',
-            backup_path
-        ]
-        
-        # Execute drop command
-        logger.info("Dropping existing database...")
-        process = subprocess.Popen(drop_cmd, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, stderr = process.communicate()
-        
-        if process.returncode != 0:
-            logger.warning(f"Warning while dropping database: {stderr.decode('utf-8')}")
-        
-        # Execute create command
-        logger.info("Creating new database...")
-        process = subprocess.Popen(create_cmd, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, stderr = process.communicate()
-        
-        if process.returncode != 0:
-            error_msg = stderr.decode('utf-8')
-            logger.error(f"Error creating database: {error_msg}")
-            raise Exception(f"createdb failed: {error_msg}")
-        
-        # Execute restore command
-        logger.info("Restoring from backup...")
-        process = subprocess.Popen(restore_cmd, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, stderr = process.communicate()
-        
-        if process.returncode != 0:
-            error_msg = stderr.decode('utf-8')
-            logger.error(f"Error during restore: {error_msg}")
-            # Check if there are just some warnings but restore was successful
-            if "ERROR:" in error_msg:
-                raise Exception(f"pg_restore failed: {error_msg}")
-            else:
-                logger.warning(f"pg_restore completed with warnings: {error_msg}")
+        # Client environment with the password in a .pgpass file
+        env = get_pg_env(db_settings)
+        
+        # zstd-compressed dumps are decompressed to a seekable file first,
+        # since parallel pg_restore can't read from a pipe
+        archive_path = backup_path
+        if backup_path.endswith(ZSTD_EXTENSION):
+            archive_path = _decompress_zstd(backup_path)
+        
+        try:
+            # First, drop and recreate the database
+            _recreate_database(db_settings, db_name, env)
+            
+            # Then restore from backup. The dump is custom format (-Fc), so
+            # pg_restore can load tables and build indexes in parallel
+            jobs = max(1, min(os.cpu_count() or 2, PG_RESTORE_MAX_JOBS))
+            restore_cmd = _pg_restore_cmd(db_settings, db_name, '--jobs', str(jobs), archive_path)
+            
+            # Execute restore command
+            logger.info(f"Restoring from backup with {jobs} parallel jobs...")
+            result = subprocess.run(restore_cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+            _check_pg_restore_result(result.returncode, result.stderr.decode('utf-8'))
+        finally:
+            if archive_path != backup_path:
+                os.remove(archive_path)
         
         logger.info(f"PostgreSQL database restore completed successfully")
         
@@ -114,6 +194,82 @@ def restore_postgres_from_backup(backup_path, database_name=None):
         raise
 
 
+def restore_postgres_from_s3(s3_key, bucket_name=None, database_name=None):
+    """
+    Restore PostgreSQL database by streaming a backup object from S3 into
+    pg_restore, without downloading it to local disk first.
+    
+    pg_restore can only run parallel jobs on a seekable file, so this
+    restores with a single job. For very large databases, downloading and
+    using restore_postgres_from_backup may still finish sooner.
+    
+    Args:
+        s3_key (str): S3 object key of the backup, e.g. 'postgres/pg_backup_<timestamp>.sql'
+        bucket_name (str, optional): S3 bucket name, defaults to settings.AWS_BACKUP_BUCKET
+        database_name (str, optional): Database name to restore to, defaults to settings.DATABASES['default']['NAME']
+    
+    Returns:
+        dict: Result information
+    """
+    try:
+        bucket_name = bucket_name or settings.AWS_BACKUP_BUCKET
+        db_settings = settings.DATABASES['default']
+        db_name = check_pg_arg(database_name or db_settings['NAME'], 'database name')
+        
+        logger.info(f"Starting PostgreSQL restore to database {db_name} from s3://{bucket_name}/{s3_key}")
+        
+        # Fetch the object first so a bad key fails before the database is dropped
+        response = get_s3_client().get_object(Bucket=bucket_name, Key=s3_key)
+        
+        # Client environment with the password in a .pgpass file
+        env = get_pg_env(db_settings)
+        
+        _recreate_database(db_settings, db_name, env)
+        
+        # With no file argument pg_restore reads the archive from stdin;
+        # zstd-compressed dumps are decompressed on the way in
+        pipeline = [_pg_restore_cmd(db_settings, db_name)]
+        if s3_key.endswith(ZSTD_EXTENSION):
+            pipeline.insert(0, ['zstd', '-d', '-q', '-c'])
+        
+        logger.info("Restoring from streamed backup...")
+        with tempfile.TemporaryFile() as stderr_file:
+            processes = start_pipeline(
+                pipeline, env, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=stderr_file
+            )
+            stdin = processes[0].stdin
+            try:
+                shutil.copyfileobj(response['Body'], stdin, length=4 * 1024 * 1024)
+            except BrokenPipeError:
+                # The pipeline exited early; its stderr says why
+                pass
+            finally:
+                response['Body'].close()
+                try:
+                    stdin.close()
+                except BrokenPipeError:
+                    pass
+            returncodes = [process.wait() for process in processes]
+            
+            stderr_file.seek(0)
+            error_msg = stderr_file.read().decode('utf-8')
+            if len(processes) > 1 and returncodes[0] != 0:
+                raise Exception(f"zstd failed: {error_msg}")
+            _check_pg_restore_result(returncodes[-1], error_msg)
+        
+        logger.info("PostgreSQL database restore completed successfully")
+        
+        return {
+            'status': 'success',
+            'database': db_name,
+            'backup_file': f"s3://{bucket_name}/{s3_key}"
+        }
+        
+    except Exception as e:
+        logger.error(f"Error during PostgreSQL restore: {str(e)}")
+        raise
+
+
 def restore_weaviate_from_backup(backup_name, backup_path=None):
     """
     Restore Weaviate vector database from a backup.
@@ -168,7 +324,7 @@ def restore_weaviate_from_backup(backup_name, backup_path=None):
             headers["Authorization"] = f"Bearer {settings.WEAVIATE_API_KEY}"
         
         # Create restore request
-        response = requests.post(restore_endpoint, json=payload, headers=headers)
+        response = WEAVIATE_SESSION.post(restore_endpoint, json=payload, headers=headers)
         
         if not response.ok:
             error_msg = f"Weaviate restore failed: {response.status_code} - {response.text}"
@@ -181,32 +337,17 @@ def restore_weaviate_from_backup(backup_name, backup_path=None):
         restore_status_endpoint = f"{weaviate_url}/v1/backups/{backup_name}/restore"
         
         # Poll for restore completion
-        import time
-        max_attempts = 60  # 60 attempts with 10 seconds between = 10 minutes max wait
-        for attempt in range(max_attempts):
-            status_response = requests.get(restore_status_endpoint, headers=headers)
-            
-            if not status_response.ok:
-                logger.warning(f"Failed to get restore status: {status_response.status_code} - {status_response.text}")
-                continue
-            
-            status_data = status_response.json()
-            status = status_data.get("status", "")
-            
-            if status == "SUCCESS":
-                logger.info(f"Weaviate restore completed successfully: {backup_name}")
-                break
-            elif status == "FAILED":
-                error_msg = f"Weaviate restore failed: {status_data.get('error', 'Unknown error')}"
-                logger.error(error_msg)
-                raise Exception(error_msg)
-            else:
-                # Still in progress, wait and retry
-                logger.info(f"Weaviate restore in progress: {status}")
-                time.sleep(10)  # Wait 10 seconds before checking again
+        # The POST response already carries the initial status
+        if wait_for_weaviate_operation(restore_status_endpoint, headers, WEAVIATE_RESTORE_TIMEOUT, 'restore',
+                                       initial_status=weaviate_response_status(response)):
+            logger.info(f"Weaviate restore completed successfully: {backup_name}")
         else:
-            # If we get here, we've exceeded max attempts
-            logger.warning(f"Restore status check timed out after {max_attempts} attempts. Assuming it's still running in the background.")
+            logger.warning(f"Restore status check timed out after {WEAVIATE_RESTORE_TIMEOUT} seconds. Assuming it's still running in the background.")
+        
+        # The restored corpus invalidates cached retrievals
+        # Import locally to avoid loading the ingestion stack for other restores
+        from ..ingestion.embeddings_utils import bump_corpus_version
+        bump_corpus_version()
         
         return {
             'status': 'success',
@@ -224,6 +365,11 @@ def restore_media_files(backup_path):
     """
     Restore media files from a backup archive.
     
+    The archive is extracted next to MEDIA_ROOT, on the same filesystem,
+    and swapped in with renames, so no files are copied and MEDIA_ROOT is
+    never missing or half-written. The replaced directory is kept as
+    MEDIA_ROOT.old.<timestamp> and deleted in the background.
+    
     Args:
         backup_path (str): Path to the backup archive file
     
@@ -233,30 +379,165 @@ def restore_media_files(backup_path):
     try:
         logger.info(f"Starting media files restore from {backup_path}")
         
-        # Create temporary directory for extraction
-        with tempfile.TemporaryDirectory() as temp_dir:
+        media_dir = os.path.normpath(settings.MEDIA_ROOT)
+        parent_dir = os.path.dirname(media_dir)
+        os.makedirs(parent_dir, exist_ok=True)
+        
+        # Create temporary directory for extraction beside the media directory
+        temp_dir = tempfile.mkdtemp(dir=parent_dir, prefix='.media_restore_')
+        old_dir = None
+        try:
             # Extract archive
-            shutil.unpack_archive(backup_path, temp_dir)
+            _extract_archive(backup_path, temp_dir)
             
             # Determine extracted directory
             extracted_dir = os.path.join(temp_dir, os.listdir(temp_dir)[0])
             
-            # Remove existing media directory
-            media_dir = settings.MEDIA_ROOT
+            # Move the current media directory aside, then rename the
+            # extracted one into place
             if os.path.exists(media_dir):
-                shutil.rmtree(media_dir)
-            
-            # Copy extracted files to media directory
-            shutil.copytree(extracted_dir, media_dir)
-            
-            logger.info(f"Media files restored successfully to {media_dir}")
-            
-            return {
-                'status': 'success',
-                'backup_file': backup_path,
-                'media_dir': media_dir
-            }
+                old_dir = f"{media_dir}.old.{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+                os.rename(media_dir, old_dir)
+            try:
+                os.rename(extracted_dir, media_dir)
+            except OSError:
+                if old_dir:
+                    os.rename(old_dir, media_dir)
+                raise
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+        
+        if old_dir:
+            remove_replaced_media_dir.delay(old_dir)
+        
+        logger.info(f"Media files restored successfully to {media_dir}")
+        
+        return {
+            'status': 'success',
+            'backup_file': backup_path,
+            'media_dir': media_dir
+        }
         
     except Exception as e:
         logger.error(f"Error during media files restore: {str(e)}")
-        raise
\ No newline at end of file
+        raise
+
+
+def _write_media_file(media_dir, relative_path, source, expected_sha256):
+    """
+    Write one restored file under media_dir, replacing any existing copy
+    atomically. Paths that would land outside media_dir are rejected, and
+    a file whose SHA-256 doesn't match its manifest entry is not written.
+    """
+    target = os.path.normpath(os.path.join(media_dir, relative_path))
+    if not target.startswith(media_dir + os.sep):
+        raise Exception(f"Refusing to restore file outside media directory: {relative_path}")
+    
+    target_dir = os.path.dirname(target)
+    os.makedirs(target_dir, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=target_dir, prefix='.restore_')
+    try:
+        reader = _HashingReader(source)
+        with os.fdopen(fd, 'wb') as temp_file:
+            shutil.copyfileobj(reader, temp_file, 1024 * 1024)
+        if reader.sha256.hexdigest() != expected_sha256:
+            raise Exception(f"Checksum mismatch for restored media file: {relative_path}")
+        os.replace(temp_path, target)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def _restore_media_object(s3_key, entries, is_shard, media_dir, bucket_name):
+    """
+    Download one object of a per-file media backup and write out the
+    requested files it holds.
+    
+    Returns:
+        int: Number of files restored
+    """
+    expected_hashes = {entry['path']: entry['sha256'] for entry in entries}
+    with tempfile.TemporaryFile() as download:
+        get_s3_client().download_fileobj(bucket_name, s3_key, download)
+        download.seek(0)
+        
+        if is_shard:
+            with tarfile.open(fileobj=download, mode='r:gz') as tar:
+                for member in tar:
+                    if member.isfile() and member.name in expected_hashes:
+                        _write_media_file(
+                            media_dir, member.name, tar.extractfile(member),
+                            expected_hashes[member.name]
+                        )
+        else:
+            with gzip.GzipFile(fileobj=download, mode='rb') as gz:
+                _write_media_file(media_dir, entries[0]['path'], gz, entries[0]['sha256'])
+    return len(entries)
+
+
+def restore_media_from_s3(backup_name, paths=None, bucket_name=None):
+    """
+    Restore media files from a per-file S3 backup, as written by
+    backup_media_files when BACKUP_CLEANUP_LOCAL is set.
+    
+    Files are written into MEDIA_ROOT in place, overwriting existing
+    copies; other files are left alone. Each file is checked against the
+    SHA-256 in the manifest before it is written. Objects are downloaded
+    in parallel, and only the objects holding requested files are fetched.
+    
+    Args:
+        backup_name (str): Name of the backup, e.g. 'media_backup_<timestamp>'
+        paths (list, optional): Paths relative to MEDIA_ROOT to restore; a
+            directory path restores everything under it. Defaults to all files.
+        bucket_name (str, optional): S3 bucket name, defaults to settings.AWS_BACKUP_BUCKET
+    
+    Returns:
+        dict: Result information
+    """
+    try:
+        bucket_name = bucket_name or settings.AWS_BACKUP_BUCKET
+        s3_prefix = f"media/{backup_name}"
+        media_dir = os.path.normpath(settings.MEDIA_ROOT)
+        
+        logger.info(f"Starting media files restore from s3://{bucket_name}/{s3_prefix}/")
+        
+        response = get_s3_client().get_object(Bucket=bucket_name, Key=f"{s3_prefix}/{MEDIA_MANIFEST_NAME}")
+        manifest = json.loads(response['Body'].read())
+        
+        entries = manifest['files']
+        if paths:
+            requested = {os.path.normpath(path) for path in paths}
+            dir_prefixes = tuple(f"{path}{os.sep}" for path in requested)
+            entries = [
+                entry for entry in entries
+                if entry['path'] in requested or entry['path'].startswith(dir_prefixes)
+            ]
+        
+        # Group the files by the object holding them
+        by_key = {}
+        for entry in entries:
+            by_key.setdefault(entry['key'], []).append(entry)
+        
+        shard_prefix = f"{s3_prefix}/shards/"
+        with ThreadPoolExecutor(max_workers=MEDIA_RESTORE_WORKERS) as executor:
+            futures = [
+                executor.submit(
+                    _restore_media_object, s3_key, key_entries,
+                    s3_key.startswith(shard_prefix), media_dir, bucket_name
+                )
+                for s3_key, key_entries in by_key.items()
+            ]
+            restored = sum(future.result() for future in futures)
+        
+        logger.info(f"Restored {restored} media files to {media_dir}")
+        
+        return {
+            'status': 'success',
+            'backup_name': backup_name,
+            'media_dir': media_dir,
+            'file_count': restored
+        }
+        
+    except Exception as e:
+        logger.error(f"Error during media files restore: {str(e)}")
+        raise
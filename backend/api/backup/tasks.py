@@ -7,16 +7,31 @@ import os
 import subprocess
 import shutil
 import logging
+import gzip
+import hashlib
+import itertools
+import json
+import random
+import tarfile
 import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config as BotoConfig
 from botocore.exceptions import ClientError
 import requests
+from requests.adapters import HTTPAdapter
 from django.conf import settings
-from celery import shared_task
+from django.core.cache import cache
+from celery import shared_task, chord, group
 from celery.exceptions import MaxRetriesExceededError
 from celery.utils.log import get_task_logger
 
+from api.analytics.collectors import AuditCollector
+
 # Set up logging
 logger = get_task_logger(__name__)
 
@@ -25,8 +40,92 @@ BACKUP_PATHS = {
     'postgres': os.path.join(settings.BASE_DIR, 'backups', 'postgres'),
     'weaviate': os.path.join(settings.BASE_DIR, 'backups', 'weaviate'),
     'media': os.path.join(settings.BASE_DIR, 'backups', 'media'),
+    'postgres_base': os.path.join(settings.BASE_DIR, 'backups', 'postgres_base'),
 }
 
+# Backup types whose backups are directories rather than single files
+DIRECTORY_BACKUP_TYPES = frozenset({'weaviate', 'postgres_base'})
+
+# S3 prefix for WAL segments shipped by archive_postgres_wal
+WAL_S3_PREFIX = 'postgres_wal'
+
+# Multipart settings for backup file uploads; large parts and more threads
+# keep multi-GB archives from being limited by boto3's 8 MB defaults
+S3_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=64 * 1024 * 1024,
+    multipart_chunksize=64 * 1024 * 1024,
+    max_concurrency=16,
+    use_threads=True,
+    max_io_queue=1000,
+)
+
+# Multipart settings for uploads streamed from a pipe, where the total
+# size is unknown up front
+S3_STREAM_TRANSFER_CONFIG = TransferConfig(
+    multipart_chunksize=64 * 1024 * 1024,
+    max_concurrency=8,
+    use_threads=True,
+)
+
+# Shared HTTP session for the Weaviate backup API, so status polls reuse
+# pooled keep-alive connections instead of reconnecting each time
+WEAVIATE_SESSION = requests.Session()
+WEAVIATE_SESSION.mount('http://', HTTPAdapter(pool_connections=10, pool_maxsize=10))
+WEAVIATE_SESSION.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=10))
+
+# Weaviate backup/restore status polling: check soon after starting, then
+# back off exponentially up to the max delay until the deadline. Each
+# knob can be overridden with a setting of the same name
+WEAVIATE_POLL_INITIAL_DELAY = getattr(settings, 'WEAVIATE_POLL_INITIAL_DELAY', 1.0)  # seconds
+WEAVIATE_POLL_MAX_DELAY = getattr(settings, 'WEAVIATE_POLL_MAX_DELAY', 30.0)  # seconds
+WEAVIATE_POLL_BACKOFF = getattr(settings, 'WEAVIATE_POLL_BACKOFF', 1.7)
+WEAVIATE_BACKUP_TIMEOUT = getattr(settings, 'WEAVIATE_BACKUP_TIMEOUT', 300)  # seconds
+WEAVIATE_RESTORE_TIMEOUT = getattr(settings, 'WEAVIATE_RESTORE_TIMEOUT', 600)  # seconds
+
+# Delay before a failed backup task is retried
+BACKUP_RETRY_COUNTDOWN = 5 * 60  # seconds
+
+# pg_dump output is compressed with multithreaded zstd when it's installed,
+# instead of pg_dump's single-threaded built-in zlib
+ZSTD_COMPRESS_ARGS = ['-T0', '-3', '-q', '-c']
+ZSTD_EXTENSION = '.zst'
+
+# S3 clients shared by all backup tasks in this process, keyed by whether
+# they use the accelerate endpoint; built lazily by get_s3_client
+_S3_CLIENTS = {}
+_S3_CLIENTS_LOCK = threading.Lock()
+
+# Maximum keys per S3 DeleteObjects request
+S3_DELETE_BATCH_SIZE = 1000
+
+# Per-file media backups: files below the threshold are bundled into
+# tar.gz shards of about MEDIA_SHARD_SIZE so tiny files don't each cost
+# an upload request
+MEDIA_SHARD_THRESHOLD = 1024 * 1024  # 1 MB
+MEDIA_SHARD_SIZE = 64 * 1024 * 1024  # 64 MB
+MEDIA_MANIFEST_NAME = 'manifest.json'
+
+# Threads compressing and uploading media files; gzip and S3 I/O release
+# the GIL, and Celery's prefork children can't start worker processes
+MEDIA_UPLOAD_THREADS = 16
+
+# Connections kept by each shared S3 client; every media upload thread may
+# run a multipart upload at full S3_TRANSFER_CONFIG concurrency, and
+# botocore's default of 10 would leave those threads waiting on the pool
+S3_MAX_POOL_CONNECTIONS = MEDIA_UPLOAD_THREADS * S3_TRANSFER_CONFIG.max_concurrency
+
+# Environment variables passed through to PostgreSQL client commands;
+# everything else, including PGPASSWORD, is dropped
+PG_ENV_PASSTHROUGH = ('PATH', 'HOME', 'LANG', 'LC_ALL', 'TMPDIR', 'PGSSLMODE', 'PGSSLROOTCERT', 'PGSSLCERT', 'PGSSLKEY')
+
+# Minimal client environments pointing at the BACKUP_PGPASS_FILE .pgpass
+# file, keyed by connection settings; built lazily by get_pg_env
+_PG_ENVS = {}
+_PG_ENVS_LOCK = threading.Lock()
+
+# Backup listing shown in the admin, built by refresh_backup_index
+BACKUP_INDEX_CACHE_KEY = 'backup:list:materialized'
+
 # Ensure backup directories exist
 for path in BACKUP_PATHS.values():
     os.makedirs(path, exist_ok=True)
@@ -46,9 +145,8 @@ def backup_postgres_database(self):
         # Get database connection details from settings
         db_settings = settings.DATABASES['default']
         
-        # Set environment variables for pg_dump
-        env = os.environ.copy()
-        env['PGPASSWORD'] = db_settings['PASSWORD']
+        # Client environment with the password in a .pgpass file
+        env = get_pg_env(db_settings)
         
         # Build pg_dump command
         cmd = [
@@ -56,32 +154,50 @@ def backup_postgres_database(self):
             '--host', db_settings['HOST'],
             '--port', db_settings['PORT'],
             '--username', db_settings['USER'],
-            '--format=c',  # Custom format (compressed)
-            '--file', backup_path,
-            db_settings['NAME']
+            '--format=c',  # Custom format
         ]
         
-        # Execute pg_dump
-        logger.info(f"Starting PostgreSQL backup: {backup_filename}")
-        process = subprocess.Popen(cmd, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, stderr = process.communicate()
-        
-        if process.returncode != 0:
-            error_msg = stderr.decode('utf-8')
-            logger.error(f"PostgreSQL backup failed: {error_msg}")
-            raise Exception(f"pg_dump failed: {error_msg}")
+        # Compress with zstd on all cores when available; otherwise pg_dump
+        # compresses the custom-format archive itself
+        pipeline = [cmd]
+        zstd_path = shutil.which('zstd')
+        if zstd_path:
+            cmd.append('--compress=0')
+            pipeline.append([zstd_path, *ZSTD_COMPRESS_ARGS])
+            backup_filename += ZSTD_EXTENSION
+            backup_path += ZSTD_EXTENSION
+        cmd.append(check_pg_arg(db_settings['NAME'], 'database name'))
         
-        logger.info(f"PostgreSQL backup completed: {backup_path}")
-        
-        # Upload to S3 if configured
-        if hasattr(settings, 'AWS_BACKUP_BUCKET'):
+        # When the local copy would be deleted after upload anyway, pipe the
+        # dump straight to S3 instead of writing it to disk first
+        if settings.AWS_BACKUP_BUCKET and getattr(settings, 'BACKUP_CLEANUP_LOCAL', False):
             s3_key = f"postgres/{backup_filename}"
-            upload_to_s3(backup_path, s3_key, settings.AWS_BACKUP_BUCKET)
             
-            # Clean up local file after successful S3 upload if configured
-            if getattr(settings, 'BACKUP_CLEANUP_LOCAL', False):
-                os.remove(backup_path)
-                logger.info(f"Local backup file removed: {backup_path}")
+            logger.info(f"Starting PostgreSQL backup: {backup_filename} (streaming to S3)")
+            stream_pipeline_to_s3(pipeline, env, s3_key, settings.AWS_BACKUP_BUCKET)
+            backup_path = f"s3://{settings.AWS_BACKUP_BUCKET}/{s3_key}"
+            logger.info(f"PostgreSQL backup completed: {backup_path}")
+        else:
+            # Execute pg_dump
+            logger.info(f"Starting PostgreSQL backup: {backup_filename}")
+            with open(backup_path, 'wb') as backup_file, tempfile.TemporaryFile() as stderr_file:
+                processes = start_pipeline(pipeline, env, stdout=backup_file, stderr=stderr_file)
+                returncodes = [process.wait() for process in processes]
+                
+                if any(returncodes):
+                    stderr_file.seek(0)
+                    error_msg = stderr_file.read().decode('utf-8')
+                    logger.error(f"PostgreSQL backup failed: {error_msg}")
+                    backup_file.close()
+                    os.remove(backup_path)
+                    raise Exception(f"pg_dump failed: {error_msg}")
+            
+            logger.info(f"PostgreSQL backup completed: {backup_path}")
+            
+            # Upload to S3 if configured
+            if settings.AWS_BACKUP_BUCKET:
+                s3_key = f"postgres/{backup_filename}"
+                upload_to_s3(backup_path, s3_key, settings.AWS_BACKUP_BUCKET)
         
         # Cleanup old backups
         cleanup_old_backups('postgres', settings.BACKUP_RETENTION_DAYS)
@@ -95,12 +211,122 @@ def backup_postgres_database(self):
     except Exception as e:
         logger.error(f"Error during PostgreSQL backup: {str(e)}")
         try:
-            self.retry(countdown=60 * 5)  # Retry after 5 minutes
+            self.retry(countdown=BACKUP_RETRY_COUNTDOWN)
         except MaxRetriesExceededError:
             logger.error("Max retries exceeded for PostgreSQL backup")
         raise
 
 
+@shared_task(bind=True, max_retries=3)
+def backup_postgres_basebackup(self):
+    """
+    Take a physical base backup of the PostgreSQL cluster with pg_basebackup.
+    Combined with the WAL segments shipped by archive_postgres_wal, this
+    allows point-in-time recovery; the nightly pg_dump remains the
+    logical backup.
+    """
+    try:
+        backup_timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        backup_name = f"pg_base_{backup_timestamp}"
+        backup_path = os.path.join(BACKUP_PATHS['postgres_base'], backup_name)
+        
+        # Get database connection details from settings
+        db_settings = settings.DATABASES['default']
+        
+        # Client environment with the password in a .pgpass file
+        env = get_pg_env(db_settings)
+        
+        # Writes base.tar.gz plus pg_wal.tar.gz holding the WAL needed to
+        # make the backup consistent
+        cmd = [
+            'pg_basebackup',
+            '--host', db_settings['HOST'],
+            '--port', db_settings['PORT'],
+            '--username', db_settings['USER'],
+            '--pgdata', backup_path,
+            '--format=tar',
+            '--gzip',
+            '--wal-method=stream',
+            '--checkpoint=fast',
+        ]
+        
+        logger.info(f"Starting PostgreSQL base backup: {backup_name}")
+        result = subprocess.run(cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        
+        if result.returncode != 0:
+            error_msg = result.stderr.decode('utf-8')
+            logger.error(f"PostgreSQL base backup failed: {error_msg}")
+            shutil.rmtree(backup_path, ignore_errors=True)
+            raise Exception(f"pg_basebackup failed: {error_msg}")
+        
+        logger.info(f"PostgreSQL base backup completed: {backup_path}")
+        
+        # Upload to S3 if configured
+        if settings.AWS_BACKUP_BUCKET:
+            with os.scandir(backup_path) as entries:
+                for entry in entries:
+                    s3_key = f"postgres_base/{backup_name}/{entry.name}"
+                    upload_to_s3(entry.path, s3_key, settings.AWS_BACKUP_BUCKET)
+            
+            # Clean up local files after successful S3 upload if configured
+            if getattr(settings, 'BACKUP_CLEANUP_LOCAL', False):
+                shutil.rmtree(backup_path)
+                logger.info(f"Local base backup removed: {backup_path}")
+            
+            # WAL older than the oldest kept base backup can't be replayed
+            cutoff = time.time() - settings.BACKUP_BASE_RETENTION_DAYS * 86400
+            cleanup_old_s3_backups(WAL_S3_PREFIX, cutoff, settings.AWS_BACKUP_BUCKET)
+        
+        # Cleanup old backups
+        cleanup_old_backups('postgres_base', settings.BACKUP_BASE_RETENTION_DAYS)
+        
+        return {
+            'status': 'success',
+            'backup_name': backup_name,
+            'path': backup_path,
+            'timestamp': backup_timestamp
+        }
+        
+    except Exception as e:
+        logger.error(f"Error during PostgreSQL base backup: {str(e)}")
+        try:
+            self.retry(countdown=BACKUP_RETRY_COUNTDOWN)
+        except MaxRetriesExceededError:
+            logger.error("Max retries exceeded for PostgreSQL base backup")
+        raise
+
+
+@shared_task
+def archive_postgres_wal():
+    """
+    Upload completed WAL segments written by pg_receivewal to S3 and
+    remove them locally. In-progress (.partial) segments are left for a
+    later run. Does nothing unless POSTGRES_WAL_DIR and AWS_BACKUP_BUCKET
+    are both set.
+    
+    Returns:
+        int: Number of files archived
+    """
+    wal_dir = getattr(settings, 'POSTGRES_WAL_DIR', '')
+    if not wal_dir or not settings.AWS_BACKUP_BUCKET:
+        return 0
+    
+    with os.scandir(wal_dir) as entries:
+        # WAL segment names sort in log order
+        segments = sorted(
+            (entry.name, entry.path) for entry in entries
+            if entry.is_file() and not entry.name.endswith('.partial')
+        )
+    
+    for name, path in segments:
+        upload_to_s3(path, f"{WAL_S3_PREFIX}/{name}", settings.AWS_BACKUP_BUCKET)
+        os.remove(path)
+    
+    if segments:
+        logger.info(f"Archived {len(segments)} WAL files to S3")
+    return len(segments)
+
+
 @shared_task(bind=True, max_retries=3)
 def backup_weaviate_database(self):
     """
@@ -155,7 +381,7 @@ def backup_weaviate_database(self):
             headers["Authorization"] = f"Bearer {settings.WEAVIATE_API_KEY}"
         
         # Create backup request
-        response = requests.post(backup_endpoint, json=payload, headers=headers)
+        response = WEAVIATE_SESSION.post(backup_endpoint, json=payload, headers=headers)
         
         if not response.ok:
             error_msg = f"Weaviate backup creation failed: {response.status_code} - {response.text}"
@@ -168,35 +394,15 @@ def backup_weaviate_database(self):
         backup_status_endpoint = f"{backup_endpoint}/{backup_name}"
         
         # Poll for backup completion
-        max_attempts = 30  # 30 attempts with 10 seconds between = 5 minutes max wait
-        for attempt in range(max_attempts):
-            status_response = requests.get(backup_status_endpoint, headers=headers)
-            
-            if not status_response.ok:
-                logger.warning(f"Failed to get backup status: {status_response.status_code} - {status_response.text}")
-                continue
-            
-            status_data = status_response.json()
-            status = status_data.get("status", "")
-            
-            if status == "SUCCESS":
-                logger.info(f"Weaviate backup completed successfully: {backup_name}")
-                break
-            elif status == "FAILED":
-                error_msg = f"Weaviate backup failed: {status_data.get('error', 'Unknown error')}"
-                logger.error(error_msg)
-                raise Exception(error_msg)
-            else:
-                # Still in progress, wait and retry
-                import time
-                time.sleep(10)  # Wait 10 seconds before checking again
+        # The POST response already carries the initial status
+        if wait_for_weaviate_operation(backup_status_endpoint, headers, WEAVIATE_BACKUP_TIMEOUT, 'backup',
+                                       initial_status=weaviate_response_status(response)):
+            logger.info(f"Weaviate backup completed successfully: {backup_name}")
         else:
-            # If we get here, we've exceeded max attempts
-            logger.warning(f"Backup status check timed out after {max_attempts} attempts. Assuming it's still running in the background.")
+            logger.warning(f"Backup status check timed out after {WEAVIATE_BACKUP_TIMEOUT} seconds. Assuming it's still running in the background.")
         
-        # Cleanup old backups if using filesystem
-        if backend == "filesystem":
-            cleanup_old_backups('weaviate', settings.BACKUP_RETENTION_DAYS)
+        # Cleanup old backups (local snapshots and S3 copies)
+        cleanup_old_backups('weaviate', settings.BACKUP_RETENTION_DAYS)
         
         return {
             'status': 'success',
@@ -208,7 +414,7 @@ def backup_weaviate_database(self):
     except Exception as e:
         logger.error(f"Error during Weaviate backup: {str(e)}")
         try:
-            self.retry(countdown=60 * 5)  # Retry after 5 minutes
+            self.retry(countdown=BACKUP_RETRY_COUNTDOWN)
         except MaxRetriesExceededError:
             logger.error("Max retries exceeded for Weaviate backup")
         raise
@@ -221,33 +427,41 @@ def backup_media_files(self):
     """
     try:
         backup_timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        backup_filename = f"media_backup_{backup_timestamp}.tar.gz"
-        backup_path = os.path.join(BACKUP_PATHS['media'], backup_filename)
-        
-        # Create tar.gz archive of media directory
+        backup_name = f"media_backup_{backup_timestamp}"
         media_dir = settings.MEDIA_ROOT
         
+        # With S3 as the only copy, upload files individually in parallel
+        # so they can also be restored individually
+        if settings.AWS_BACKUP_BUCKET and getattr(settings, 'BACKUP_CLEANUP_LOCAL', False):
+            logger.info(f"Starting per-file media backup to S3: {backup_name}")
+            s3_prefix = f"media/{backup_name}"
+            manifest = upload_media_files_to_s3(media_dir, s3_prefix, settings.AWS_BACKUP_BUCKET)
+            logger.info(f"Media files backup completed: {len(manifest['files'])} files")
+            
+            cleanup_old_backups('media', settings.BACKUP_RETENTION_DAYS)
+            
+            return {
+                'status': 'success',
+                'backup_name': backup_name,
+                'manifest_key': f"{s3_prefix}/{MEDIA_MANIFEST_NAME}",
+                'file_count': len(manifest['files']),
+                'timestamp': backup_timestamp
+            }
+        
+        backup_filename = f"{backup_name}.tar.gz"
+        backup_path = os.path.join(BACKUP_PATHS['media'], backup_filename)
+        
         logger.info(f"Starting media files backup: {backup_filename}")
         
-        # Create the archive
-        shutil.make_archive(
-            backup_path.replace('.tar.gz', ''),  # Base name without extension
-            'gztar',  # Format
-            root_dir=os.path.dirname(media_dir),  # Parent directory
-            base_dir=os.path.basename(media_dir)  # Directory to archive
-        )
+        # Create tar.gz archive of media directory
+        create_media_archive(media_dir, backup_path)
         
         logger.info(f"Media files backup completed: {backup_path}")
         
         # Upload to S3 if configured
-        if hasattr(settings, 'AWS_BACKUP_BUCKET'):
+        if settings.AWS_BACKUP_BUCKET:
             s3_key = f"media/{backup_filename}"
             upload_to_s3(backup_path, s3_key, settings.AWS_BACKUP_BUCKET)
-            
-            # Clean up local file after successful S3 upload if configured
-            if getattr(settings, 'BACKUP_CLEANUP_LOCAL', False):
-                os.remove(backup_path)
-                logger.info(f"Local backup file removed: {backup_path}")
         
         # Cleanup old backups
         cleanup_old_backups('media', settings.BACKUP_RETENTION_DAYS)
@@ -261,12 +475,408 @@ def backup_media_files(self):
     except Exception as e:
         logger.error(f"Error during media files backup: {str(e)}")
         try:
-            self.retry(countdown=60 * 5)  # Retry after 5 minutes
+            self.retry(countdown=BACKUP_RETRY_COUNTDOWN)
         except MaxRetriesExceededError:
             logger.error("Max retries exceeded for media files backup")
         raise
 
 
+def _weaviate_operation_done(status_data, operation):
+    """
+    Return True if a Weaviate backup/restore status says it succeeded,
+    False if it is still running. Raises if it failed.
+    """
+    status = status_data.get("status", "")
+    
+    if status == "SUCCESS":
+        return True
+    elif status == "FAILED":
+        error_msg = f"Weaviate {operation} failed: {status_data.get('error', 'Unknown error')}"
+        logger.error(error_msg)
+        raise Exception(error_msg)
+    
+    logger.info(f"Weaviate {operation} in progress: {status}")
+    return False
+
+
+def wait_for_weaviate_operation(status_endpoint, headers, timeout, operation, initial_status=None):
+    """
+    Poll a Weaviate backup or restore status endpoint until it finishes.
+    Waits grow exponentially (with jitter) between checks, so short jobs
+    are noticed within seconds and long ones aren't polled needlessly.
+    
+    Args:
+        status_endpoint (str): Weaviate status URL
+        headers (dict): Request headers
+        timeout (float): Seconds to wait before giving up
+        operation (str): 'backup' or 'restore', for messages
+        initial_status (dict, optional): Status body returned by the request
+            that started the operation. When given, it stands in for the
+            first poll, and polling starts after the initial delay.
+    
+    Returns:
+        bool: True if the operation succeeded, False if the timeout passed first
+    """
+    deadline = time.monotonic() + timeout
+    delay = WEAVIATE_POLL_INITIAL_DELAY
+    
+    if initial_status is not None and _weaviate_operation_done(initial_status, operation):
+        return True
+    poll_now = initial_status is None
+    
+    while True:
+        if poll_now:
+            status_response = WEAVIATE_SESSION.get(status_endpoint, headers=headers)
+            
+            if status_response.ok:
+                if _weaviate_operation_done(status_response.json(), operation):
+                    return True
+            else:
+                logger.warning(f"Failed to get {operation} status: {status_response.status_code} - {status_response.text}")
+        poll_now = True
+        
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        
+        # Jitter keeps concurrent jobs from polling in lockstep
+        time.sleep(min(delay + random.uniform(0, delay * 0.1), remaining))
+        delay = min(delay * WEAVIATE_POLL_BACKOFF, WEAVIATE_POLL_MAX_DELAY)
+
+
+def weaviate_response_status(response):
+    """Return the JSON status body of a Weaviate backup/restore POST, or None"""
+    try:
+        status_data = response.json()
+    except ValueError:
+        return None
+    return status_data if isinstance(status_data, dict) and status_data.get("status") else None
+
+
+def get_s3_client(use_accelerate=None):
+    """
+    Return an S3 client for the backup credentials in the environment.
+    Uses the Transfer Acceleration endpoint when AWS_S3_USE_ACCELERATE is
+    set, unless a custom (non-AWS) endpoint is configured.
+    
+    Clients are built once per process (per endpoint mode) and shared;
+    boto3 clients are thread-safe, and reusing one skips loading the
+    botocore service model and keeps its connection pool warm.
+    """
+    endpoint_url = os.getenv('AWS_S3_ENDPOINT')  # For non-AWS S3-compatible storage
+    if use_accelerate is None:
+        use_accelerate = getattr(settings, 'AWS_S3_USE_ACCELERATE', False) and not endpoint_url
+    use_accelerate = bool(use_accelerate)
+    
+    s3_client = _S3_CLIENTS.get(use_accelerate)
+    if s3_client is None:
+        with _S3_CLIENTS_LOCK:
+            s3_client = _S3_CLIENTS.get(use_accelerate)
+            if s3_client is None:
+                config = BotoConfig(
+                    retries={'mode': 'adaptive', 'max_attempts': 10},
+                    max_pool_connections=S3_MAX_POOL_CONNECTIONS,
+                )
+                if use_accelerate:
+                    config = config.merge(BotoConfig(
+                        s3={'use_accelerate_endpoint': True, 'addressing_style': 'virtual'}
+                    ))
+                
+                s3_client = boto3.client(
+                    's3',
+                    aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
+                    aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
+                    endpoint_url=endpoint_url,
+                    config=config
+                )
+                _S3_CLIENTS[use_accelerate] = s3_client
+    return s3_client
+
+
+def create_media_archive(media_dir, backup_path):
+    """
+    Write a .tar.gz archive of media_dir to backup_path.
+    Pipes tar into pigz to compress on all cores when pigz is installed,
+    falling back to single-threaded shutil.make_archive otherwise.
+    
+    Args:
+        media_dir (str): Directory to archive
+        backup_path (str): Path of the .tar.gz file to create
+    """
+    root_dir = os.path.dirname(media_dir)  # Parent directory
+    base_dir = os.path.basename(media_dir)  # Directory to archive
+    
+    pigz_path = shutil.which('pigz')
+    if not pigz_path:
+        shutil.make_archive(
+            backup_path.replace('.tar.gz', ''),  # Base name without extension
+            'gztar',  # Format
+            root_dir=root_dir,
+            base_dir=base_dir
+        )
+        return
+    
+    with open(backup_path, 'wb') as archive, tempfile.TemporaryFile() as stderr_file:
+        processes = start_pipeline(
+            [
+                ['tar', '-cf', '-', '-C', root_dir, base_dir],
+                [pigz_path, '-p', str(os.cpu_count() or 1), '-6'],
+            ],
+            env=None, stdout=archive, stderr=stderr_file
+        )
+        returncodes = [process.wait() for process in processes]
+        
+        if any(returncodes):
+            stderr_file.seek(0)
+            error_msg = stderr_file.read().decode('utf-8')
+            archive.close()
+            os.remove(backup_path)
+            raise Exception(f"Media archive failed: {error_msg}")
+
+
+def _walk_media_files(media_dir):
+    """Yield (path, relative_path, size) for every regular file under media_dir"""
+    pending = [media_dir]
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry.path, os.path.relpath(entry.path, media_dir), entry.stat(follow_symlinks=False).st_size
+
+
+class _HashingReader:
+    """File wrapper that computes the SHA-256 of everything read through it"""
+    
+    def __init__(self, fileobj):
+        self.fileobj = fileobj
+        self.sha256 = hashlib.sha256()
+    
+    def read(self, size=-1):
+        data = self.fileobj.read(size)
+        self.sha256.update(data)
+        return data
+
+
+def _compress_and_upload_media_file(path, relative_path, s3_key, bucket_name):
+    """
+    Gzip one media file and upload it as a single object.
+    Runs in a worker thread of upload_media_files_to_s3.
+    
+    Returns:
+        list: The file's manifest entry
+    """
+    with tempfile.NamedTemporaryFile(suffix='.gz') as compressed:
+        with open(path, 'rb') as source:
+            reader = _HashingReader(source)
+            with gzip.GzipFile(fileobj=compressed, mode='wb', compresslevel=6) as gz:
+                shutil.copyfileobj(reader, gz, 1024 * 1024)
+        compressed.flush()
+        get_s3_client().upload_file(compressed.name, bucket_name, s3_key, Config=S3_TRANSFER_CONFIG)
+    
+    return [{
+        'path': relative_path,
+        'key': s3_key,
+        'size': os.path.getsize(path),
+        'sha256': reader.sha256.hexdigest(),
+    }]
+
+
+def _compress_and_upload_media_shard(files, s3_key, bucket_name):
+    """
+    Bundle small media files into one tar.gz shard and upload it.
+    Runs in a worker thread of upload_media_files_to_s3.
+    
+    Args:
+        files (list): (path, relative_path) pairs; members are named by relative path
+    
+    Returns:
+        list: Manifest entries for the files in the shard
+    """
+    entries = []
+    with tempfile.NamedTemporaryFile(suffix='.tar.gz') as compressed:
+        with tarfile.open(fileobj=compressed, mode='w:gz', compresslevel=6) as tar:
+            for path, relative_path in files:
+                tarinfo = tar.gettarinfo(path, arcname=relative_path)
+                with open(path, 'rb') as source:
+                    reader = _HashingReader(source)
+                    tar.addfile(tarinfo, reader)
+                entries.append({
+                    'path': relative_path,
+                    'key': s3_key,
+                    'size': tarinfo.size,
+                    'sha256': reader.sha256.hexdigest(),
+                })
+        compressed.flush()
+        get_s3_client().upload_file(compressed.name, bucket_name, s3_key, Config=S3_TRANSFER_CONFIG)
+    return entries
+
+
+def upload_media_files_to_s3(media_dir, s3_prefix, bucket_name):
+    """
+    Back up media_dir to S3 file by file, compressing and uploading in a
+    pool of worker threads. Files of MEDIA_SHARD_THRESHOLD and up become
+    one gzipped object each; smaller ones are bundled into tar.gz shards.
+    A manifest mapping each file to its object is written last, so a
+    backup without one is incomplete.
+    
+    Args:
+        media_dir (str): Media directory to back up
+        s3_prefix (str): Key prefix for the backup's objects
+        bucket_name (str): S3 bucket name
+    
+    Returns:
+        dict: The manifest
+    """
+    futures = []
+    with ThreadPoolExecutor(max_workers=MEDIA_UPLOAD_THREADS) as executor:
+        shard, shard_size = [], 0
+        shard_numbers = itertools.count()
+        
+        def submit_shard():
+            s3_key = f"{s3_prefix}/shards/shard_{next(shard_numbers):06d}.tar.gz"
+            futures.append(executor.submit(_compress_and_upload_media_shard, shard, s3_key, bucket_name))
+        
+        for path, relative_path, size in _walk_media_files(media_dir):
+            if size >= MEDIA_SHARD_THRESHOLD:
+                s3_key = f"{s3_prefix}/files/{relative_path}.gz"
+                futures.append(executor.submit(
+                    _compress_and_upload_media_file, path, relative_path, s3_key, bucket_name
+                ))
+                continue
+            
+            shard.append((path, relative_path))
+            shard_size += size
+            if shard_size >= MEDIA_SHARD_SIZE:
+                submit_shard()
+                shard, shard_size = [], 0
+        if shard:
+            submit_shard()
+        
+        files = [entry for future in futures for entry in future.result()]
+    
+    manifest = {
+        'created_at': datetime.now().isoformat(),
+        'files': files,
+    }
+    get_s3_client().put_object(
+        Bucket=bucket_name,
+        Key=f"{s3_prefix}/{MEDIA_MANIFEST_NAME}",
+        Body=json.dumps(manifest).encode('utf-8'),
+        ContentType='application/json'
+    )
+    logger.info(f"Uploaded {len(files)} media files in {len(futures)} objects to s3://{bucket_name}/{s3_prefix}/")
+    return manifest
+
+
+def check_pg_arg(value, name):
+    """
+    Validate a connection setting or database name passed to a PostgreSQL
+    client command, so it can't be read as an option or break the
+    .pgpass format.
+    
+    Returns:
+        str: The value as a string
+    """
+    value = str(value)
+    if value.startswith('-') or any(char in value for char in '\0\r\n'):
+        raise ValueError(f"Invalid PostgreSQL {name}: {value!r}")
+    return value
+
+
+def _pgpass_field(value):
+    """Escape a .pgpass field"""
+    return str(value).replace('\\', '\\\\').replace(':', '\\:')
+
+
+def get_pg_env(db_settings):
+    """
+    Return the environment for PostgreSQL client commands (pg_dump,
+    pg_restore, ...) connecting with db_settings.
+    
+    The password is written once per process to the 0600 .pgpass file at
+    settings.BACKUP_PGPASS_FILE, named by PGPASSFILE, rather than set as
+    PGPASSWORD, so it isn't visible in the process environment. Every
+    worker process uses the same file, so none are left behind by worker
+    children that exit without running cleanup. Only PG_ENV_PASSTHROUGH
+    variables are kept.
+    
+    Args:
+        db_settings (dict): A settings.DATABASES entry
+    
+    Returns:
+        dict: Environment for subprocess calls; treat as read-only
+    """
+    host = check_pg_arg(db_settings['HOST'], 'host')
+    port = check_pg_arg(db_settings['PORT'], 'port')
+    user = check_pg_arg(db_settings['USER'], 'user')
+    password = str(db_settings['PASSWORD'])
+    if any(char in password for char in '\r\n'):
+        # Don't echo the password itself
+        raise ValueError("Invalid PostgreSQL password: line breaks can't be stored in .pgpass")
+    key = (host, port, user, password)
+    
+    env = _PG_ENVS.get(key)
+    if env is None:
+        with _PG_ENVS_LOCK:
+            env = _PG_ENVS.get(key)
+            if env is None:
+                pgpass_path = settings.BACKUP_PGPASS_FILE
+                pgpass_dir = os.path.dirname(pgpass_path)
+                os.makedirs(pgpass_dir, exist_ok=True)
+                
+                # Written beside the file and moved into place, so processes
+                # starting together never read a partial file; mkstemp
+                # creates it with mode 0600
+                fd, temp_path = tempfile.mkstemp(prefix='.pgpass_', dir=pgpass_dir)
+                try:
+                    with os.fdopen(fd, 'w') as pgpass:
+                        # Any database, so restores can reach the maintenance database too
+                        fields = [host or 'localhost', port or '*', '*', user, password]
+                        pgpass.write(':'.join(_pgpass_field(field) for field in fields) + '\n')
+                    os.replace(temp_path, pgpass_path)
+                except BaseException:
+                    os.remove(temp_path)
+                    raise
+                
+                env = {name: os.environ[name] for name in PG_ENV_PASSTHROUGH if name in os.environ}
+                env['PGPASSFILE'] = pgpass_path
+                _PG_ENVS[key] = env
+    return env
+
+
+def start_pipeline(cmds, env, stdin=None, stdout=None, stderr=None):
+    """
+    Start commands connected like a shell pipeline (cmd1 | cmd2 | ...).
+    
+    Args:
+        cmds (list): Commands, each an argv list, in pipeline order
+        env (dict): Environment for every command (None to inherit)
+        stdin: stdin of the first command
+        stdout: stdout of the last command
+        stderr: stderr shared by all commands
+    
+    Returns:
+        list: The Popen objects, first to last
+    """
+    processes = []
+    for index, cmd in enumerate(cmds):
+        is_last = index == len(cmds) - 1
+        process = subprocess.Popen(
+            cmd, env=env, stdin=stdin,
+            stdout=stdout if is_last else subprocess.PIPE,
+            stderr=stderr
+        )
+        if processes:
+            # Only the next command should hold this pipe, so the previous
+            # one sees a broken pipe if its reader exits early
+            processes[-1].stdout.close()
+        processes.append(process)
+        stdin = process.stdout
+    return processes
+
+
 def upload_to_s3(file_path, s3_key, bucket_name):
     """
     Upload a file to S3 bucket.
@@ -279,16 +889,9 @@ def upload_to_s3(file_path, s3_key, bucket_name):
     try:
         logger.info(f"Uploading {file_path} to S3 bucket {bucket_name} with key {s3_key}")
         
-        # Initialize S3 client
-        s3_client = boto3.client(
-            's3',
-            aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-            aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
-            endpoint_url=os.getenv('AWS_S3_ENDPOINT')  # For non-AWS S3-compatible storage
-        )
-        
         # Upload file
-        s3_client.upload_file(file_path, bucket_name, s3_key)
+        s3_client = get_s3_client()
+        s3_client.upload_file(file_path, bucket_name, s3_key, Config=S3_TRANSFER_CONFIG)
         
         logger.info(f"Successfully uploaded to S3: s3://{bucket_name}/{s3_key}")
         return True
@@ -298,67 +901,354 @@ def upload_to_s3(file_path, s3_key, bucket_name):
         raise
 
 
+def stream_pipeline_to_s3(cmds, env, s3_key, bucket_name):
+    """
+    Run a command pipeline and upload its output to S3 as a multipart
+    upload, without staging the output on local disk.
+    
+    Args:
+        cmds (list): Commands (argv lists); the last one's stdout is the object body
+        env (dict): Environment for the commands
+        s3_key (str): S3 object key
+        bucket_name (str): S3 bucket name
+    """
+    s3_client = get_s3_client()
+    
+    # stderr goes to a file so a chatty command can't fill the pipe and
+    # stall while the upload is draining stdout
+    with tempfile.TemporaryFile() as stderr_file:
+        processes = start_pipeline(cmds, env, stdout=subprocess.PIPE, stderr=stderr_file)
+        output = processes[-1].stdout
+        try:
+            s3_client.upload_fileobj(output, bucket_name, s3_key, Config=S3_STREAM_TRANSFER_CONFIG)
+        except ClientError as e:
+            for process in processes:
+                process.kill()
+            logger.error(f"S3 upload error: {str(e)}")
+            raise
+        finally:
+            output.close()
+            returncodes = [process.wait() for process in processes]
+        
+        if any(returncodes):
+            stderr_file.seek(0)
+            error_msg = stderr_file.read().decode('utf-8')
+            logger.error(f"{cmds[0][0]} failed: {error_msg}")
+            # Don't leave a truncated object behind
+            s3_client.delete_object(Bucket=bucket_name, Key=s3_key)
+            raise Exception(f"{cmds[0][0]} failed: {error_msg}")
+    
+    logger.info(f"Successfully streamed to S3: s3://{bucket_name}/{s3_key}")
+    return True
+
+
+def cleanup_old_s3_backups(backup_type, cutoff, bucket_name):
+    """
+    Delete S3 backup objects under '<backup_type>/' last modified before
+    cutoff. Keys are listed a page at a time and deleted in batches of up
+    to S3_DELETE_BATCH_SIZE per DeleteObjects call.
+    
+    Args:
+        backup_type (str): Type of backup, used as the key prefix
+        cutoff (float): Unix timestamp; older objects are deleted
+        bucket_name (str): S3 bucket name
+    
+    Returns:
+        int: Number of objects deleted
+    """
+    s3_client = get_s3_client()
+    paginator = s3_client.get_paginator('list_objects_v2')
+    
+    expired = []
+    for page in paginator.paginate(Bucket=bucket_name, Prefix=f"{backup_type}/"):
+        for obj in page.get('Contents', []):
+            if obj['LastModified'].timestamp() < cutoff:
+                expired.append({'Key': obj['Key']})
+    
+    deleted = 0
+    for start in range(0, len(expired), S3_DELETE_BATCH_SIZE):
+        batch = expired[start:start + S3_DELETE_BATCH_SIZE]
+        response = s3_client.delete_objects(
+            Bucket=bucket_name,
+            Delete={'Objects': batch, 'Quiet': True}
+        )
+        errors = response.get('Errors', [])
+        for error in errors:
+            logger.error(f"Error deleting s3://{bucket_name}/{error['Key']}: {error.get('Message')}")
+        deleted += len(batch) - len(errors)
+    
+    if deleted:
+        logger.info(f"Removed {deleted} old {backup_type} backup objects from s3://{bucket_name}")
+    return deleted
+
+
 def cleanup_old_backups(backup_type, retention_days):
     """
-    Delete local backup files older than retention_days.
+    Delete backups older than retention_days, both local files and, when
+    AWS_BACKUP_BUCKET is set, the S3 copies under the type's prefix.
     
     Args:
-        backup_type (str): Type of backup ('postgres', 'weaviate', 'media')
+        backup_type (str): Type of backup ('postgres', 'weaviate', 'media', 'postgres_base')
         retention_days (int): Number of days to keep backups
     """
+    logger.info(f"Cleaning up old {backup_type} backups, keeping {retention_days} days")
+    
+    # Anything created before this timestamp is past retention
+    cutoff = time.time() - retention_days * 86400  # days to seconds
+    
     try:
         backup_dir = BACKUP_PATHS.get(backup_type)
         if not backup_dir or not os.path.exists(backup_dir):
             logger.warning(f"Backup directory not found for {backup_type}")
-            return
-        
-        logger.info(f"Cleaning up old {backup_type} backups, keeping {retention_days} days")
-        
-        import time
-        current_time = time.time()
-        max_age = retention_days * 86400  # days to seconds
+        else:
+            with os.scandir(backup_dir) as entries:
+                for entry in entries:
+                    try:
+                        # Directories in the weaviate and base backup folders are actual backups
+                        if backup_type in DIRECTORY_BACKUP_TYPES and entry.is_dir(follow_symlinks=False):
+                            if entry.stat(follow_symlinks=False).st_ctime < cutoff:
+                                logger.info(f"Removing old backup directory: {entry.path}")
+                                shutil.rmtree(entry.path)
+                        # Regular files for postgres and media backups
+                        elif entry.is_file():
+                            if entry.stat().st_ctime < cutoff:
+                                logger.info(f"Removing old backup file: {entry.path}")
+                                os.remove(entry.path)
+                    except FileNotFoundError:
+                        # Removed by a concurrent cleanup
+                        continue
         
-        for filename in os.listdir(backup_dir):
-            file_path = os.path.join(backup_dir, filename)
-            
-            # Skip directories in weaviate backup folder (they're actual backups)
-            if backup_type == 'weaviate' and os.path.isdir(file_path):
-                file_age = current_time - os.path.getctime(file_path)
-                if file_age > max_age:
-                    logger.info(f"Removing old backup directory: {file_path}")
-                    shutil.rmtree(file_path)
-            # Regular files for postgres and media backups
-            elif os.path.isfile(file_path):
-                file_age = current_time - os.path.getctime(file_path)
-                if file_age > max_age:
-                    logger.info(f"Removing old backup file: {file_path}")
-                    os.remove(file_path)
+        if settings.AWS_BACKUP_BUCKET:
+            cleanup_old_s3_backups(backup_type, cutoff, settings.AWS_BACKUP_BUCKET)
         
         logger.info(f"Cleanup of old {backup_type} backups completed")
         
     except Exception as e:
         logger.error(f"Error during cleanup of old {backup_type} backups: {str(e)}")
+    
+    # Runs after every completed local backup, so the listing picks up both
+    # the new backup and any removed ones
+    refresh_backup_index.delay()
+
+
+def _scan_backup_dir(backup_path, include_dirs):
+    """
+    Yield (name, path, size_bytes, ctime) for each backup in a directory.
+    Directories are sized recursively and only listed when include_dirs
+    is set. Entries removed mid-scan are skipped.
+    """
+    try:
+        entries = list(os.scandir(backup_path))
+    except FileNotFoundError:
+        return
+    
+    for entry in entries:
+        try:
+            if entry.is_file():
+                stats = entry.stat()
+                size_bytes = stats.st_size
+            elif include_dirs and entry.is_dir():
+                stats = entry.stat()
+                size_bytes = get_dir_size(entry.path)
+            else:
+                continue
+        except OSError as e:
+            logger.warning(f"Skipping backup {entry.path}: {str(e)}")
+            continue
+        
+        yield entry.name, entry.path, size_bytes, stats.st_ctime
+
+
+def _list_backup_files(backup_path):
+    """List file backups (database dumps, media archives)"""
+    return _scan_backup_dir(backup_path, include_dirs=False)
+
+
+def _list_backup_snapshots(backup_path):
+    """List snapshot backups, which may be files or directories"""
+    return _scan_backup_dir(backup_path, include_dirs=True)
+
+
+# How each backup type is laid out on disk
+BACKUP_LISTERS = {
+    'postgres': _list_backup_files,
+    'weaviate': _list_backup_snapshots,
+    'media': _list_backup_files,
+    'postgres_base': _list_backup_snapshots,
+}
+
+
+def build_backup_index():
+    """
+    Build the list of local backups by scanning the backup directories,
+    and store it under BACKUP_INDEX_CACHE_KEY without expiry.
+    
+    Returns:
+        list: Backup dicts, newest first
+    """
+    backups = []
+    
+    for backup_type, backup_path in BACKUP_PATHS.items():
+        for name, path, size_bytes, ctime in BACKUP_LISTERS[backup_type](backup_path):
+            backups.append({
+                'backup_id': name,
+                'backup_type': backup_type,
+                'created_at': datetime.fromtimestamp(ctime),
+                'path': path,
+                'size_bytes': size_bytes,
+                'size': format_size(size_bytes),
+                'status': 'completed'
+            })
+    
+    # Sort by creation time, newest first
+    backups.sort(key=lambda x: x['created_at'], reverse=True)
+    
+    cache.set(BACKUP_INDEX_CACHE_KEY, backups, timeout=None)
+    return backups
+
+
+def get_dir_size(path):
+    """
+    Get size of directory contents.
+    Uses os.scandir, whose entries carry their file type from the
+    directory listing, so each file costs a single stat call.
+    """
+    total_size = 0
+    pending = [path]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            total_size += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        # Entry removed while scanning
+                        continue
+        except OSError:
+            continue
+    return total_size
+
+
+def format_size(size_bytes):
+    """Format bytes as human-readable size."""
+    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
+        if size_bytes < 1024:
+            return f"{size_bytes:.2f} {unit}"
+        size_bytes /= 1024
+    return f"{size_bytes:.2f} PB"
+
+
+@shared_task
+def refresh_backup_index():
+    """
+    Rebuild the admin backup listing.
+    Runs on a schedule and after every completed backup, so the admin
+    page never scans the backup directories itself.
+    """
+    backups = build_backup_index()
+    return len(backups)
+
+
+@shared_task
+def remove_replaced_media_dir(path):
+    """
+    Delete a media directory set aside by restore_media_files.
+    Only MEDIA_ROOT.old.* siblings are accepted, so the task can't be used
+    to delete anything else.
+    """
+    media_dir = os.path.normpath(settings.MEDIA_ROOT)
+    if not os.path.normpath(path).startswith(f"{media_dir}.old."):
+        logger.error(f"Refusing to remove non-media directory: {path}")
+        return False
+    
+    shutil.rmtree(path, ignore_errors=True)
+    logger.info(f"Removed replaced media directory: {path}")
+    return True
 
 
 @shared_task
 def run_full_backup():
     """
     Run a full backup of all systems.
+    The three backups run in parallel as a chord; finalize_full_backup
+    records the combined outcome once they have all finished, and
+    full_backup_failed records it if any of them fails.
     """
     logger.info("Starting full system backup")
     
     # Run all backup tasks
-    postgres_result = backup_postgres_database.delay()
-    weaviate_result = backup_weaviate_database.delay()
-    media_result = backup_media_files.delay()
+    header = group(
+        backup_postgres_database.s(),
+        backup_weaviate_database.s(),
+        backup_media_files.s(),
+    )
+    # Freezing assigns the task ids up front so they can be reported
+    postgres_result, weaviate_result, media_result = header.freeze().results
+    callback = finalize_full_backup.s().on_error(full_backup_failed.s())
+    chord_result = chord(header)(callback)
     
     logger.info(f"Backup tasks initiated: postgres ({postgres_result.id}), weaviate ({weaviate_result.id}), media ({media_result.id})")
     
     return {
         'status': 'initiated',
+        'task_id': chord_result.id,
         'task_ids': {
             'postgres': postgres_result.id,
             'weaviate': weaviate_result.id,
             'media': media_result.id
         }
-    }
\ No newline at end of file
+    }
+
+
+@shared_task
+def finalize_full_backup(results):
+    """
+    Record a completed full backup.
+    
+    Args:
+        results (list): Results of the postgres, weaviate and media backup tasks
+    
+    Returns:
+        dict: Combined result
+    """
+    postgres, weaviate, media = results
+    summary = {
+        'status': 'success',
+        'postgres': postgres.get('backup_file'),
+        'weaviate': weaviate.get('path'),
+    }
+    
+    # Per-file S3 media backups have no archive; their manifest lists
+    # every uploaded object
+    if 'manifest_key' in media:
+        summary['media'] = media['manifest_key']
+        summary['media_file_count'] = media['file_count']
+    else:
+        summary['media'] = media.get('backup_file')
+    
+    AuditCollector.record_audit_event(
+        event_type="system_operation",
+        description="Full system backup completed",
+        severity="info",
+        details=summary
+    )
+    logger.info(f"Full system backup completed: {summary}")
+    return summary
+
+
+@shared_task
+def full_backup_failed(request, exc, traceback):
+    """
+    Record a full backup in which at least one backup task failed.
+    Called by Celery as the error callback of the full backup chord.
+    """
+    AuditCollector.record_audit_event(
+        event_type="system_operation",
+        description="Full system backup failed",
+        severity="error",
+        details={'task_id': request.id, 'error': str(exc)}
+    )
+    logger.error(f"Full system backup failed: {str(exc)}")
@@ -2,13 +2,19 @@
 Utility functions for automated evaluation of the RAG system.
 """
 
+import asyncio
+import hashlib
+import json
+import logging
+import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 from django.conf import settings
-from django.db import transaction
-from django.db.models import Avg, Count
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Avg, Count, F, OuterRef, Subquery
 from django.utils import timezone
-from openai import OpenAI
 
 from ..models import (
     EvaluationSet,
@@ -16,11 +22,60 @@ from ..models import (
     EvaluationRun,
     QuestionResult
 )
-from ..ingestion.embeddings_utils import search_weaviate
+from ..ingestion.embeddings_utils import SEARCH_BATCH_SIZE, get_embeddings_with_cache, search_weaviate_batch
+from .openai_parallel import ParallelRequestProcessor, count_tokens, create_async_openai_client, get_openai_client
 
 # Import moved inside functions to avoid circular import
 # from ..views import QueryView
 
+logger = logging.getLogger(__name__)
+
+# Batch relevance grading: answers graded per request, and the prompt
+# token budget for one batch (well inside gpt-3.5-turbo's context)
+RELEVANCE_BATCH_SIZE = 20
+RELEVANCE_BATCH_TOKEN_BUDGET = 12000
+
+# Score used when an answer couldn't be graded
+DEFAULT_RELEVANCE_SCORE = 0.5
+
+# Model that grades answer relevance
+RELEVANCE_MODEL = "gpt-3.5-turbo"  # Use smaller, cheaper model for evaluation
+
+# Bump when the grading prompts change, so cached grades are redone
+RELEVANCE_PROMPT_VERSION = 2
+
+# Relevance grades are a function of the two texts and the grading model,
+# so they are cached across runs
+RELEVANCE_CACHE_KEY = 'evalrel:{answer_hash}:{expected_hash}:{model}:{prompt_version}'
+RELEVANCE_CACHE_TIMEOUT = 30 * 86400  # 30 days
+
+# Cached rerank orders; valid as long as the retrieved texts and the
+# cross-encoder model are unchanged
+RERANK_CACHE_KEY = 'evalrerank:{digest}'
+RERANK_CACHE_TIMEOUT = 7 * 86400  # 7 days
+
+# Result fields set by reranking
+RERANK_SCORE_FIELDS = ('rerank_score', 'relevance_score')
+
+# With EVAL_FAST_GRADING, answers whose word-set Jaccard similarity to the
+# expected answer falls outside these bounds are graded 0.0 or 1.0
+# without an LLM call
+FAST_GRADING_MIN_SIMILARITY = 0.02
+FAST_GRADING_MAX_SIMILARITY = 0.95
+WORD_PATTERN = re.compile(r"\w+")
+
+# answer_relevance of batch mode results waiting on the grading batch
+UNGRADED = -1.0
+
+# EvaluationRun fields that run comparisons read
+COMPARISON_FIELDS = (
+    'id', 'run_date', 'average_score', 'average_retrieval_precision',
+    'average_answer_relevance', 'success_count', 'total_questions'
+)
+
+# Rows per INSERT/UPDATE when saving question results in bulk
+RESULT_WRITE_BATCH_SIZE = 500
+
 
 def calculate_source_overlap(sources, expected_sources):
     """
@@ -56,10 +111,134 @@ def calculate_source_overlap(sources, expected_sources):
     return f1
 
 
+def calculate_source_overlap_batch(sources_list, expected_list):
+    """
+    Vectorized calculate_source_overlap over many questions at once.
+    
+    Titles are lower-cased once and encoded as integer ids, each
+    (question, title) pair as one integer key, so the overlaps of every
+    question come from a single intersection.
+    
+    Args:
+        sources_list (list): Per question, the sources returned by the system
+        expected_list (list): Per question, its expected sources
+    
+    Returns:
+        list: F1 scores between 0-1, in question order
+    """
+    title_ids = {}
+    
+    def encode(source_groups):
+        # Unique (question index, title id) pairs
+        keys = set()
+        for index, sources in enumerate(source_groups):
+            for source in sources or ():
+                title_id = title_ids.setdefault(source.get('title', '').lower(), len(title_ids))
+                keys.add((index, title_id))
+        return keys
+    
+    source_keys = encode(sources_list)
+    expected_keys = encode(expected_list)
+    count = len(sources_list)
+    width = len(title_ids) or 1
+    
+    def to_array(keys):
+        return np.fromiter((index * width + title_id for index, title_id in keys), dtype=np.int64, count=len(keys))
+    
+    source_array = to_array(source_keys)
+    expected_array = to_array(expected_keys)
+    matches = np.bincount(
+        np.intersect1d(source_array, expected_array, assume_unique=True) // width, minlength=count
+    )
+    source_counts = np.bincount(source_array // width, minlength=count)
+    expected_counts = np.bincount(expected_array // width, minlength=count)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        precision = np.where(source_counts > 0, matches / source_counts, 0.0)
+        recall = np.where(expected_counts > 0, matches / expected_counts, 0.0)
+        f1 = np.where(precision + recall == 0, 0.0, 2 * precision * recall / (precision + recall))
+    
+    # No expected sources to match against counts as a full match
+    return np.where(expected_counts == 0, 1.0, f1).tolist()
+
+
+# Relevance grading prompts. The rubric is kept to its anchor points to
+# keep prompt tokens down; in full it reads:
+#   1.0  perfect match, covers all key points with accurate information
+#   0.8  very good, covers most key points, minor missing details
+#   0.6  good, covers core information but misses some important details
+#   0.4  partial, covers some information but misses major points
+#   0.2  poor, minimal overlap with the expected answer
+#   0.0  completely incorrect or unrelated to the expected answer
+RELEVANCE_RUBRIC = "1 = all key points, 0.6 = core points only, 0.2 = little overlap, 0 = wrong or unrelated"
+RELEVANCE_SYSTEM_PROMPT = (
+    f"Score how well the answer matches the reference from 0.0 to 1.0 ({RELEVANCE_RUBRIC}). "
+    "Reply with the number only."
+)
+RELEVANCE_PROMPT = "ANSWER:\n{answer}\n\nREFERENCE:\n{expected_answer}"
+
+
+def _relevance_request(answer, expected_answer):
+    """Chat completion arguments for scoring answer relevance"""
+    return {
+        "model": RELEVANCE_MODEL,
+        "messages": [
+            {"role": "system", "content": RELEVANCE_SYSTEM_PROMPT},
+            {"role": "user", "content": RELEVANCE_PROMPT.format(answer=answer, expected_answer=expected_answer)}
+        ],
+        "temperature": 0.0,
+        "max_tokens": 4,
+    }
+
+
+def _parse_relevance_score(response):
+    """Extract the score from a relevance completion, clamped to 0-1"""
+    score_text = response.choices[0].message.content.strip()
+    score = float(score_text)
+    
+    # Ensure score is within bounds
+    return max(0.0, min(1.0, score))
+
+
+def _relevance_cache_key(answer, expected_answer):
+    """Cache key for the grade of an answer against an expected answer"""
+    return RELEVANCE_CACHE_KEY.format(
+        answer_hash=hashlib.sha256(answer.encode()).hexdigest(),
+        expected_hash=hashlib.sha256(expected_answer.encode()).hexdigest(),
+        model=RELEVANCE_MODEL,
+        prompt_version=RELEVANCE_PROMPT_VERSION
+    )
+
+
+def _lexical_relevance_score(answer, expected_answer):
+    """
+    Grade an answer from its word overlap with the expected answer when
+    EVAL_FAST_GRADING is on and the overlap is decisive.
+    
+    Returns:
+        float: 0.0 or 1.0, or None when the answer needs an LLM grade
+    """
+    if not getattr(settings, 'EVAL_FAST_GRADING', False):
+        return None
+    
+    answer_words = set(WORD_PATTERN.findall(answer.lower()))
+    expected_words = set(WORD_PATTERN.findall(expected_answer.lower()))
+    if not answer_words and not expected_words:
+        return None
+    
+    similarity = len(answer_words & expected_words) / len(answer_words | expected_words)
+    if similarity < FAST_GRADING_MIN_SIMILARITY:
+        return 0.0
+    if similarity > FAST_GRADING_MAX_SIMILARITY:
+        return 1.0
+    return None
+
+
 def evaluate_answer_relevance(answer, expected_answer):
     """
     Use GPT to evaluate the relevance of the generated answer 
-    compared to the expected answer.
+    compared to the expected answer. Grades are cached, so repeated
+    pairs don't call the API again.
     
     Args:
         answer (str): Generated answer
@@ -68,65 +247,503 @@ def evaluate_answer_relevance(answer, expected_answer):
     Returns:
         float: Relevance score between 0-1
     """
-    client = OpenAI(api_key=settings.OPENAI_API_KEY)
+    score = _lexical_relevance_score(answer, expected_answer)
+    if score is not None:
+        return score
+    
+    cache_key = _relevance_cache_key(answer, expected_answer)
+    score = cache.get(cache_key)
+    if score is not None:
+        return score
+    
+    client = get_openai_client()
+    
+    try:
+        response = client.chat.completions.create(**_relevance_request(answer, expected_answer))
+        score = _parse_relevance_score(response)
+        cache.set(cache_key, score, RELEVANCE_CACHE_TIMEOUT)
+        return score
     
-    # Prompt for evaluating answer relevance
-    prompt = f"""
-You are an objective evaluator for question answering systems. 
-Compare the following generated answer against the expected reference answer.
-Rate the generated answer on a scale from 0.0 to 1.0, where:
-- 1.0: Perfect match, covers all key points with accurate information
-- 0.8: Very good, covers most key points, minor missing details
-- 0.6: Good, covers core information but missing some important details
-- 0.4: Partial, covers some information but missing major points
-- 0.2: Poor, minimal overlap with expected answer
-- 0.0: Completely incorrect or unrelated to expected answer
+    except Exception as e:
+        logger.warning(f"Error evaluating answer relevance: {e}")
+        # Default to middle score in case of error
+        return DEFAULT_RELEVANCE_SCORE
+
 
-Return ONLY the numeric score, nothing else.
+# Prompt for grading several answers in one request
+RELEVANCE_BATCH_SYSTEM_PROMPT = (
+    f"Score how well each numbered answer matches its reference from 0.0 to 1.0 ({RELEVANCE_RUBRIC}). "
+    'Reply with JSON {"scores": [...]}, one number per pair, in order.'
+)
+RELEVANCE_BATCH_PROMPT = "{count} pairs:\n\n{pairs}"
 
-Generated Answer:
-{answer}
 
-Expected Reference Answer:
-{expected_answer}
-"""
-    
+def _relevance_batch_request(pairs):
+    """Chat completion arguments for grading (answer, expected_answer) pairs in one request"""
+    listing = "\n\n".join(
+        f"[{number}] ANSWER: {answer}\nREFERENCE: {expected_answer}"
+        for number, (answer, expected_answer) in enumerate(pairs, start=1)
+    )
+    return {
+        "model": RELEVANCE_MODEL,
+        "messages": [
+            {"role": "system", "content": RELEVANCE_BATCH_SYSTEM_PROMPT},
+            {"role": "user", "content": RELEVANCE_BATCH_PROMPT.format(count=len(pairs), pairs=listing)}
+        ],
+        "response_format": {"type": "json_object"},
+        "temperature": 0.0,
+        "max_tokens": 8 * len(pairs) + 20,
+    }
+
+
+def _parse_relevance_batch_scores(content, count):
+    """
+    Extract `count` scores from the text of a batch grading completion,
+    clamped to 0-1. Missing or malformed scores are None.
+    """
     try:
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",  # Use smaller, cheaper model for evaluation
-            messages=[
-                {"role": "system", "content": "You are an objective evaluator that returns only a numeric score."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.0,
-            max_tokens=5,
-        )
+        scores = json.loads(content).get("scores")
+    except (ValueError, AttributeError) as e:
+        logger.warning(f"Error parsing batch relevance scores: {e}")
+        scores = None
+    if not isinstance(scores, list):
+        scores = []
+    
+    parsed = []
+    for index in range(count):
+        try:
+            parsed.append(max(0.0, min(1.0, float(scores[index]))))
+        except (IndexError, TypeError, ValueError):
+            parsed.append(None)
+    return parsed
+
+
+def _relevance_batches(pairs):
+    """
+    Split pairs into batches of at most RELEVANCE_BATCH_SIZE whose text
+    fits RELEVANCE_BATCH_TOKEN_BUDGET (a single oversized pair still
+    gets a batch of its own).
+    
+    Returns:
+        list: Lists of pairs
+    """
+    batches, batch, batch_tokens = [], [], 0
+    for pair in pairs:
+        pair_tokens = count_tokens(pair[0]) + count_tokens(pair[1]) + 10
+        if batch and (len(batch) == RELEVANCE_BATCH_SIZE or batch_tokens + pair_tokens > RELEVANCE_BATCH_TOKEN_BUDGET):
+            batches.append(batch)
+            batch, batch_tokens = [], 0
+        batch.append(pair)
+        batch_tokens += pair_tokens
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def _cached_relevance_scores(pairs):
+    """
+    Grade (answer, expected_answer) pairs that need no LLM call: those
+    decided lexically and those graded before.
+    
+    Returns:
+        tuple: (scores with None for the rest, indices of the rest)
+    """
+    scores = [_lexical_relevance_score(answer, expected_answer) for answer, expected_answer in pairs]
+    keys = {
+        index: _relevance_cache_key(*pairs[index])
+        for index, score in enumerate(scores) if score is None
+    }
+    found = cache.get_many(keys.values())
+    for index, key in keys.items():
+        scores[index] = found.get(key)
+    return scores, [index for index, score in enumerate(scores) if score is None]
+
+
+def _store_relevance_scores(pairs, scores):
+    """Cache new grades for pairs; None (ungraded) entries are skipped"""
+    cache.set_many(
+        {
+            _relevance_cache_key(answer, expected_answer): score
+            for (answer, expected_answer), score in zip(pairs, scores)
+            if score is not None
+        },
+        RELEVANCE_CACHE_TIMEOUT
+    )
+
+
+def _merge_relevance_scores(pairs, scores, missing, graded):
+    """
+    Fill the grades of the cache misses into scores, cache them, and
+    substitute DEFAULT_RELEVANCE_SCORE for anything left ungraded.
+    """
+    _store_relevance_scores([pairs[index] for index in missing], graded)
+    for index, score in zip(missing, graded):
+        scores[index] = score
+    return [DEFAULT_RELEVANCE_SCORE if score is None else score for score in scores]
+
+
+def evaluate_answer_relevance_batch(pairs):
+    """
+    Grade several answers against their expected answers, packing up to
+    RELEVANCE_BATCH_SIZE pairs into each request instead of one request
+    per pair. Cached grades are reused; only the rest are sent.
+    
+    Args:
+        pairs (list): (answer, expected_answer) tuples
         
-        # Extract and convert score
-        score_text = response.choices[0].message.content.strip()
-        score = float(score_text)
+    Returns:
+        list: Relevance scores between 0-1, in the order of pairs
+    """
+    scores, missing = _cached_relevance_scores(pairs)
+    client = get_openai_client()
+    
+    graded = []
+    for batch in _relevance_batches([pairs[index] for index in missing]):
+        try:
+            response = client.chat.completions.create(**_relevance_batch_request(batch))
+            graded.extend(_parse_relevance_batch_scores(response.choices[0].message.content, len(batch)))
+        except Exception as e:
+            logger.warning(f"Error evaluating answer relevance batch: {e}", extra={"batch_size": len(batch)})
+            graded.extend([None] * len(batch))
+    return _merge_relevance_scores(pairs, scores, missing, graded)
+
+
+async def aevaluate_answer_relevance_batch(pairs, processor):
+    """
+    Async version of evaluate_answer_relevance_batch; batches are sent
+    concurrently through a shared rate-limited request processor.
+    
+    Args:
+        pairs (list): (answer, expected_answer) tuples
+        processor (ParallelRequestProcessor): Processor to send the requests with
         
-        # Ensure score is within bounds
-        score = max(0.0, min(1.0, score))
-        return score
+    Returns:
+        list: Relevance scores between 0-1, in the order of pairs
+    """
+    scores, missing = _cached_relevance_scores(pairs)
     
-    except Exception as e:
-        print(f"Error evaluating answer relevance: {e}")
-        # Default to middle score in case of error
-        return 0.5
+    async def grade(batch):
+        try:
+            response = await processor.create(**_relevance_batch_request(batch))
+            return _parse_relevance_batch_scores(response.choices[0].message.content, len(batch))
+        except Exception as e:
+            logger.warning(f"Error evaluating answer relevance batch: {e}", extra={"batch_size": len(batch)})
+            return [None] * len(batch)
+    
+    batch_scores = await asyncio.gather(
+        *(grade(batch) for batch in _relevance_batches([pairs[index] for index in missing]))
+    )
+    graded = [score for batch in batch_scores for score in batch]
+    return _merge_relevance_scores(pairs, scores, missing, graded)
+
+
+def _answer_request(model, prompt):
+    """Chat completion arguments for answering a reference question"""
+    return {
+        "model": model,
+        "messages": [
+            {"role": "system", "content": "You are a helpful assistant for RNA biology lab. Provide accurate, cited answers based only on the provided sources."},
+            {"role": "user", "content": prompt}
+        ],
+        "temperature": 0.2,
+        "max_tokens": 1000,
+        "top_p": 1.0,
+    }
+
+
+def _is_success(confidence_score, answer_relevance):
+    """Whether a question result counts as a success"""
+    return confidence_score >= 0.45 and answer_relevance >= 0.6
 
 
-def run_evaluation(evaluation_set_id, use_hybrid=True, use_cache=False):
+def _count_successes(evaluation_run):
+    """Count a run's saved question results that _is_success would accept"""
+    return QuestionResult.objects.filter(
+        evaluation_run=evaluation_run, confidence_score__gte=0.45, answer_relevance__gte=0.6
+    ).count()
+
+
+def _retrieve_questions(questions, query_vectors, use_hybrid, use_cache=False):
     """
-    Run an evaluation against a set of reference questions.
+    Search for several reference questions' context, batching the
+    searches into as few Weaviate requests as possible. Blocking.
+    
+    Returns:
+        list: Per question, its search results
+    """
+    # Cached retrievals stay valid until the corpus changes
+    return search_weaviate_batch(
+        [question.question_text for question in questions],
+        doc_types=[question.doc_type for question in questions],
+        limit=10,
+        use_hybrid=use_hybrid,
+        query_vectors=query_vectors,
+        use_cache=use_cache
+    )
+
+
+def cached_rerank(query_view, question_text, results):
+    """
+    query_view.rerank_results, reusing the order and scores from an
+    earlier rerank of the same question over the same retrieved texts.
     
     Args:
-        evaluation_set_id (int): ID of the evaluation set to run
-        use_hybrid (bool): Whether to use hybrid search
-        use_cache (bool): Whether to use response caching
+        query_view (QueryView): View providing the reranker
+        question_text (str): The question
+        results (list): Search results to rerank
         
     Returns:
-        EvaluationRun: The completed evaluation run
+        list: Reranked results with scores
+    """
+    if not results:
+        return results
+    
+    texts = [result.get("content") or result.get("caption") or "" for result in results]
+    model = getattr(settings, 'CROSS_ENCODER_MODEL', None) or 'default'
+    digest = hashlib.sha1(
+        "|".join([question_text, *(hashlib.sha1(text.encode()).hexdigest() for text in texts), model]).encode()
+    ).hexdigest()
+    cache_key = RERANK_CACHE_KEY.format(digest=digest)
+    
+    # Cached as (position in results, score fields) in reranked order
+    cached = cache.get(cache_key)
+    if cached is not None:
+        reranked_results = []
+        for index, scores in cached:
+            results[index].update(scores)
+            reranked_results.append(results[index])
+        return reranked_results
+    
+    positions = {id(result): index for index, result in enumerate(results)}
+    reranked_results = query_view.rerank_results(question_text, results)
+    
+    # A rerank that fell back to the unscored search order isn't cached
+    if all("relevance_score" in result for result in reranked_results):
+        cache.set(cache_key, [
+            (positions[id(result)], {field: result[field] for field in RERANK_SCORE_FIELDS if field in result})
+            for result in reranked_results
+        ], RERANK_CACHE_TIMEOUT)
+    return reranked_results
+
+
+def _build_answer_input(question, query_view, results):
+    """
+    Rerank a reference question's search results and build the answer
+    prompt. Blocking, and CPU-bound when reranking with a local model.
+    
+    Returns:
+        dict: reranked_results, prompt, sources and selected_model
+    """
+    # Rerank results; cached across runs
+    reranked_results = cached_rerank(query_view, question.question_text, results)
+    
+    return {
+        'reranked_results': reranked_results,
+        # Build prompt
+        'prompt': query_view.build_prompt(question.question_text, reranked_results),
+        # Extract sources
+        'sources': query_view.extract_sources(reranked_results),
+        # Select model based on question complexity and type
+        'selected_model': query_view.select_model(question.question_text, reranked_results),
+    }
+
+
+async def _evaluate_one_async(question, results, question_start_time, stage_limits, processor, query_view):
+    """
+    Answer one retrieved reference question and compute its retrieval
+    metrics. Reranking runs in a worker thread; the LLM call is awaited
+    on the event loop. Nothing here writes to the database.
+    
+    Args:
+        question (ReferenceQuestion): Question to evaluate
+        results (list): The question's search results
+        question_start_time (float): When the question's retrieval started
+        stage_limits (dict): asyncio.Semaphore bounding each pipeline stage
+        processor (ParallelRequestProcessor): Shared rate-limited OpenAI requester
+        query_view (QueryView): View providing the RAG pipeline steps
+        
+    Returns:
+        dict: QuestionResult field values, except retrieval_precision
+            and answer_relevance
+    """
+    async with stage_limits['rerank']:
+        prepared = await asyncio.to_thread(_build_answer_input, question, query_view, results)
+    reranked_results = prepared['reranked_results']
+    
+    async with stage_limits['generation']:
+        # Get answer from OpenAI
+        response = await processor.create(**_answer_request(prepared['selected_model'], prepared['prompt']))
+    
+    answer = response.choices[0].message.content
+    
+    # Calculate confidence score
+    confidence_score = query_view.calculate_confidence_score(answer, reranked_results)
+    
+    # Retrieval precision and answer relevance are computed for all
+    # questions together afterwards
+    return {
+        'answer': answer,
+        'sources': prepared['sources'],
+        'confidence_score': confidence_score,
+        'execution_time': time.time() - question_start_time,
+        'model_used': prepared['selected_model'],
+    }
+
+
+def _save_chunk(evaluation_run, questions, outcomes):
+    """
+    Save a chunk's question results and add them to the run's counters
+    with an atomic UPDATE, so progress is visible, and survives a crash,
+    while the run is still going. Questions that raised are counted as
+    failures but not saved, so a resumed run retries them.
+    
+    Args:
+        evaluation_run (EvaluationRun): Run the results belong to
+        questions (list): The chunk's ReferenceQuestions
+        outcomes (list): Per question, its field values or the exception it raised
+    """
+    question_results = []
+    success_count = 0
+    failure_count = 0
+    
+    for question, outcome in zip(questions, outcomes):
+        if isinstance(outcome, Exception):
+            logger.warning(
+                f"Error processing question '{question.question_text[:50]}...': {outcome}",
+                extra={"question_id": question.id}
+            )
+            failure_count += 1
+            continue
+        
+        question_results.append(QuestionResult(
+            evaluation_run=evaluation_run,
+            reference_question=question,
+            **outcome
+        ))
+        
+        # Update counters
+        if _is_success(outcome['confidence_score'], outcome['answer_relevance']):
+            success_count += 1
+        else:
+            failure_count += 1
+    
+    _set_retrieval_precisions(question_results)
+    
+    with transaction.atomic():
+        QuestionResult.objects.bulk_create(question_results, batch_size=RESULT_WRITE_BATCH_SIZE)
+        EvaluationRun.objects.filter(id=evaluation_run.id).update(
+            success_count=F('success_count') + success_count,
+            failure_count=F('failure_count') + failure_count
+        )
+
+
+async def _evaluate_chunk(evaluation_run, questions, query_vectors, stage_limits, processor, writer, query_view, use_hybrid, use_cache):
+    """
+    Retrieve context for a chunk of questions in one batched search, pass
+    each question on to reranking and generation, then grade the chunk's
+    answers and save its results. Each stage holds only its own slot, so
+    while one chunk is being answered the next is being retrieved and
+    reranked.
+    """
+    async with stage_limits['retrieval']:
+        # Time the execution of these questions
+        question_start_time = time.time()
+        
+        try:
+            results_list = await asyncio.to_thread(
+                _retrieve_questions, questions, query_vectors, use_hybrid, use_cache
+            )
+        except Exception as e:
+            results_list = None
+            outcomes = [e] * len(questions)
+    
+    if results_list is not None:
+        outcomes = await asyncio.gather(
+            *(
+                _evaluate_one_async(question, results, question_start_time, stage_limits, processor, query_view)
+                for question, results in zip(questions, results_list)
+            ),
+            return_exceptions=True
+        )
+        
+        answered = [
+            (question, outcome) for question, outcome in zip(questions, outcomes)
+            if not isinstance(outcome, Exception)
+        ]
+        scores = await aevaluate_answer_relevance_batch(
+            [(outcome['answer'], question.expected_answer) for question, outcome in answered],
+            processor
+        )
+        for (question, outcome), score in zip(answered, scores):
+            outcome['answer_relevance'] = score
+    
+    # The ORM is synchronous, so results are written from the writer thread
+    await asyncio.get_running_loop().run_in_executor(writer, _save_chunk, evaluation_run, questions, outcomes)
+
+
+async def _evaluate_all(evaluation_run, questions, query_vectors, query_view, use_hybrid, use_cache, concurrency):
+    """
+    Evaluate all questions as a pipeline, with at most `concurrency`
+    answers being generated at a time while the next chunks of questions
+    are retrieved and reranked. Each chunk's results are saved as soon as
+    its answers are graded.
+    """
+    # Weaviate, the reranker and OpenAI are each limited separately
+    stage_limits = {
+        'retrieval': asyncio.Semaphore(getattr(settings, 'EVAL_RETRIEVAL_CONCURRENCY', 8)),
+        'rerank': asyncio.Semaphore(getattr(settings, 'EVAL_RERANK_CONCURRENCY', 4)),
+        'generation': asyncio.Semaphore(concurrency),
+    }
+    
+    # One client, and so one connection pool, for every request; the
+    # processor keeps them within the account's rate limits and does the
+    # retrying, so the client's own retries are off
+    async_client = create_async_openai_client(max_retries=0)
+    processor = ParallelRequestProcessor(async_client)
+    
+    # A single writer thread saves the chunks one at a time, over one
+    # database connection
+    writer = ThreadPoolExecutor(max_workers=1)
+    try:
+        # Questions are retrieved in chunks that each fit one batched search
+        await asyncio.gather(*(
+            _evaluate_chunk(
+                evaluation_run,
+                questions[offset:offset + SEARCH_BATCH_SIZE], query_vectors[offset:offset + SEARCH_BATCH_SIZE],
+                stage_limits, processor, writer, query_view, use_hybrid, use_cache
+            )
+            for offset in range(0, len(questions), SEARCH_BATCH_SIZE)
+        ))
+    finally:
+        # Close the writer thread's own connection; looking it up here
+        # would get the event loop thread's
+        writer.submit(lambda: connection.close()).result()
+        writer.shutdown()
+        await async_client.close()
+
+
+def _question_vectors(questions):
+    """
+    Embeddings of the questions' texts, in one request for any not
+    cached from earlier runs. Questions without one (None) are embedded
+    by Weaviate at search time.
+    """
+    return get_embeddings_with_cache([question.question_text for question in questions])
+
+
+def _question_queryset(evaluation_set):
+    """An evaluation set's questions, with just the fields evaluation reads"""
+    return ReferenceQuestion.objects.filter(evaluation_set=evaluation_set).only(
+        'id', 'question_text', 'doc_type', 'expected_sources', 'expected_answer'
+    )
+
+
+def _start_run(evaluation_set_id, mode):
+    """
+    Load an evaluation set's questions and create a running EvaluationRun.
+    
+    Returns:
+        tuple: (EvaluationRun, list of ReferenceQuestion)
     """
     # Get the evaluation set
     try:
@@ -135,9 +752,9 @@ def run_evaluation(evaluation_set_id, use_hybrid=True, use_cache=False):
         raise ValueError(f"Evaluation set with ID {evaluation_set_id} not found")
     
     # Get all questions in the set
-    questions = ReferenceQuestion.objects.filter(evaluation_set=evaluation_set)
+    questions = list(_question_queryset(evaluation_set))
     
-    if not questions.exists():
+    if not questions:
         raise ValueError(f"No questions found in evaluation set {evaluation_set.name}")
     
     # Create a new evaluation run
@@ -145,175 +762,431 @@ def run_evaluation(evaluation_set_id, use_hybrid=True, use_cache=False):
         evaluation_run = EvaluationRun.objects.create(
             evaluation_set=evaluation_set,
             status='running',
-            total_questions=questions.count()
+            mode=mode,
+            total_questions=len(questions)
         )
     
-    # Import QueryView here to avoid circular import
-    from ..views import QueryView
-    
-    # Create query view instance for processing
-    query_view = QueryView()
-    
-    # Initialize metrics
-    start_time = time.time()
-    success_count = 0
-    failure_count = 0
-    
-    # Process each question
-    for question in questions:
-        try:
-            # Time the execution of this question
-            question_start_time = time.time()
-            
-            # Search for relevant documents
-            results = search_weaviate(
-                question.question_text,
-                doc_type=question.doc_type,
-                limit=10,
-                use_hybrid=use_hybrid
-            )
-            
-            # Rerank results
-            reranked_results = query_view.rerank_results(question.question_text, results)
-            
-            # Build prompt
-            prompt = query_view.build_prompt(question.question_text, reranked_results)
-            
-            # Extract sources
-            sources = query_view.extract_sources(reranked_results)
-            
-            # Select model based on question complexity and type
-            selected_model = query_view.select_model(question.question_text, reranked_results)
-            
-            # Get answer from OpenAI
-            client = OpenAI(api_key=settings.OPENAI_API_KEY)
-            response = client.chat.completions.create(
-                model=selected_model,
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant for RNA biology lab. Provide accurate, cited answers based only on the provided sources."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.2,
-                max_tokens=1000,
-                top_p=1.0
-            )
-            
-            answer = response.choices[0].message.content
-            
-            # Calculate confidence score
-            confidence_score = query_view.calculate_confidence_score(answer, reranked_results)
-            
-            # Calculate metrics
-            retrieval_precision = calculate_source_overlap(sources, question.expected_sources)
-            answer_relevance = evaluate_answer_relevance(answer, question.expected_answer)
-            
-            # Record execution time
-            question_exec_time = time.time() - question_start_time
-            
-            # Create result
-            QuestionResult.objects.create(
-                evaluation_run=evaluation_run,
-                reference_question=question,
-                answer=answer,
-                sources=sources,
-                confidence_score=confidence_score,
-                retrieval_precision=retrieval_precision,
-                answer_relevance=answer_relevance,
-                execution_time=question_exec_time,
-                model_used=selected_model
-            )
-            
-            # Update counters
-            if confidence_score >= 0.45 and answer_relevance >= 0.6:
-                success_count += 1
-            else:
-                failure_count += 1
-            
-        except Exception as e:
-            print(f"Error processing question '{question.question_text[:50]}...': {e}")
-            failure_count += 1
-    
-    # Calculate total execution time
-    total_time = time.time() - start_time
-    
-    # Update evaluation run with results
+    return evaluation_run, questions
+
+
+def _complete_run(evaluation_run, success_count, failure_count, total_time, question_results=()):
+    """
+    Store the run's averages and counters and mark it completed.
+    Any unsaved question_results are inserted first, in the same
+    transaction, so the averages include them.
+    """
     with transaction.atomic():
-        # Calculate averages
+        if question_results:
+            QuestionResult.objects.bulk_create(question_results, batch_size=RESULT_WRITE_BATCH_SIZE)
+        
+        # Calculate averages in a single query
         results = QuestionResult.objects.filter(evaluation_run=evaluation_run)
-        avg_confidence = results.aggregate(Avg('confidence_score'))
-        avg_precision = results.aggregate(Avg('retrieval_precision'))
-        avg_relevance = results.aggregate(Avg('answer_relevance'))
+        averages = results.aggregate(
+            Avg('confidence_score'), Avg('retrieval_precision'), Avg('answer_relevance')
+        )
         
         # Update run status
         evaluation_run.status = 'completed'
-        evaluation_run.average_score = avg_confidence.get('confidence_score__avg', 0)
-        evaluation_run.average_retrieval_precision = avg_precision.get('retrieval_precision__avg', 0)
-        evaluation_run.average_answer_relevance = avg_relevance.get('answer_relevance__avg', 0)
+        evaluation_run.average_score = averages.get('confidence_score__avg', 0)
+        evaluation_run.average_retrieval_precision = averages.get('retrieval_precision__avg', 0)
+        evaluation_run.average_answer_relevance = averages.get('answer_relevance__avg', 0)
         evaluation_run.success_count = success_count
         evaluation_run.failure_count = failure_count
         evaluation_run.execution_time = total_time
+        evaluation_run.batch_id = ''
+        evaluation_run.batch_stage = ''
         evaluation_run.save()
+
+
+def _evaluate_run(evaluation_run, questions, use_hybrid, use_cache, concurrency):
+    """
+    Evaluate questions into a running sync mode run, then complete it
+    with counters recounted from all of the run's saved results.
+    """
+    # Import QueryView here to avoid circular import
+    from ..views import QueryView
+    
+    # Create query view instance for processing
+    query_view = QueryView()
+    
+    # Process questions concurrently
+    concurrency = concurrency or getattr(settings, 'EVAL_CONCURRENCY', 10)
+    if questions:
+        asyncio.run(_evaluate_all(
+            evaluation_run, questions, _question_vectors(questions), query_view, use_hybrid, use_cache, concurrency
+        ))
+    
+    # Questions that failed with an error have no result, so they count
+    # as failures here too
+    success_count = _count_successes(evaluation_run)
+    _complete_run(
+        evaluation_run, success_count, evaluation_run.total_questions - success_count,
+        (timezone.now() - evaluation_run.run_date).total_seconds()
+    )
     
     return evaluation_run
 
 
-def compare_runs(current_run_id, previous_run_id=None):
+def run_evaluation(evaluation_set_id, use_hybrid=True, use_cache=False, concurrency=None):
     """
-    Compare the current evaluation run with a previous run to detect regressions.
+    Run an evaluation against a set of reference questions.
+    
+    Questions flow through retrieval, reranking and answer generation as
+    a pipeline on an asyncio event loop, each stage with its own
+    concurrency limit, so no stage sits idle waiting on the others.
+    Results are saved, and the run's success and failure counters
+    advanced, as each chunk of questions finishes, so a run that stops
+    part way can be picked up with resume_evaluation. For large or
+    cost-sensitive runs, see run_evaluation_batch.
     
     Args:
-        current_run_id (int): ID of the current evaluation run
-        previous_run_id (int): ID of a previous run to compare against
-            If None, automatically finds the most recent completed run.
+        evaluation_set_id (int): ID of the evaluation set to run
+        use_hybrid (bool): Whether to use hybrid search
+        use_cache (bool): Whether to reuse cached retrieval results
+        concurrency (int): Answers generated at once, defaults to settings.EVAL_CONCURRENCY
         
     Returns:
-        dict: Comparison results with metrics and change percentages
+        EvaluationRun: The completed evaluation run
+    """
+    evaluation_run, questions = _start_run(evaluation_set_id, 'sync')
+    return _evaluate_run(evaluation_run, questions, use_hybrid, use_cache, concurrency)
+
+
+def resume_evaluation(run_id, use_hybrid=True, use_cache=False, concurrency=None):
+    """
+    Finish a sync mode evaluation run that stopped before completing,
+    evaluating only the questions that don't have a saved result yet.
+    
+    Args:
+        run_id (int): ID of the running evaluation run
+        use_hybrid (bool): Whether to use hybrid search
+        use_cache (bool): Whether to reuse cached retrieval results
+        concurrency (int): Answers generated at once, defaults to settings.EVAL_CONCURRENCY
+        
+    Returns:
+        EvaluationRun: The completed evaluation run
     """
     try:
-        current_run = EvaluationRun.objects.get(id=current_run_id)
+        evaluation_run = EvaluationRun.objects.get(id=run_id, mode='sync', status='running')
     except EvaluationRun.DoesNotExist:
-        raise ValueError(f"Evaluation run with ID {current_run_id} not found")
+        raise ValueError(f"No running sync evaluation run with ID {run_id}")
     
-    # Find a previous run if not specified
-    if previous_run_id is None:
-        previous_runs = EvaluationRun.objects.filter(
-            evaluation_set=current_run.evaluation_set,
-            status='completed',
-            run_date__lt=current_run.run_date
-        ).order_by('-run_date')
+    questions = list(
+        _question_queryset(evaluation_run.evaluation_set_id).exclude(
+            id__in=evaluation_run.results.values_list('reference_question_id', flat=True)
+        )
+    )
+    
+    # Counters restart from the saved results; questions that errored
+    # before are evaluated again
+    success_count = _count_successes(evaluation_run)
+    EvaluationRun.objects.filter(id=evaluation_run.id).update(
+        success_count=success_count,
+        failure_count=evaluation_run.results.count() - success_count
+    )
+    
+    return _evaluate_run(evaluation_run, questions, use_hybrid, use_cache, concurrency)
+
+
+def _set_retrieval_precisions(question_results):
+    """Set retrieval_precision on unsaved question results in one vectorized pass"""
+    precisions = calculate_source_overlap_batch(
+        [result.sources for result in question_results],
+        [result.reference_question.expected_sources for result in question_results]
+    )
+    for result, precision in zip(question_results, precisions):
+        result.retrieval_precision = precision
+
+
+def _batch_line(custom_id, request):
+    """One JSONL line of an OpenAI Batch API input file"""
+    return json.dumps({
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": "/v1/chat/completions",
+        "body": request,
+    })
+
+
+def _submit_batch(client, evaluation_run, stage, lines):
+    """
+    Upload request lines and start an OpenAI batch for them, recording
+    its ID and stage on the run so polling can resume from there.
+    """
+    input_file = client.files.create(
+        file=(f"evaluation_run_{evaluation_run.id}_{stage}.jsonl", "\n".join(lines).encode('utf-8')),
+        purpose="batch"
+    )
+    batch = client.batches.create(
+        input_file_id=input_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+        metadata={"evaluation_run": str(evaluation_run.id), "stage": stage}
+    )
+    
+    evaluation_run.batch_id = batch.id
+    evaluation_run.batch_stage = stage
+    evaluation_run.save(update_fields=['batch_id', 'batch_stage'])
+
+
+def _read_batch_output(client, batch):
+    """
+    Download a completed batch's output.
+    
+    Returns:
+        dict: custom_id -> completion text, for the requests that succeeded
+    """
+    contents = {}
+    if not batch.output_file_id:
+        return contents
+    
+    for line in client.files.content(batch.output_file_id).text.splitlines():
+        if not line.strip():
+            continue
+        item = json.loads(line)
+        response = item.get("response") or {}
+        if item.get("error") or response.get("status_code") != 200:
+            logger.warning(
+                f"Batch request {item.get('custom_id')} failed: {item.get('error') or response.get('body')}",
+                extra={"custom_id": item.get('custom_id')}
+            )
+            continue
+        contents[item["custom_id"]] = response["body"]["choices"][0]["message"]["content"]
+    return contents
+
+
+def run_evaluation_batch(evaluation_set_id, use_hybrid=True, use_cache=False, concurrency=None):
+    """
+    Start an evaluation that generates and grades answers through the
+    OpenAI Batch API, at half the cost and outside the regular rate
+    limits, with results arriving within 24 hours.
+    
+    Retrieval runs now and its results are saved; the answer requests
+    are submitted as a batch. Call advance_evaluation_batch periodically
+    (the poll_evaluation_batch task does) to carry the run through
+    grading to completion.
+    
+    Args:
+        evaluation_set_id (int): ID of the evaluation set to run
+        use_hybrid (bool): Whether to use hybrid search
+        use_cache (bool): Whether to reuse cached retrieval results
+        concurrency (int): Questions reranked at once, defaults to settings.EVAL_CONCURRENCY
         
-        if previous_runs.exists():
-            previous_run = previous_runs.first()
-        else:
-            # No previous run found
-            return {
-                "current_run": {
-                    "id": current_run.id,
-                    "date": current_run.run_date,
-                    "avg_score": current_run.average_score,
-                    "avg_precision": current_run.average_retrieval_precision,
-                    "avg_relevance": current_run.average_answer_relevance,
-                    "success_rate": current_run.success_count / current_run.total_questions if current_run.total_questions > 0 else 0
-                },
-                "previous_run": None,
-                "changes": None,
-                "regression_detected": False
-            }
-    else:
+    Returns:
+        EvaluationRun: The run, waiting on its answer batch
+    """
+    evaluation_run, questions = _start_run(evaluation_set_id, 'batch')
+    
+    # Import QueryView here to avoid circular import
+    from ..views import QueryView
+    
+    query_view = QueryView()
+    concurrency = concurrency or getattr(settings, 'EVAL_CONCURRENCY', 10)
+    
+    # Searches go to Weaviate in batches
+    try:
+        results_list = _retrieve_questions(questions, _question_vectors(questions), use_hybrid, use_cache)
+    except Exception as e:
+        logger.warning(f"Error retrieving context for evaluation questions: {e}")
+        results_list = [None] * len(questions)
+    
+    def prepare(question, results):
+        if results is None:
+            return None
         try:
-            previous_run = EvaluationRun.objects.get(id=previous_run_id)
-        except EvaluationRun.DoesNotExist:
-            raise ValueError(f"Previous evaluation run with ID {previous_run_id} not found")
+            return _build_answer_input(question, query_view, results)
+        except Exception as e:
+            logger.warning(
+                f"Error processing question '{question.question_text[:50]}...': {e}",
+                extra={"question_id": question.id}
+            )
+            return None
+    
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        prepared_questions = list(executor.map(prepare, questions, results_list))
+    
+    # Save what retrieval produced; answers and scores are filled in as
+    # the batches complete. Questions that failed retrieval get no result.
+    question_results = []
+    lines = []
+    for question, prepared in zip(questions, prepared_questions):
+        if prepared is None:
+            continue
+        question_results.append(QuestionResult(
+            evaluation_run=evaluation_run,
+            reference_question=question,
+            answer='',
+            sources=prepared['sources'],
+            confidence_score=0.0,
+            answer_relevance=0.0,
+            model_used=prepared['selected_model'],
+            retrieval_scores=[
+                result.get("relevance_score", 0.5) for result in prepared['reranked_results'][:3]
+            ],
+        ))
+        lines.append(_batch_line(
+            f"ans-{question.id}", _answer_request(prepared['selected_model'], prepared['prompt'])
+        ))
+    _set_retrieval_precisions(question_results)
+    QuestionResult.objects.bulk_create(question_results, batch_size=RESULT_WRITE_BATCH_SIZE)
+    
+    if not lines:
+        _complete_run(evaluation_run, 0, len(questions), (timezone.now() - evaluation_run.run_date).total_seconds())
+        return evaluation_run
     
-    # Calculate metrics
-    current_success_rate = current_run.success_count / current_run.total_questions if current_run.total_questions > 0 else 0
-    previous_success_rate = previous_run.success_count / previous_run.total_questions if previous_run.total_questions > 0 else 0
+    client = get_openai_client()
+    _submit_batch(client, evaluation_run, 'answers', lines)
+    return evaluation_run
+
+
+def advance_evaluation_batch(evaluation_run):
+    """
+    Check a batch mode run's current OpenAI batch and, once it is done,
+    move the run on: answers go to a grading batch, and grades complete
+    the run. Safe to call repeatedly; a run whose process died can be
+    resumed from its stored batch_id.
+    
+    Args:
+        evaluation_run (EvaluationRun): A batch mode run
+        
+    Returns:
+        bool: True once the run is completed or failed, False while it
+            is still waiting on a batch
+    """
+    if evaluation_run.status != 'running' or not evaluation_run.batch_id:
+        return True
+    
+    client = get_openai_client()
+    batch = client.batches.retrieve(evaluation_run.batch_id)
+    
+    if batch.status in ('failed', 'expired', 'cancelled'):
+        evaluation_run.status = 'failed'
+        evaluation_run.notes = f"{evaluation_run.notes}\nOpenAI batch {batch.id} {batch.status}".strip()
+        evaluation_run.save(update_fields=['status', 'notes'])
+        return True
+    if batch.status != 'completed':
+        return False
+    
+    contents = _read_batch_output(client, batch)
+    results = list(
+        QuestionResult.objects.filter(evaluation_run=evaluation_run)
+        .select_related('reference_question')
+        .order_by('pk')
+    )
+    
+    if evaluation_run.batch_stage == 'answers':
+        # Import QueryView here to avoid circular import
+        from ..views import QueryView
+        
+        query_view = QueryView()
+        answered, unanswered = [], []
+        for result in results:
+            answer = contents.get(f"ans-{result.reference_question_id}")
+            if answer is None:
+                unanswered.append(result.pk)
+                continue
+            result.answer = answer
+            result.confidence_score = query_view.calculate_confidence_score(
+                answer, [{"relevance_score": score} for score in result.retrieval_scores]
+            )
+            answered.append(result)
+        
+        # Answers graded before reuse their cached grade; the rest wait on
+        # the grading batch
+        scores, missing = _cached_relevance_scores(
+            [(result.answer, result.reference_question.expected_answer) for result in answered]
+        )
+        for result, score in zip(answered, scores):
+            result.answer_relevance = UNGRADED if score is None else score
+        
+        QuestionResult.objects.filter(pk__in=unanswered).delete()
+        QuestionResult.objects.bulk_update(
+            answered, ['answer', 'confidence_score', 'answer_relevance'], batch_size=RESULT_WRITE_BATCH_SIZE
+        )
+        
+        if missing:
+            # Grading requests are keyed by their slice of the ungraded
+            # results in primary key order
+            lines = []
+            offset = 0
+            for batch_pairs in _relevance_batches([
+                (answered[index].answer, answered[index].reference_question.expected_answer) for index in missing
+            ]):
+                lines.append(_batch_line(f"grade-{offset}-{len(batch_pairs)}", _relevance_batch_request(batch_pairs)))
+                offset += len(batch_pairs)
+            _submit_batch(client, evaluation_run, 'grading', lines)
+            return False
+        results = answered
+    else:
+        # Grading stage: every remaining result has an answer. Results whose
+        # grading request failed get the default score.
+        pending = [result for result in results if result.answer_relevance == UNGRADED]
+        graded = [None] * len(pending)
+        for custom_id, content in contents.items():
+            _, offset, count = custom_id.split('-')
+            offset, count = int(offset), int(count)
+            graded[offset:offset + count] = _parse_relevance_batch_scores(content, count)
+        _store_relevance_scores(
+            [(result.answer, result.reference_question.expected_answer) for result in pending], graded
+        )
+        for result, score in zip(pending, graded):
+            result.answer_relevance = DEFAULT_RELEVANCE_SCORE if score is None else score
+        QuestionResult.objects.bulk_update(pending, ['answer_relevance'], batch_size=RESULT_WRITE_BATCH_SIZE)
+    
+    success_count = sum(
+        1 for result in results if _is_success(result.confidence_score, result.answer_relevance)
+    )
+    _complete_run(
+        evaluation_run, success_count, evaluation_run.total_questions - success_count,
+        (timezone.now() - evaluation_run.run_date).total_seconds()
+    )
+    return True
+
+
+def _previous_run_annotations():
+    """
+    Subquery annotations carrying each run's most recent earlier completed
+    run in the same evaluation set, as prev_<field> values.
+    """
+    previous_runs = EvaluationRun.objects.filter(
+        evaluation_set=OuterRef('evaluation_set'),
+        status='completed',
+        run_date__lt=OuterRef('run_date')
+    ).order_by('-run_date')
+    return {
+        f'prev_{field}': Subquery(previous_runs.values(field)[:1])
+        for field in COMPARISON_FIELDS
+    }
+
+
+def _run_summary(row, prefix=''):
+    """Summarize a run from a values() row, reading fields under prefix"""
+    total_questions = row[f'{prefix}total_questions']
+    return {
+        "id": row[f'{prefix}id'],
+        "date": row[f'{prefix}run_date'],
+        "avg_score": row[f'{prefix}average_score'],
+        "avg_precision": row[f'{prefix}average_retrieval_precision'],
+        "avg_relevance": row[f'{prefix}average_answer_relevance'],
+        "success_rate": row[f'{prefix}success_count'] / total_questions if total_questions > 0 else 0
+    }
+
+
+def _compare_summaries(current, previous):
+    """Comparison of two run summaries, or of a run with no previous run"""
+    if previous is None:
+        return {
+            "current_run": current,
+            "previous_run": None,
+            "changes": None,
+            "regression_detected": False
+        }
     
     # Calculate changes
-    score_change = (current_run.average_score - previous_run.average_score) / previous_run.average_score if previous_run.average_score else 0
-    precision_change = (current_run.average_retrieval_precision - previous_run.average_retrieval_precision) / previous_run.average_retrieval_precision if previous_run.average_retrieval_precision else 0
-    relevance_change = (current_run.average_answer_relevance - previous_run.average_answer_relevance) / previous_run.average_answer_relevance if previous_run.average_answer_relevance else 0
-    success_rate_change = (current_success_rate - previous_success_rate) / previous_success_rate if previous_success_rate else 0
+    score_change = (current["avg_score"] - previous["avg_score"]) / previous["avg_score"] if previous["avg_score"] else 0
+    precision_change = (current["avg_precision"] - previous["avg_precision"]) / previous["avg_precision"] if previous["avg_precision"] else 0
+    relevance_change = (current["avg_relevance"] - previous["avg_relevance"]) / previous["avg_relevance"] if previous["avg_relevance"] else 0
+    success_rate_change = (current["success_rate"] - previous["success_rate"]) / previous["success_rate"] if previous["success_rate"] else 0
     
     # Detect regression (defined as 10% drop in any metric)
     regression_threshold = -0.1  # -10%
@@ -326,22 +1199,8 @@ def compare_runs(current_run_id, previous_run_id=None):
     
     # Format results
     return {
-        "current_run": {
-            "id": current_run.id,
-            "date": current_run.run_date,
-            "avg_score": current_run.average_score,
-            "avg_precision": current_run.average_retrieval_precision,
-            "avg_relevance": current_run.average_answer_relevance,
-            "success_rate": current_success_rate
-        },
-        "previous_run": {
-            "id": previous_run.id,
-            "date": previous_run.run_date,
-            "avg_score": previous_run.average_score,
-            "avg_precision": previous_run.average_retrieval_precision,
-            "avg_relevance": previous_run.average_answer_relevance,
-            "success_rate": previous_success_rate
-        },
+        "current_run": current,
+        "previous_run": previous,
         "changes": {
             "score_change": score_change * 100,  # Convert to percentage
             "precision_change": precision_change * 100,
@@ -352,6 +1211,63 @@ def compare_runs(current_run_id, previous_run_id=None):
     }
 
 
+def _compare_to_previous(row):
+    """Comparison of a row annotated by _previous_run_annotations"""
+    previous = _run_summary(row, 'prev_') if row['prev_id'] is not None else None
+    return _compare_summaries(_run_summary(row), previous)
+
+
+def compare_runs(current_run_id, previous_run_id=None):
+    """
+    Compare the current evaluation run with a previous run to detect regressions.
+    Both runs are loaded in a single query.
+    
+    Args:
+        current_run_id (int): ID of the current evaluation run
+        previous_run_id (int): ID of a previous run to compare against
+            If None, automatically finds the most recent completed run.
+        
+    Returns:
+        dict: Comparison results with metrics and change percentages
+    """
+    if previous_run_id is None:
+        row = EvaluationRun.objects.filter(id=current_run_id).annotate(
+            **_previous_run_annotations()
+        ).values(*COMPARISON_FIELDS, *(f'prev_{field}' for field in COMPARISON_FIELDS)).first()
+        if row is None:
+            raise ValueError(f"Evaluation run with ID {current_run_id} not found")
+        return _compare_to_previous(row)
+    
+    rows = {
+        row['id']: row
+        for row in EvaluationRun.objects.filter(id__in=[current_run_id, previous_run_id]).values(*COMPARISON_FIELDS)
+    }
+    if int(current_run_id) not in rows:
+        raise ValueError(f"Evaluation run with ID {current_run_id} not found")
+    if int(previous_run_id) not in rows:
+        raise ValueError(f"Previous evaluation run with ID {previous_run_id} not found")
+    return _compare_summaries(_run_summary(rows[int(current_run_id)]), _run_summary(rows[int(previous_run_id)]))
+
+
+def compare_runs_to_previous(runs):
+    """
+    Compare each of several runs with its previous completed run, in a
+    single query however many runs there are.
+    
+    Args:
+        runs (QuerySet): EvaluationRun queryset, in the order wanted
+        
+    Returns:
+        list: compare_runs results, one per run
+    """
+    return [
+        _compare_to_previous(row)
+        for row in runs.annotate(**_previous_run_annotations()).values(
+            *COMPARISON_FIELDS, *(f'prev_{field}' for field in COMPARISON_FIELDS)
+        )
+    ]
+
+
 def generate_evaluation_report(run_id):
     """
     Generate a detailed report for an evaluation run.
@@ -363,28 +1279,43 @@ def generate_evaluation_report(run_id):
         dict: Detailed report data
     """
     try:
-        run = EvaluationRun.objects.get(id=run_id)
+        run = EvaluationRun.objects.select_related('evaluation_set').get(id=run_id)
     except EvaluationRun.DoesNotExist:
         raise ValueError(f"Evaluation run with ID {run_id} not found")
     
     # Get results
     results = QuestionResult.objects.filter(evaluation_run=run)
     
-    # Group results by question type
-    type_stats = {}
-    questions = ReferenceQuestion.objects.filter(evaluation_set=run.evaluation_set)
-    for q_type, _ in ReferenceQuestion.QUESTION_TYPES:
-        type_results = results.filter(reference_question__question_type=q_type)
-        if type_results.exists():
-            type_stats[q_type] = {
-                "count": type_results.count(),
-                "avg_relevance": type_results.aggregate(Avg('answer_relevance')).get('answer_relevance__avg', 0),
-                "avg_precision": type_results.aggregate(Avg('retrieval_precision')).get('retrieval_precision__avg', 0)
-            }
-    
-    # Get best and worst performers
-    best_results = results.order_by('-answer_relevance')[:3]
-    worst_results = results.order_by('answer_relevance')[:3]
+    # Group results by question type in one aggregate query
+    grouped_stats = {
+        row.pop('reference_question__question_type'): row
+        for row in results.order_by().values('reference_question__question_type').annotate(
+            count=Count('id'),
+            avg_relevance=Avg('answer_relevance'),
+            avg_precision=Avg('retrieval_precision')
+        )
+    }
+    type_stats = {
+        q_type: grouped_stats[q_type]
+        for q_type, _ in ReferenceQuestion.QUESTION_TYPES
+        if q_type in grouped_stats
+    }
+    
+    # Best and worst performers come from the two ends of one sorted list
+    # of just the reported fields
+    performers = [
+        {
+            "question": row['reference_question__question_text'],
+            "relevance": row['answer_relevance'],
+            "precision": row['retrieval_precision'],
+            "model": row['model_used']
+        }
+        for row in results.order_by('answer_relevance', 'pk').values(
+            'reference_question__question_text', 'answer_relevance', 'retrieval_precision', 'model_used'
+        )
+    ]
+    best_performers = performers[-3:][::-1]
+    worst_performers = performers[:3]
     
     # Construct report
     report = {
@@ -403,22 +1334,8 @@ def generate_evaluation_report(run_id):
             "execution_time": run.execution_time
         },
         "by_question_type": type_stats,
-        "best_performers": [
-            {
-                "question": r.reference_question.question_text,
-                "relevance": r.answer_relevance,
-                "precision": r.retrieval_precision,
-                "model": r.model_used
-            } for r in best_results
-        ],
-        "worst_performers": [
-            {
-                "question": r.reference_question.question_text,
-                "relevance": r.answer_relevance,
-                "precision": r.retrieval_precision,
-                "model": r.model_used
-            } for r in worst_results
-        ]
+        "best_performers": best_performers,
+        "worst_performers": worst_performers
     }
     
     return report
\ No newline at end of file
@@ -0,0 +1,233 @@
+"""
+Rate-limited parallel dispatch of OpenAI chat completion requests.
+Follows the OpenAI cookbook's api_request_parallel_processor: request and
+token capacity refill continuously up to per-minute limits, each request
+waits until both can cover it, and failed requests are retried.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+
+import httpx
+import openai
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# tiktoken gives exact prompt token counts; without it they are estimated
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+# h2 lets concurrent requests share one HTTP/2 connection; without it
+# httpx falls back to HTTP/1.1 over the keep-alive pool
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Connection pool of the OpenAI clients
+OPENAI_MAX_CONNECTIONS = 64
+OPENAI_MAX_KEEPALIVE_CONNECTIONS = 32
+
+# All requests pause this long after any request hits a rate limit
+RATE_LIMIT_COOLDOWN = 15  # seconds
+
+# Errors worth retrying; anything else fails the request at once
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APIConnectionError,
+    openai.APITimeoutError,
+    openai.InternalServerError,
+)
+
+_encoding = None
+
+_openai_client = None
+_openai_client_lock = threading.Lock()
+
+
+def count_tokens(text):
+    """Count tokens in text with tiktoken, or estimate at ~4 characters per token"""
+    global _encoding
+    if not TIKTOKEN_AVAILABLE:
+        return len(text) // 4 + 1
+    if _encoding is None:
+        _encoding = tiktoken.get_encoding("cl100k_base")
+    return len(_encoding.encode(text))
+
+
+def estimate_request_tokens(request):
+    """
+    Estimate the tokens a chat completion request counts against the
+    per-minute limit: prompt tokens plus the completion allowance.
+
+    Args:
+        request (dict): chat.completions.create keyword arguments
+
+    Returns:
+        int: Estimated token cost
+    """
+    # Each message carries a few tokens of overhead, and every reply is
+    # primed with a few more
+    prompt_tokens = sum(4 + count_tokens(message.get("content") or "") for message in request["messages"]) + 2
+    completion_tokens = request.get("max_tokens", 15) * request.get("n", 1)
+    return prompt_tokens + completion_tokens
+
+
+def _connection_limits():
+    return httpx.Limits(
+        max_connections=OPENAI_MAX_CONNECTIONS,
+        max_keepalive_connections=OPENAI_MAX_KEEPALIVE_CONNECTIONS
+    )
+
+
+def get_openai_client():
+    """
+    Return the process-wide OpenAI client, creating it on first use.
+    Its connections stay open between calls, so only the first request
+    pays for the TCP and TLS handshakes. Created lazily so that forked
+    workers each open their own connections.
+
+    Returns:
+        OpenAI: The shared client
+    """
+    global _openai_client
+    if _openai_client is None:
+        with _openai_client_lock:
+            if _openai_client is None:
+                _openai_client = openai.OpenAI(
+                    api_key=settings.OPENAI_API_KEY,
+                    http_client=httpx.Client(http2=HTTP2_AVAILABLE, limits=_connection_limits())
+                )
+    return _openai_client
+
+
+def create_async_openai_client(**kwargs):
+    """
+    Create an AsyncOpenAI client over a pooled HTTP/2 connection.
+    Its connections belong to the running event loop, so create one per
+    loop and close it before the loop ends.
+
+    Args:
+        **kwargs: Extra AsyncOpenAI arguments, such as max_retries
+
+    Returns:
+        AsyncOpenAI: A new client
+    """
+    return openai.AsyncOpenAI(
+        api_key=settings.OPENAI_API_KEY,
+        http_client=httpx.AsyncClient(http2=HTTP2_AVAILABLE, limits=_connection_limits()),
+        **kwargs
+    )
+
+
+class ParallelRequestProcessor:
+    """
+    Throttles concurrent chat completion requests to stay within the
+    account's requests-per-minute and tokens-per-minute limits, and
+    retries requests that fail with transient errors.
+
+    Requests are dispatched in arrival order as capacity allows, so many
+    coroutines can share one processor and keep the quota saturated
+    without tripping 429s.
+    """
+
+    def __init__(self, client, max_requests_per_minute=None, max_tokens_per_minute=None, max_attempts=5):
+        """
+        Args:
+            client (AsyncOpenAI): Client to send requests with; its own
+                retries should be disabled, since the processor retries
+            max_requests_per_minute (float): Defaults to settings.OPENAI_RPM
+            max_tokens_per_minute (float): Defaults to settings.OPENAI_TPM
+            max_attempts (int): Attempts per request before giving up
+        """
+        self.client = client
+        self.max_requests_per_minute = max_requests_per_minute or settings.OPENAI_RPM
+        self.max_tokens_per_minute = max_tokens_per_minute or settings.OPENAI_TPM
+        self.max_attempts = max_attempts
+
+        # Start at full capacity, as after a minute of no requests
+        self.available_request_capacity = float(self.max_requests_per_minute)
+        self.available_token_capacity = float(self.max_tokens_per_minute)
+        self.last_update_time = time.monotonic()
+        self.last_rate_limit_time = None
+
+        # asyncio.Lock wakes waiters in FIFO order, so requests are
+        # dispatched in the order they arrive
+        self._dispatch_lock = asyncio.Lock()
+
+    def _refill(self):
+        """Add the capacity accrued since the last update, up to the limits"""
+        now = time.monotonic()
+        elapsed = now - self.last_update_time
+        self.available_request_capacity = min(
+            self.available_request_capacity + self.max_requests_per_minute * elapsed / 60.0,
+            self.max_requests_per_minute
+        )
+        self.available_token_capacity = min(
+            self.available_token_capacity + self.max_tokens_per_minute * elapsed / 60.0,
+            self.max_tokens_per_minute
+        )
+        self.last_update_time = now
+
+    async def _acquire(self, token_cost):
+        """Wait until one request and token_cost tokens are available, then take them"""
+        # A request larger than the whole budget waits for a full bucket
+        token_cost = min(token_cost, self.max_tokens_per_minute)
+
+        async with self._dispatch_lock:
+            while True:
+                if self.last_rate_limit_time is not None:
+                    cooldown = self.last_rate_limit_time + RATE_LIMIT_COOLDOWN - time.monotonic()
+                    if cooldown > 0:
+                        await asyncio.sleep(cooldown)
+                        continue
+
+                self._refill()
+                request_shortfall = 1 - self.available_request_capacity
+                token_shortfall = token_cost - self.available_token_capacity
+                if request_shortfall <= 0 and token_shortfall <= 0:
+                    self.available_request_capacity -= 1
+                    self.available_token_capacity -= token_cost
+                    return
+
+                # Sleep until the scarcer of the two has refilled enough
+                await asyncio.sleep(max(
+                    request_shortfall * 60.0 / self.max_requests_per_minute,
+                    token_shortfall * 60.0 / self.max_tokens_per_minute,
+                    0.001
+                ))
+
+    async def create(self, **request):
+        """
+        Send a chat completion request once capacity allows.
+
+        Args:
+            **request: chat.completions.create keyword arguments
+
+        Returns:
+            ChatCompletion: The response
+
+        Raises:
+            openai.OpenAIError: The last error, once max_attempts is reached,
+                or any non-retryable error
+        """
+        token_cost = estimate_request_tokens(request)
+
+        for attempt in range(1, self.max_attempts + 1):
+            await self._acquire(token_cost)
+            try:
+                return await self.client.chat.completions.create(**request)
+            except RETRYABLE_ERRORS as e:
+                if isinstance(e, openai.RateLimitError):
+                    self.last_rate_limit_time = time.monotonic()
+                if attempt == self.max_attempts:
+                    logger.error(f"OpenAI request failed after {attempt} attempts: {e}")
+                    raise
+                logger.warning(f"OpenAI request attempt {attempt} failed, retrying: {e}")
@@ -3,6 +3,7 @@ Management command to analyze feedback and generate insights.
 """
 
 import datetime
+from collections import Counter
 from django.core.management.base import BaseCommand, CommandError
 from django.utils import timezone
 from django.db.models import Count, Avg, Q, F
@@ -81,7 +82,13 @@ class Command(BaseCommand):
             created_at__lte=end_date
         )
         
-        if not feedback.exists():
+        # Trend analysis compares the two halves of the date range
+        mid_point = start_date + datetime.timedelta(days=(end_date - start_date).days // 2)
+        
+        # All counts the analysis and report need, in a single query
+        stats = self._feedback_stats(feedback, mid_point)
+        
+        if not stats['total']:
             self.stdout.write(self.style.WARNING("No feedback found in the specified date range."))
             return
         
@@ -89,20 +96,20 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS(
             f"Analyzing feedback from {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}"
         ))
-        self.stdout.write(f"Total feedback items: {feedback.count()}")
+        self.stdout.write(f"Total feedback items: {stats['total']}")
         
         # Run the analysis
-        results = self._analyze_feedback(feedback, start_date, end_date)
+        results = self._analyze_feedback(feedback, stats, start_date, mid_point, end_date)
         
         # Save the analysis if requested
         if options['save']:
             analysis = FeedbackAnalysis.objects.create(
                 date_range_start=start_date,
                 date_range_end=end_date,
-                total_feedback_analyzed=feedback.count(),
-                positive_feedback_count=feedback.filter(rating='thumbs_up').count(),
-                negative_feedback_count=feedback.filter(rating='thumbs_down').count(),
-                neutral_feedback_count=feedback.filter(rating='neutral').count(),
+                total_feedback_analyzed=stats['total'],
+                positive_feedback_count=stats['positive'],
+                negative_feedback_count=stats['negative'],
+                neutral_feedback_count=stats['neutral'],
                 **results
             )
             self.stdout.write(self.style.SUCCESS(
@@ -114,114 +121,118 @@ class Command(BaseCommand):
             import json
             self.stdout.write(json.dumps(results, indent=2))
         else:
-            self._output_text_report(results, feedback)
+            self._output_text_report(results, stats)
     
-    def _analyze_feedback(self, feedback, start_date, end_date):
+    def _feedback_stats(self, feedback, mid_point):
+        """
+        Count feedback by rating, negative feedback by issue area, and
+        positive feedback in each half of the date range, in one query
+        of conditional aggregates.
+        """
+        negative = Q(rating='thumbs_down')
+        return feedback.aggregate(
+            total=Count('id'),
+            positive=Count('id', filter=Q(rating='thumbs_up')),
+            negative=Count('id', filter=negative),
+            neutral=Count('id', filter=Q(rating='neutral')),
+            source_issues=Count('id', filter=(
+                negative & Q(source_quality_issues__isnull=False)
+                & ~Q(source_quality_issues={}) & ~Q(source_quality_issues=[])
+            )),
+            clarity_issues=Count('id', filter=negative & Q(clarity_rating__lt=3)),
+            completeness_issues=Count('id', filter=negative & Q(completeness_rating__lt=3)),
+            citation_issues=Count('id', filter=negative & Q(citation_rating__lt=3)),
+            first_half_positive=Count('id', filter=Q(created_at__lt=mid_point, rating='thumbs_up')),
+            first_half_total=Count('id', filter=Q(created_at__lt=mid_point)),
+            second_half_positive=Count('id', filter=Q(created_at__gte=mid_point, rating='thumbs_up')),
+            second_half_total=Count('id', filter=Q(created_at__gte=mid_point)),
+        )
+    
+    def _analyze_feedback(self, feedback, stats, start_date, mid_point, end_date):
         """
         Analyze feedback and generate insights.
         Returns dict with analysis results.
         """
-        # Top issues analysis
-        issues = []
-        for fb in feedback.filter(specific_issues__isnull=False):
-            if fb.specific_issues:
-                issues.extend(fb.specific_issues)
-        
-        issue_counts = {}
-        for issue in issues:
-            issue_counts[issue] = issue_counts.get(issue, 0) + 1
+        # Top issues analysis, reading just the issue lists
+        issue_counts = Counter()
+        issue_lists = feedback.filter(
+            specific_issues__isnull=False
+        ).exclude(
+            specific_issues=[]
+        ).values_list('specific_issues', flat=True)
+        for issues in issue_lists.iterator(chunk_size=2000):
+            if issues:
+                issue_counts.update(issues)
         
         top_issues = [
             {"issue": issue, "count": count}
-            for issue, count in sorted(
-                issue_counts.items(),
-                key=lambda x: x[1],
-                reverse=True
-            )[:10]
+            for issue, count in issue_counts.most_common(10)
         ]
         
-        # Category distribution
-        category_counts = feedback.values('category').annotate(count=Count('id'))
+        # Category distribution, with each category's negative feedback
+        category_counts = feedback.values('category').annotate(
+            count=Count('id'),
+            negative_count=Count('id', filter=Q(rating='thumbs_down'))
+        )
+        category_counts = [item for item in category_counts if item['category']]
         category_distribution = {
-            item['category']: item['count'] for item in category_counts if item['category']
+            item['category']: item['count'] for item in category_counts
         }
         
         # Improvement opportunities based on negative feedback
-        negative_feedback = feedback.filter(rating='thumbs_down')
-        
         improvement_opportunities = []
         
         # 1. Source quality issues
-        source_issues = negative_feedback.filter(
-            source_quality_issues__isnull=False
-        ).exclude(
-            source_quality_issues={}
-        ).exclude(
-            source_quality_issues=[]
-        )
+        source_issues = stats['source_issues']
         
-        if source_issues.exists():
+        if source_issues:
             improvement_opportunities.append({
                 "area": "Source Quality",
                 "description": "Improve source retrieval and quality",
-                "feedback_count": source_issues.count(),
-                "priority": "high" if source_issues.count() > 5 else "medium"
+                "feedback_count": source_issues,
+                "priority": "high" if source_issues > 5 else "medium"
             })
         
         # 2. Answer clarity
-        clarity_issues = negative_feedback.filter(
-            clarity_rating__lt=3
-        )
+        clarity_issues = stats['clarity_issues']
         
-        if clarity_issues.exists():
+        if clarity_issues:
             improvement_opportunities.append({
                 "area": "Answer Clarity",
                 "description": "Improve answer formatting and clarity",
-                "feedback_count": clarity_issues.count(),
-                "priority": "high" if clarity_issues.count() > 5 else "medium"
+                "feedback_count": clarity_issues,
+                "priority": "high" if clarity_issues > 5 else "medium"
             })
         
         # 3. Answer completeness
-        completeness_issues = negative_feedback.filter(
-            completeness_rating__lt=3
-        )
+        completeness_issues = stats['completeness_issues']
         
-        if completeness_issues.exists():
+        if completeness_issues:
             improvement_opportunities.append({
                 "area": "Answer Completeness",
                 "description": "Provide more comprehensive answers",
-                "feedback_count": completeness_issues.count(),
-                "priority": "high" if completeness_issues.count() > 5 else "medium"
+                "feedback_count": completeness_issues,
+                "priority": "high" if completeness_issues > 5 else "medium"
             })
         
         # 4. Citation accuracy
-        citation_issues = negative_feedback.filter(
-            citation_rating__lt=3
-        )
+        citation_issues = stats['citation_issues']
         
-        if citation_issues.exists():
+        if citation_issues:
             improvement_opportunities.append({
                 "area": "Citation Accuracy",
                 "description": "Improve citation accuracy and specificity",
-                "feedback_count": citation_issues.count(),
-                "priority": "high" if citation_issues.count() > 5 else "medium"
+                "feedback_count": citation_issues,
+                "priority": "high" if citation_issues > 5 else "medium"
             })
         
         # Trend analysis - compare periods
-        total_days = (end_date - start_date).days
-        mid_point = start_date + datetime.timedelta(days=total_days // 2)
-        
-        first_half = feedback.filter(created_at__lt=mid_point)
-        second_half = feedback.filter(created_at__gte=mid_point)
-        
         # Calculate improvement or decline in rating ratios
-        first_half_positive = first_half.filter(rating='thumbs_up').count()
-        first_half_total = first_half.count() or 1  # Avoid division by zero
-        first_half_ratio = (first_half_positive / first_half_total) * 100
+        first_half_total = stats['first_half_total'] or 1  # Avoid division by zero
+        first_half_ratio = (stats['first_half_positive'] / first_half_total) * 100
         
-        second_half_positive = second_half.filter(rating='thumbs_up').count()
-        second_half_total = second_half.count() or 1
-        second_half_ratio = (second_half_positive / second_half_total) * 100
+        second_half_total = stats['second_half_total'] or 1
+        second_half_ratio = (stats['second_half_positive'] / second_half_total) * 100
         
         rating_change = second_half_ratio - first_half_ratio
         
@@ -275,14 +286,12 @@ class Command(BaseCommand):
         priority_areas = []
         
         # Categories with high negative feedback
-        for category, count in category_distribution.items():
-            category_feedback = feedback.filter(category=category)
-            negative_count = category_feedback.filter(rating='thumbs_down').count()
-            negative_ratio = (negative_count / count) * 100
+        for item in category_counts:
+            negative_ratio = (item['negative_count'] / item['count']) * 100
             
             if negative_ratio > 30:  # More than 30% negative feedback
                 priority_areas.append({
-                    "area": category,
+                    "area": item['category'],
                     "reason": f"High negative feedback ratio ({negative_ratio:.1f}%)",
                     "priority": "high" if negative_ratio > 50 else "medium"
                 })
@@ -297,17 +306,17 @@ class Command(BaseCommand):
             "priority_areas": priority_areas
         }
     
-    def _output_text_report(self, results, feedback):
+    def _output_text_report(self, results, stats):
         """Output the analysis results in text format"""
         self.stdout.write("\n" + "="*50)
         self.stdout.write(" FEEDBACK ANALYSIS REPORT ")
         self.stdout.write("="*50 + "\n")
         
         # Rating breakdown
-        positive_count = feedback.filter(rating='thumbs_up').count()
-        negative_count = feedback.filter(rating='thumbs_down').count()
-        neutral_count = feedback.filter(rating='neutral').count()
-        total_count = feedback.count()
+        positive_count = stats['positive']
+        negative_count = stats['negative']
+        neutral_count = stats['neutral']
+        total_count = stats['total']
         
         self.stdout.write("RATING BREAKDOWN:")
         self.stdout.write(f"Positive: {positive_count} ({positive_count/total_count*100:.1f}%)")
@@ -9,6 +9,9 @@ from django.utils import timezone
 from api.models import Feedback
 from api.feedback.models import EnhancedFeedback
 
+# Imported feedback rows per multi-row INSERT
+IMPORT_BATCH_SIZE = 500
+
 
 class Command(BaseCommand):
     help = "Import existing feedback into the enhanced feedback system"
@@ -29,8 +32,11 @@ class Command(BaseCommand):
         dry_run = options['dry_run']
         limit = options.get('limit')
         
-        # Get legacy feedback
-        queryset = Feedback.objects.all().order_by('-created_at')
+        # Get legacy feedback, with just the fields that are copied
+        queryset = Feedback.objects.only(
+            'query_history', 'rating', 'comment', 'specific_issues', 'retrieval_quality',
+            'citation_accuracy', 'answer_relevance', 'created_at'
+        ).order_by('-created_at')
         if limit:
             queryset = queryset[:limit]
         
@@ -50,12 +56,20 @@ class Command(BaseCommand):
         with transaction.atomic():
             imported_count = 0
             skipped_count = 0
+            batch = []
+            
+            # Queries that already have enhanced feedback, loaded once
+            imported_queries = set(
+                EnhancedFeedback.objects.values_list('query_history_id', flat=True)
+            )
             
-            for legacy in queryset:
+            # Stream rows rather than caching the whole queryset
+            for legacy in queryset.iterator(chunk_size=1000):
                 # Check if already imported
-                if EnhancedFeedback.objects.filter(query_history=legacy.query_history).exists():
+                if legacy.query_history_id in imported_queries:
                     skipped_count += 1
                     continue
+                imported_queries.add(legacy.query_history_id)
                 
                 # Determine category based on specific issues
                 category = 'general'
@@ -70,8 +84,8 @@ class Command(BaseCommand):
                         category = 'clarity'
                 
                 # Map ratings
-                enhanced = EnhancedFeedback(
-                    query_history=legacy.query_history,
+                batch.append(EnhancedFeedback(
+                    query_history_id=legacy.query_history_id,
                     rating=legacy.rating,
                     comment=legacy.comment,
                     specific_issues=legacy.specific_issues,
@@ -85,14 +99,21 @@ class Command(BaseCommand):
                     relevance_rating=legacy.answer_relevance,
                     # Set review timestamp
                     reviewed_at=timezone.now()
-                )
-                
-                enhanced.save()
-                imported_count += 1
+                ))
                 
-                if imported_count % 100 == 0:
+                if len(batch) >= IMPORT_BATCH_SIZE:
+                    imported_count += self._flush(batch)
                     self.stdout.write(f"Imported {imported_count} items...")
+            
+            imported_count += self._flush(batch)
         
         self.stdout.write(self.style.SUCCESS(
             f"Import completed. {imported_count} items imported, {skipped_count} skipped."
-        ))
\ No newline at end of file
+        ))
+    
+    def _flush(self, batch):
+        """Insert a batch of enhanced feedback in bulk and empty it"""
+        EnhancedFeedback.objects.bulk_create(batch, batch_size=IMPORT_BATCH_SIZE)
+        count = len(batch)
+        batch.clear()
+        return count
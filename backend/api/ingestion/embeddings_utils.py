@@ -3,10 +3,30 @@ Utility functions for generating embeddings and interacting with the vector stor
 """
 
 import hashlib
+import uuid
 from django.conf import settings
+from django.core.cache import cache
 from ..offline import get_llm_client, get_vector_db_client, is_offline_mode
 from ..security.differential_privacy import protect_embedding, protect_embedding_deterministic
 
+# Version token for the indexed corpus; deleting it whenever Weaviate's
+# contents change invalidates every cached retrieval
+CORPUS_VERSION_KEY = 'corpus:version'
+
+# Embedding model; must match the Weaviate vectorizer's model
+EMBEDDING_MODEL = "text-embedding-ada-002"
+
+# Cached embeddings, keyed by text hash and model
+EMBEDDING_CACHE_KEY = 'embedding:{model}:{digest}'
+EMBEDDING_CACHE_TIMEOUT = 30 * 86400  # 30 days
+
+# Searches sent to Weaviate together in one multi-get request
+SEARCH_BATCH_SIZE = 20
+
+# Cached search_weaviate results
+RETRIEVAL_CACHE_KEY = 'retrieval:{digest}'
+RETRIEVAL_CACHE_TIMEOUT = 7 * 86400  # 7 days
+
 
 def create_embeddings(text):
     """
@@ -330,7 +350,7 @@ def generate_embedding(text):
         else:
             # For OpenAI, use the standard API
             response = client.embeddings.create(
-                model="text-embedding-ada-002",
+                model=EMBEDDING_MODEL,
                 input=text
             )
             return response.data[0].embedding
@@ -445,6 +465,7 @@ def add_document_chunk_to_weaviate(content, metadata):
             data_object=data_object,
             vector=embedding
         )
+        bump_corpus_version()
         return result
     except Exception as e:
         print(f"Error adding document to Weaviate: {e}")
@@ -484,14 +505,105 @@ def add_figure_to_weaviate(figure_data):
             data_object=figure_data,
             vector=embedding
         )
+        bump_corpus_version()
         return result
     except Exception as e:
         print(f"Error adding figure to Weaviate: {e}")
         return None
 
 
+def get_embeddings_with_cache(texts):
+    """
+    Embed several texts, reusing cached embeddings and sending all the
+    misses to the API in a single request.
+    
+    Args:
+        texts (list): Texts to embed
+        
+    Returns:
+        list: Per text, its embedding, or None if it couldn't be embedded
+    """
+    keys = [
+        EMBEDDING_CACHE_KEY.format(model=EMBEDDING_MODEL, digest=hashlib.sha256(text.encode()).hexdigest())
+        for text in texts
+    ]
+    found = cache.get_many(keys)
+    embeddings = [found.get(key) for key in keys]
+    missing = [index for index, embedding in enumerate(embeddings) if embedding is None and texts[index]]
+    if not missing:
+        return embeddings
+    
+    if is_offline_mode():
+        # Local embedding models take one text at a time
+        new_embeddings = [generate_embedding(texts[index]) or None for index in missing]
+    else:
+        try:
+            # Same truncation as generate_embedding
+            response = get_openai_client().embeddings.create(
+                model=EMBEDDING_MODEL,
+                input=[texts[index][:8000 * 4] for index in missing]
+            )
+            new_embeddings = [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+        except Exception as e:
+            import logging
+            logging.error(f"Error generating embeddings: {e}")
+            new_embeddings = [None] * len(missing)
+    
+    for index, embedding in zip(missing, new_embeddings):
+        embeddings[index] = embedding
+    cache.set_many(
+        {keys[index]: embedding for index, embedding in zip(missing, new_embeddings) if embedding},
+        EMBEDDING_CACHE_TIMEOUT
+    )
+    return embeddings
+
+
+def _with_near_query(query, query_text, query_vector):
+    """Add vector similarity to a query, by precomputed vector when there is one"""
+    if query_vector:
+        return query.with_near_vector({"vector": query_vector})
+    return query.with_near_text({"concepts": [query_text]})
+
+
+def _document_query(client, query_text, doc_type, limit, use_hybrid, alpha, filters, query_vector):
+    """Build the Document collection query of a search"""
+    if use_hybrid:
+        # Hybrid search (vector + BM25)
+        query = (
+            client.query
+            .get("Document", ["content", "doc_type", "title", "author", "year", "chapter", "source"])
+            .with_hybrid(
+                query=query_text,
+                alpha=alpha,  # Weight for vector search (0.75 = 75% vector, 25% keyword)
+                vector=query_vector,
+                properties=["content"]  # Only search content field for keywords
+            )
+            .with_limit(limit)
+        )
+    else:
+        # Vector-only search
+        query = (
+            client.query
+            .get("Document", ["content", "doc_type", "title", "author", "year", "chapter", "source"])
+            .with_limit(limit)
+        )
+        query = _with_near_query(query, query_text, query_vector)
+    
+    # Add filter if specified
+    if filters:
+        query = query.with_where(filters)
+    # Add simple doc_type filter if specified and no advanced filters
+    elif doc_type:
+        query = query.with_where({
+            "path": ["doc_type"],
+            "operator": "Equal",
+            "valueString": doc_type
+        })
+    return query
+
+
 def search_weaviate(query_text, doc_type=None, limit=10, use_hybrid=True, alpha=0.75, 
-                 collection="Document", include_figures=False, filters=None):
+                 collection="Document", include_figures=False, filters=None, query_vector=None):
     """
     Search for relevant document chunks or figures in Weaviate.
     
@@ -506,6 +618,8 @@ def search_weaviate(query_text, doc_type=None, limit=10, use_hybrid=True, alpha=
         include_figures (bool, optional): Whether to include figures in the results
             Only applies when collection="Document"
         filters (dict, optional): Advanced filter criteria
+        query_vector (list, optional): Precomputed embedding of query_text;
+            saves Weaviate from embedding the query itself
         
     Returns:
         list: List of relevant document chunks or figures with metadata
@@ -526,38 +640,7 @@ def search_weaviate(query_text, doc_type=None, limit=10, use_hybrid=True, alpha=
     
     # Search Document collection
     if collection == "Document" or include_figures:
-        # Build query for Document collection
-        if use_hybrid:
-            # Hybrid search (vector + BM25)
-            query = (
-                client.query
-                .get("Document", ["content", "doc_type", "title", "author", "year", "chapter", "source"])
-                .with_hybrid(
-                    query=query_text,
-                    alpha=alpha,  # Weight for vector search (0.75 = 75% vector, 25% keyword)
-                    properties=["content"]  # Only search content field for keywords
-                )
-                .with_limit(limit)
-            )
-        else:
-            # Vector-only search
-            query = (
-                client.query
-                .get("Document", ["content", "doc_type", "title", "author", "year", "chapter", "source"])
-                .with_near_text({"concepts": [query_text]})
-                .with_limit(limit)
-            )
-        
-        # Add filter if specified
-        if filters:
-            query = query.with_where(filters)
-        # Add simple doc_type filter if specified and no advanced filters
-        elif doc_type:
-            query = query.with_where({
-                "path": ["doc_type"],
-                "operator": "Equal",
-                "valueString": doc_type
-            })
+        query = _document_query(client, query_text, doc_type, limit, use_hybrid, alpha, filters, query_vector)
         
         # Execute query
         try:
@@ -582,6 +665,7 @@ def search_weaviate(query_text, doc_type=None, limit=10, use_hybrid=True, alpha=
                 .with_hybrid(
                     query=query_text,
                     alpha=alpha,
+                    vector=query_vector,
                     properties=["caption"]
                 )
                 .with_limit(fig_limit)
@@ -592,9 +676,9 @@ def search_weaviate(query_text, doc_type=None, limit=10, use_hybrid=True, alpha=
                 client.query
                 .get("Figure", ["figure_id", "figure_type", "caption", "page_number", 
                                 "file_path", "doc_type", "title", "author", "year"])
-                .with_near_text({"concepts": [query_text]})
                 .with_limit(fig_limit)
             )
+            fig_query = _with_near_query(fig_query, query_text, query_vector)
         
         # Add filter if specified
         if filters:
@@ -652,6 +736,158 @@ def search_weaviate(query_text, doc_type=None, limit=10, use_hybrid=True, alpha=
     return results
 
 
+def get_corpus_version():
+    """Return the current corpus version token, minting one if it was invalidated"""
+    return cache.get_or_set(CORPUS_VERSION_KEY, lambda: uuid.uuid4().hex, None)
+
+
+def bump_corpus_version():
+    """Invalidate cached retrievals after the indexed corpus changed"""
+    cache.delete(CORPUS_VERSION_KEY)
+
+
+def _retrieval_cache_key(query_text, doc_type, limit, use_hybrid, corpus_version):
+    digest = hashlib.sha1(f"{query_text}|{doc_type}|{limit}|{use_hybrid}|{corpus_version}".encode()).hexdigest()
+    return RETRIEVAL_CACHE_KEY.format(digest=digest)
+
+
+def _multi_search_documents(client, searches, limit, use_hybrid, alpha):
+    """
+    Run Document searches in one multi-get request, each under its own
+    alias. Falls back to one search_weaviate call per search if the
+    request fails, e.g. on a vector store without multi-get.
+    
+    Args:
+        searches (list): (query_text, doc_type, query_vector) tuples
+        
+    Returns:
+        list: Per search, its results
+    """
+    try:
+        response = client.query.multi_get([
+            _document_query(client, query_text, doc_type, limit, use_hybrid, alpha, None, query_vector)
+            .with_alias(f"q{index}")
+            for index, (query_text, doc_type, query_vector) in enumerate(searches)
+        ]).do()
+        if response.get("errors"):
+            raise Exception(response["errors"])
+        found = response.get("data", {}).get("Get", {})
+        return [found.get(f"q{index}") or [] for index in range(len(searches))]
+    except Exception as e:
+        print(f"Error in batched Document search, searching one by one: {e}")
+        return [
+            search_weaviate(query_text, doc_type=doc_type, limit=limit, use_hybrid=use_hybrid,
+                            alpha=alpha, query_vector=query_vector)
+            for query_text, doc_type, query_vector in searches
+        ]
+
+
+def search_weaviate_batch(query_texts, doc_types=None, limit=10, use_hybrid=True, alpha=0.75,
+                          query_vectors=None, use_cache=False):
+    """
+    Search the Document collection for several queries with one Weaviate
+    request per SEARCH_BATCH_SIZE queries, instead of one per query.
+    
+    Args:
+        query_texts (list): The query texts
+        doc_types (list, optional): Per query, a document type to filter by, or None
+        limit (int, optional): Maximum number of results per query
+        use_hybrid (bool, optional): Whether to use hybrid search (vector + keyword)
+        alpha (float, optional): Weight for vector search in hybrid mode (0-1)
+        query_vectors (list, optional): Per query, its precomputed embedding or None
+        use_cache (bool, optional): Whether to reuse and store results in the
+            retrieval cache shared with cached_search_weaviate
+        
+    Returns:
+        list: Per query, its list of relevant document chunks with metadata
+    """
+    import time
+    count = len(query_texts)
+    doc_types = doc_types or [None] * count
+    query_vectors = query_vectors or [None] * count
+    results = [None] * count
+    
+    cache_keys = {}
+    if use_cache:
+        corpus_version = get_corpus_version()
+        cache_keys = {
+            index: _retrieval_cache_key(query_texts[index], doc_types[index], limit, use_hybrid, corpus_version)
+            for index in range(count)
+        }
+        found = cache.get_many(cache_keys.values())
+        for index, key in cache_keys.items():
+            results[index] = found.get(key)
+    
+    missing = [index for index in range(count) if results[index] is None]
+    if not missing:
+        return results
+    
+    client = get_weaviate_client()
+    start_time = time.time()
+    for offset in range(0, len(missing), SEARCH_BATCH_SIZE):
+        batch = missing[offset:offset + SEARCH_BATCH_SIZE]
+        batch_results = _multi_search_documents(
+            client, [(query_texts[index], doc_types[index], query_vectors[index]) for index in batch],
+            limit, use_hybrid, alpha
+        )
+        for index, documents in zip(batch, batch_results):
+            results[index] = documents
+    
+    # Record metrics for vector search if available
+    try:
+        from ..analytics.collectors import MetricsCollector
+        MetricsCollector.record_vector_search_time(
+            collection="Document",
+            num_vectors=0,
+            top_k=limit,
+            time_ms=(time.time() - start_time) * 1000,
+            metadata={
+                'use_hybrid': use_hybrid,
+                'alpha': alpha if use_hybrid else None,
+                'batch_size': len(missing),
+                'results_count': sum(len(results[index]) for index in missing)
+            }
+        )
+    except Exception as e:
+        # Don't let metrics failure affect the search results
+        print(f"Error recording vector search metrics: {e}")
+    
+    if use_cache:
+        # Empty results aren't cached, since search errors also come back empty
+        cache.set_many(
+            {cache_keys[index]: results[index] for index in missing if results[index]},
+            RETRIEVAL_CACHE_TIMEOUT
+        )
+    return results
+
+
+def cached_search_weaviate(query_text, doc_type=None, limit=10, use_hybrid=True, query_vector=None):
+    """
+    search_weaviate with results cached until the corpus changes.
+    Empty results aren't cached, since search errors also come back empty.
+    
+    Args:
+        query_text (str): The query text
+        doc_type (str, optional): Filter by document type
+        limit (int, optional): Maximum number of results to return
+        use_hybrid (bool, optional): Whether to use hybrid search (vector + keyword)
+        query_vector (list, optional): Precomputed embedding of query_text
+        
+    Returns:
+        list: List of relevant document chunks with metadata
+    """
+    cache_key = _retrieval_cache_key(query_text, doc_type, limit, use_hybrid, get_corpus_version())
+    
+    results = cache.get(cache_key)
+    if results is None:
+        results = search_weaviate(
+            query_text, doc_type=doc_type, limit=limit, use_hybrid=use_hybrid, query_vector=query_vector
+        )
+        if results:
+            cache.set(cache_key, results, RETRIEVAL_CACHE_TIMEOUT)
+    return results
+
+
 def _adapt_filters_for_figure_collection(filters):
     """
     Adapt document filters for use with the Figure collection.
@@ -5,11 +5,34 @@ Provides access to local and remote language models with network isolation.
 
 import os
 import logging
+import threading
 from django.conf import settings
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+_openai_client = None
+_openai_client_lock = threading.Lock()
+
+
+def get_openai_client():
+    """
+    Return the process-wide OpenAI client, creating it on first use.
+    Reusing one client keeps its connection pool warm instead of building
+    a new client and handshake for every request.
+    
+    Returns:
+        OpenAI: The shared client
+    """
+    global _openai_client
+    if _openai_client is None:
+        with _openai_client_lock:
+            if _openai_client is None:
+                from openai import OpenAI
+                _openai_client = OpenAI(api_key=settings.OPENAI_API_KEY)
+    return _openai_client
+
+
 def get_llm_client(isolation_level="auto"):
     """
     Get the appropriate LLM client based on settings and isolation requirements.
@@ -44,8 +67,7 @@ def get_llm_client(isolation_level="auto"):
         from .local_llm import get_ollama_client
         return get_ollama_client()
     else:
-        from openai import OpenAI
-        return OpenAI(api_key=settings.OPENAI_API_KEY)
+        return get_openai_client()
 
 
 def is_llm_isolated():
@@ -0,0 +1,44 @@
+"""
+Django management command to enable S3 Transfer Acceleration on the backup bucket.
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from botocore.exceptions import ClientError
+
+from api.backup.tasks import get_s3_client
+
+
+class Command(BaseCommand):
+    help = 'Enable S3 Transfer Acceleration on the backup bucket (one-time setup)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--bucket',
+            type=str,
+            help='Bucket to configure (defaults to AWS_BACKUP_BUCKET setting)'
+        )
+        parser.add_argument(
+            '--suspend',
+            action='store_true',
+            help='Suspend acceleration instead of enabling it'
+        )
+    
+    def handle(self, *args, **options):
+        bucket = options['bucket'] or settings.AWS_BACKUP_BUCKET
+        if not bucket:
+            raise CommandError("No bucket given and AWS_BACKUP_BUCKET is not set")
+        
+        status = 'Suspended' if options['suspend'] else 'Enabled'
+        
+        # Bucket configuration calls must go to the regular endpoint
+        s3_client = get_s3_client(use_accelerate=False)
+        try:
+            s3_client.put_bucket_accelerate_configuration(
+                Bucket=bucket,
+                AccelerateConfiguration={'Status': status}
+            )
+        except ClientError as e:
+            raise CommandError(f"Could not update acceleration for {bucket}: {str(e)}")
+        
+        self.stdout.write(self.style.SUCCESS(f"Transfer Acceleration {status.lower()} for bucket {bucket}"))
@@ -86,7 +86,7 @@ class Command(BaseCommand):
     def _run_monitoring(self, options):
         if options['metrics_only']:
             # Collect and output metrics only
-            metrics = SystemMonitor.collect_system_metrics()
+            metrics = SystemMonitor.collect_system_metrics().values()
             if options['json']:
                 self.stdout.write(json.dumps(
                     [{"metric_type": m.metric_type, "value": m.value, "unit": m.unit} for m in metrics],
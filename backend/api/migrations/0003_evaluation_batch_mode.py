@@ -0,0 +1,51 @@
+# Generated by Django 4.2.10 on 2026-10-16 20:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0002_queryhistory_doc_type_queryhistory_processing_time"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="evaluationrun",
+            name="batch_id",
+            field=models.CharField(
+                blank=True,
+                help_text="OpenAI batch in progress, for batch mode runs",
+                max_length=100,
+            ),
+        ),
+        migrations.AddField(
+            model_name="evaluationrun",
+            name="batch_stage",
+            field=models.CharField(
+                blank=True,
+                choices=[
+                    ("answers", "Generating answers"),
+                    ("grading", "Grading answers"),
+                ],
+                max_length=10,
+            ),
+        ),
+        migrations.AddField(
+            model_name="evaluationrun",
+            name="mode",
+            field=models.CharField(
+                choices=[("sync", "Synchronous"), ("batch", "OpenAI Batch API")],
+                default="sync",
+                max_length=10,
+            ),
+        ),
+        migrations.AddField(
+            model_name="questionresult",
+            name="retrieval_scores",
+            field=models.JSONField(
+                blank=True,
+                default=list,
+                help_text="Relevance scores of the top retrieved chunks",
+            ),
+        ),
+    ]
@@ -188,6 +188,16 @@ class EvaluationRun(models.Model):
         ('failed', 'Failed'),
     )
     
+    MODE_CHOICES = (
+        ('sync', 'Synchronous'),
+        ('batch', 'OpenAI Batch API'),
+    )
+    
+    BATCH_STAGE_CHOICES = (
+        ('answers', 'Generating answers'),
+        ('grading', 'Grading answers'),
+    )
+    
     evaluation_set = models.ForeignKey(
         EvaluationSet,
         on_delete=models.CASCADE,
@@ -203,6 +213,9 @@ class EvaluationRun(models.Model):
     failure_count = models.PositiveIntegerField(default=0)
     execution_time = models.FloatField(null=True, blank=True)
     notes = models.TextField(blank=True)
+    mode = models.CharField(max_length=10, choices=MODE_CHOICES, default='sync')
+    batch_id = models.CharField(max_length=100, blank=True, help_text="OpenAI batch in progress, for batch mode runs")
+    batch_stage = models.CharField(max_length=10, choices=BATCH_STAGE_CHOICES, blank=True)
     
     def __str__(self):
         return f"Run: {self.evaluation_set.name} - {self.run_date.strftime('%Y-%m-%d %H:%M')}"
@@ -235,6 +248,7 @@ class QuestionResult(models.Model):
     answer_relevance = models.FloatField()
     execution_time = models.FloatField(null=True, blank=True)
     model_used = models.CharField(max_length=50, blank=True)
+    retrieval_scores = models.JSONField(default=list, blank=True, help_text="Relevance scores of the top retrieved chunks")
     
     def __str__(self):
         return f"Result: {self.reference_question.question_text[:40]}..."
@@ -40,9 +40,9 @@ def get_llm_client():
             from api.llm import get_llm_client as get_isolated_client
             return get_isolated_client(isolation_level="isolated")
         else:
-            # Use OpenAI client
-            from openai import OpenAI
-            return OpenAI(api_key=settings.OPENAI_API_KEY)
+            # Use the shared OpenAI client
+            from api.llm import get_openai_client
+            return get_openai_client()
 
 def get_vector_db_client():
     """
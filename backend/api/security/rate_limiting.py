@@ -17,6 +17,53 @@ from api.analytics.collectors import SecurityCollector
 
 logger = logging.getLogger(__name__)
 
+# Increment a fixed-window counter and start its expiry on first use, in a
+# single atomic round trip
+RATE_LIMIT_INCREMENT_SCRIPT = """
+local count = redis.call('INCR', KEYS[1])
+if count == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+return count
+"""
+
+_increment_script = None
+
+
+def _increment_window_counter(key: str, window: int) -> int:
+    """
+    Increment the counter for a rate limit window and return the new count.
+    Uses a Lua script on Redis; falls back to cache add/incr for other
+    cache backends.
+    
+    Args:
+        key: Cache key for the counter
+        window: Window length in seconds, applied when the counter is created
+        
+    Returns:
+        Request count in the current window, including this request
+    """
+    global _increment_script
+    try:
+        from django_redis import get_redis_connection
+        redis_client = get_redis_connection('default')
+    except (ImportError, NotImplementedError):
+        redis_client = None
+    
+    if redis_client is not None:
+        if _increment_script is None:
+            _increment_script = redis_client.register_script(RATE_LIMIT_INCREMENT_SCRIPT)
+        return int(_increment_script(keys=[cache.make_key(key)], args=[window], client=redis_client))
+    
+    if cache.add(key, 1, window):
+        return 1
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Counter expired between add and incr
+        cache.set(key, 1, window)
+        return 1
+
 
 class RateLimitExceeded(Exception):
     """Exception raised when rate limit is exceeded"""
@@ -335,30 +382,10 @@ class RateLimitingMiddleware:
         norm_path = re.sub(r'/\d+/', '/:id/', path)
         norm_path = re.sub(r'/\d+$', '/:id', norm_path)
         
-        # Create cache keys
+        # Create cache key
         count_key = f"ratelimit:{client_id}:{norm_path}:count"
-        expires_key = f"ratelimit:{client_id}:{norm_path}:expires"
-        
-        # Get current count and expiration time
-        count = cache.get(count_key, 0)
-        expires = cache.get(expires_key)
-        
-        current_time = int(time.time())
-        
-        if not expires or current_time > expires:
-            # First request in a new period
-            expires = current_time + period_seconds
-            count = 1
-            
-            # Set cache with expiration
-            cache.set(count_key, count, period_seconds)
-            cache.set(expires_key, expires, period_seconds)
-        else:
-            # Increment the count
-            count += 1
-            cache.set(count_key, count, cache.ttl(count_key))
         
-        return count
+        return _increment_window_counter(count_key, period_seconds)
     
     def _block_client(self, client_id: str, duration: int = None) -> None:
         """
@@ -484,20 +511,7 @@ def check_rate_limit(client_id: str, action: str, limit: int = None, window: int
             window = 60
     
     cache_key = f"ratelimit:{client_id}:{action}:count"
-    count = cache.get(cache_key, 0)
-    
-    if count == 0:
-        # First request, set initial count
-        cache.set(cache_key, 1, window)
-        return True
-    
-    # Check if limit exceeded
-    if count >= limit:
-        return False
-    
-    # Increment count
-    cache.incr(cache_key)
-    return True
+    return _increment_window_counter(cache_key, window) <= limit
 
 
 def track_rate_limit(request: HttpRequest, action: str, limit: int = None, window: int = None) -> bool:
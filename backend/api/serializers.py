@@ -160,12 +160,12 @@ class EvaluationRunSerializer(serializers.ModelSerializer):
             'id', 'evaluation_set', 'evaluation_set_name', 'run_date', 'status',
             'average_score', 'average_retrieval_precision', 'average_answer_relevance',
             'total_questions', 'success_count', 'failure_count', 'success_rate',
-            'execution_time', 'notes'
+            'execution_time', 'notes', 'mode', 'batch_stage'
         ]
         read_only_fields = [
             'id', 'run_date', 'average_score', 'average_retrieval_precision',
             'average_answer_relevance', 'total_questions', 'success_count',
-            'failure_count', 'execution_time', 'success_rate'
+            'failure_count', 'execution_time', 'success_rate', 'mode', 'batch_stage'
         ]
     
     def get_success_rate(self, obj):
@@ -180,6 +180,7 @@ class TriggerEvaluationSerializer(serializers.Serializer):
     use_hybrid = serializers.BooleanField(required=False, default=True)
     use_cache = serializers.BooleanField(required=False, default=False)
     notes = serializers.CharField(required=False, allow_blank=True)
+    mode = serializers.ChoiceField(choices=EvaluationRun.MODE_CHOICES, required=False, default='sync')
 
 
 class EvaluationReportSerializer(serializers.Serializer):
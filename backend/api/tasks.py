@@ -19,6 +19,9 @@ from api.ingestion.embeddings_utils import (
 )
 from api.evaluation.evaluation_utils import (
     run_evaluation,
+    resume_evaluation,
+    run_evaluation_batch,
+    advance_evaluation_batch,
     compare_runs,
     generate_evaluation_report
 )
@@ -168,6 +171,45 @@ def run_weekly_evaluation():
     return f"Weekly evaluation completed: {json.dumps(results)}"
 
 
+@shared_task(name="resume_evaluation_run")
+def resume_evaluation_run(run_id, use_hybrid=True, use_cache=False):
+    """
+    Finish a sync mode evaluation run that was interrupted, e.g. by a
+    worker restart, without re-evaluating the questions it already saved.
+    """
+    evaluation_run = resume_evaluation(run_id, use_hybrid=use_hybrid, use_cache=use_cache)
+    return f"Evaluation run {run_id} {evaluation_run.status}"
+
+
+@shared_task(name="run_batch_evaluation")
+def run_batch_evaluation(evaluation_set_id, use_hybrid=True, use_cache=False, notes=''):
+    """
+    Start a batch mode evaluation run and schedule polling of its
+    OpenAI batches.
+    """
+    evaluation_run = run_evaluation_batch(evaluation_set_id, use_hybrid=use_hybrid, use_cache=use_cache)
+    if notes:
+        evaluation_run.notes = notes
+        evaluation_run.save(update_fields=['notes'])
+    
+    if evaluation_run.status == 'running':
+        poll_evaluation_batch.apply_async((evaluation_run.id,), countdown=settings.EVAL_BATCH_POLL_INTERVAL)
+    return evaluation_run.id
+
+
+@shared_task(name="poll_evaluation_batch")
+def poll_evaluation_batch(run_id):
+    """
+    Advance a batch mode evaluation run, re-scheduling itself until the
+    run is completed or failed.
+    """
+    evaluation_run = EvaluationRun.objects.get(id=run_id)
+    if not advance_evaluation_batch(evaluation_run):
+        poll_evaluation_batch.apply_async((run_id,), countdown=settings.EVAL_BATCH_POLL_INTERVAL)
+        return f"Evaluation run {run_id} waiting on {evaluation_run.batch_stage} batch"
+    return f"Evaluation run {run_id} {evaluation_run.status}"
+
+
 def send_evaluation_alert(report, comparison):
     """
     Send an email alert when a regression is detected in the system.
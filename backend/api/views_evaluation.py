@@ -30,7 +30,7 @@ from .evaluation.evaluation_utils import (
     compare_runs,
     generate_evaluation_report
 )
-from .tasks import run_weekly_evaluation
+from .tasks import run_weekly_evaluation, run_batch_evaluation
 
 
 class EvaluationSetViewSet(ModelViewSet):
@@ -92,7 +92,8 @@ class EvaluationRunViewSet(ReadOnlyModelViewSet):
         Get all question results for this run.
         """
         run = self.get_object()
-        results = QuestionResult.objects.filter(evaluation_run=run)
+        # The serializer reads each result's question text
+        results = QuestionResult.objects.filter(evaluation_run=run).select_related('reference_question')
         serializer = QuestionResultSerializer(results, many=True)
         return Response(serializer.data)
     
@@ -125,7 +126,8 @@ class QuestionResultViewSet(ReadOnlyModelViewSet):
         """
         Optionally filter results by evaluation run.
         """
-        queryset = QuestionResult.objects.all()
+        # The serializer reads each result's question text
+        queryset = QuestionResult.objects.select_related('reference_question')
         run_id = self.request.query_params.get('run', None)
         if run_id is not None:
             queryset = queryset.filter(evaluation_run__id=run_id)
@@ -151,6 +153,7 @@ class TriggerEvaluationView(APIView):
         use_hybrid = serializer.validated_data.get('use_hybrid', True)
         use_cache = serializer.validated_data.get('use_cache', False)
         notes = serializer.validated_data.get('notes', '')
+        mode = serializer.validated_data.get('mode', 'sync')
         
         # Check if evaluation set exists
         try:
@@ -161,6 +164,26 @@ class TriggerEvaluationView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
         
+        # Batch mode: answers and grades come back from the OpenAI Batch
+        # API within 24 hours; the run is polled to completion by Celery
+        if mode == 'batch':
+            try:
+                task = run_batch_evaluation.delay(
+                    evaluation_set_id, use_hybrid=use_hybrid, use_cache=use_cache, notes=notes
+                )
+                
+                return Response({
+                    "message": "Batch evaluation started",
+                    "task_id": task.id,
+                    "status": "pending"
+                }, status=status.HTTP_202_ACCEPTED)
+            
+            except Exception as e:
+                return Response(
+                    {"error": f"Error starting evaluation: {str(e)}"},
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                )
+        
         # Option 1: Run synchronously (suitable for small evaluation sets)
         if eval_set.questions.count() < 5:  # Small enough to run synchronously
             try:
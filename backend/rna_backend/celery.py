@@ -39,6 +39,16 @@ app.conf.beat_schedule = {
         'task': 'api.analytics.tasks.aggregate_daily_metrics',
         'schedule': crontab(hour=1, minute=0),
     },
+    # Rolling query category totals for the analytics dashboard (every 5 minutes)
+    'refresh-query-type-summary': {
+        'task': 'api.analytics.tasks.refresh_query_type_summary',
+        'schedule': crontab(minute='*/5'),
+    },
+    # Write buffered audit events to the database (every minute)
+    'flush-audit-events': {
+        'task': 'api.analytics.tasks.flush_audit_events',
+        'schedule': crontab(minute='*'),
+    },
     # Weekly analytics report (Monday 1:30 AM)
     'generate-weekly-report': {
         'task': 'api.analytics.tasks.generate_weekly_report',
@@ -56,6 +66,13 @@ app.conf.beat_schedule = {
         'kwargs': {'days_to_keep': 90},
     },
     
+    # Auth tasks
+    # Write buffered access attempts to the database (every minute)
+    'flush-access-attempts': {
+        'task': 'api.auth.tasks.flush_access_attempts',
+        'schedule': crontab(minute='*'),
+    },
+    
     # Quality improvement tasks
     # Weekly quality analysis (Tuesday 2 AM)
     'weekly-quality-analysis': {
@@ -93,6 +110,16 @@ app.conf.beat_schedule = {
         'task': 'api.backup.tasks.backup_postgres_database',
         'schedule': crontab(hour=2, minute=0),
     },
+    # Weekly PostgreSQL base backup for point-in-time recovery (Saturday 1 AM)
+    'weekly-postgres-basebackup': {
+        'task': 'api.backup.tasks.backup_postgres_basebackup',
+        'schedule': crontab(day_of_week=6, hour=1, minute=0),
+    },
+    # Ship completed WAL segments to S3 (every 5 minutes)
+    'archive-postgres-wal': {
+        'task': 'api.backup.tasks.archive_postgres_wal',
+        'schedule': crontab(minute='*/5'),
+    },
     # Daily Weaviate vector database backup (3 AM)
     'daily-weaviate-backup': {
         'task': 'api.backup.tasks.backup_weaviate_database',
@@ -103,6 +130,11 @@ app.conf.beat_schedule = {
         'task': 'api.backup.tasks.backup_media_files',
         'schedule': crontab(hour=4, minute=0),
     },
+    # Rebuild the admin backup listing (every minute)
+    'refresh-backup-index': {
+        'task': 'api.backup.tasks.refresh_backup_index',
+        'schedule': crontab(minute='*'),
+    },
     # Weekly full system backup (Sunday 1 AM)
     'weekly-full-backup': {
         'task': 'api.backup.tasks.run_full_backup',
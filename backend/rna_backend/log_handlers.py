@@ -0,0 +1,41 @@
+"""
+Logging handlers for the RNA Lab Navigator.
+"""
+
+import atexit
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+
+class QueuedStreamHandler(QueueHandler):
+    """
+    Console handler that formats records on the logging thread but writes
+    them from a background listener thread, so busy worker threads never
+    block on stream I/O.
+
+    Configure it like a StreamHandler; its formatter applies as usual.
+    """
+
+    def __init__(self, stream=None):
+        super().__init__(queue.SimpleQueue())
+        self._stream = stream
+        self._start_listener()
+        atexit.register(self._stop_listener)
+        # Threads don't survive fork, so forked workers (Celery prefork,
+        # gunicorn) start a listener of their own
+        os.register_at_fork(after_in_child=self._restart_in_child)
+
+    def _start_listener(self):
+        # Records arrive already formatted by prepare()
+        self.listener = QueueListener(self.queue, logging.StreamHandler(self._stream))
+        self.listener.start()
+
+    def _stop_listener(self):
+        if self.listener._thread is not None:
+            self.listener.stop()
+
+    def _restart_in_child(self):
+        self.queue = queue.SimpleQueue()
+        self._start_listener()
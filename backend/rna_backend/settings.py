@@ -209,6 +209,18 @@ DATABASES = {
 #     }
 # }
 
+# Password hashing
+# https://docs.djangoproject.com/en/4.2/topics/auth/passwords/
+# Existing PBKDF2 hashes still verify and are rehashed with Argon2 on login
+
+PASSWORD_HASHERS = [
+    "api.auth.hashers.TunedArgon2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -249,10 +261,14 @@ CELERY_TIMEZONE = "Asia/Kolkata"  # Golden rule #4
 # Backup settings
 BACKUP_RETENTION_DAYS = int(os.getenv("BACKUP_RETENTION_DAYS", "7"))
 BACKUP_CLEANUP_LOCAL = os.getenv("BACKUP_CLEANUP_LOCAL", "False") == "True"
+BACKUP_BASE_RETENTION_DAYS = int(os.getenv("BACKUP_BASE_RETENTION_DAYS", "14"))
+POSTGRES_WAL_DIR = os.getenv("POSTGRES_WAL_DIR", "")  # pg_receivewal output directory
+BACKUP_PGPASS_FILE = os.getenv("BACKUP_PGPASS_FILE", os.path.join(BASE_DIR, "backups", ".pgpass"))  # Password file for PostgreSQL client commands
 AWS_BACKUP_BUCKET = os.getenv("AWS_BACKUP_BUCKET", "")
 AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID", "")
 AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY", "")
 AWS_S3_ENDPOINT = os.getenv("AWS_S3_ENDPOINT", "")
+AWS_S3_USE_ACCELERATE = os.getenv("AWS_S3_USE_ACCELERATE", "False") == "True"
 
 # Cache settings (used for rate limiting)
 CACHES = {
@@ -280,6 +296,15 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o")
 OPENAI_EMBEDDING_MODEL = os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-ada-002")
 OPENAI_TIMEOUT = int(os.getenv("OPENAI_TIMEOUT", "30"))
+OPENAI_RPM = int(os.getenv("OPENAI_RPM", "1500"))  # Account requests-per-minute limit
+OPENAI_TPM = int(os.getenv("OPENAI_TPM", "125000"))  # Account tokens-per-minute limit
+
+# Evaluation settings
+EVAL_CONCURRENCY = int(os.getenv("EVAL_CONCURRENCY", "10"))  # Answers generated at once
+EVAL_RETRIEVAL_CONCURRENCY = int(os.getenv("EVAL_RETRIEVAL_CONCURRENCY", "8"))  # Batched Weaviate search requests at once
+EVAL_RERANK_CONCURRENCY = int(os.getenv("EVAL_RERANK_CONCURRENCY", "4"))  # Result sets reranked at once
+EVAL_BATCH_POLL_INTERVAL = int(os.getenv("EVAL_BATCH_POLL_INTERVAL", "300"))  # Seconds between OpenAI batch status checks
+EVAL_FAST_GRADING = os.getenv("EVAL_FAST_GRADING", "False") == "True"  # Grade lexically obvious answers without an LLM call
 
 # LLM network isolation settings
 LLM_NETWORK_ISOLATION = os.getenv("LLM_NETWORK_ISOLATION", "False") == "True"
@@ -368,7 +393,7 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.AllowAny",  # Changed for demo purposes
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "api.auth.authentication.ProfileJWTAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ],
     "DEFAULT_THROTTLE_CLASSES": [
@@ -472,6 +497,13 @@ LOGGING = {
             'class': 'logging.StreamHandler',
             'formatter': 'simple',
         },
+        # Console output written from a background thread, for loggers
+        # used inside concurrent worker threads
+        'queued_console': {
+            'level': 'INFO',
+            'class': 'rna_backend.log_handlers.QueuedStreamHandler',
+            'formatter': 'verbose',
+        },
     },
     'root': {
         'handlers': ['console'],
@@ -493,6 +525,11 @@ LOGGING = {
             'level': 'INFO',
             'propagate': False,
         },
+        'api.evaluation': {
+            'handlers': ['queued_console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     },
 }
 
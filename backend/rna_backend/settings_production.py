@@ -149,6 +149,13 @@ LOGGING = {
             'filename': os.path.join(BASE_DIR, 'logs', 'production.log'),
             'formatter': 'verbose',
         },
+        # Console output written from a background thread, for loggers
+        # used inside concurrent worker threads
+        'queued_console': {
+            'level': 'INFO',
+            'class': 'rna_backend.log_handlers.QueuedStreamHandler',
+            'formatter': 'verbose',
+        },
     },
     'root': {
         'handlers': ['console'],
@@ -165,6 +172,11 @@ LOGGING = {
             'level': 'INFO',
             'propagate': False,
         },
+        'api.evaluation': {
+            'handlers': ['queued_console', 'file'],
+            'level': 'INFO',
+            'propagate': False,
+        },
         'gunicorn.error': {
             'handlers': ['console'],
             'level': 'INFO',
@@ -0,0 +1,162 @@
+"""
+Unit tests for the role-based permission classes.
+"""
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework.request import Request
+
+from api.auth.models import UserRole, UserPermission, UserProfile
+from api.auth.permissions import (
+    IsAdmin, IsLabManager, IsResearcher, HasRolePermission,
+    CanManageUsers, CanViewAnalytics,
+)
+
+
+def _make_request(user):
+    """Build a DRF request authenticated as the given user."""
+    django_request = APIRequestFactory().get('/')
+    force_authenticate(django_request, user=user)
+    request = Request(django_request)
+    request.user = user
+    return request
+
+
+@pytest.fixture(autouse=True)
+def locmem_cache(settings):
+    """Use an empty local-memory cache instead of Redis."""
+    settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+    cache.clear()
+
+
+@pytest.fixture
+def guest_user(db, django_capture_on_commit_callbacks):
+    """A regular user holding only the default 'guest' role."""
+    # Default roles are assigned on commit; the first user becomes admin
+    with django_capture_on_commit_callbacks(execute=True):
+        User.objects.create_user(username="first_user", password="password")
+        user = User.objects.create_user(username="guest_user", password="password")
+    return user
+
+
+@pytest.mark.django_db
+def test_default_roles_assigned(guest_user):
+    """Test that the first user is made admin and later users are guests."""
+    assert list(UserRole.objects.filter(user__username="first_user").values_list('role', flat=True)) == ['admin']
+    assert list(guest_user.roles.values_list('role', flat=True)) == ['guest']
+
+
+@pytest.mark.django_db
+def test_guest_has_no_elevated_access(guest_user):
+    """Test that the default guest role is denied every RBAC check."""
+    request = _make_request(guest_user)
+
+    assert not IsAdmin().has_permission(request, None)
+    assert not IsLabManager().has_permission(request, None)
+    assert not IsResearcher().has_permission(request, None)
+    assert not CanManageUsers().has_permission(request, None)
+
+
+@pytest.mark.django_db
+def test_role_hierarchy(guest_user):
+    """Test that higher roles satisfy lower-role permission classes."""
+    UserRole.objects.create(user=guest_user, role='manager')
+    request = _make_request(guest_user)
+
+    assert not IsAdmin().has_permission(request, None)
+    assert IsLabManager().has_permission(request, None)
+    assert IsResearcher().has_permission(request, None)
+    assert HasRolePermission(allowed_roles=['manager']).has_permission(request, None)
+    assert not HasRolePermission(allowed_roles=['student']).has_permission(request, None)
+
+
+@pytest.mark.django_db
+def test_specific_permission(guest_user):
+    """Test that explicit permissions are honoured and admins bypass them."""
+    UserPermission.objects.create(user=guest_user, permission='can_view_analytics')
+    request = _make_request(guest_user)
+
+    assert CanViewAnalytics().has_permission(request, None)
+    assert not CanManageUsers().has_permission(request, None)
+
+    UserRole.objects.create(user=guest_user, role='admin')
+    assert CanManageUsers().has_permission(_make_request(guest_user), None)
+
+
+@pytest.mark.django_db
+def test_rbac_lookup_is_memoized_per_request(guest_user):
+    """Test that stacked permission checks reuse one RBAC lookup."""
+    request = _make_request(guest_user)
+
+    # Checks the primary role cannot decide fall back to the full lookup
+    with CaptureQueriesContext(connection) as first:
+        CanManageUsers().has_permission(request, None)
+    with CaptureQueriesContext(connection) as rest:
+        CanViewAnalytics().has_permission(request, None)
+        HasRolePermission(allowed_roles=['student']).has_permission(request, None)
+
+    assert len(first) == 1
+    assert len(rest) == 0
+
+
+@pytest.mark.django_db
+def test_superuser_skips_rbac_lookup():
+    """Test that superusers are granted access without any RBAC query."""
+    superuser = User.objects.create_superuser(username="root", password="password")
+    request = _make_request(superuser)
+
+    with CaptureQueriesContext(connection) as queries:
+        assert IsAdmin().has_permission(request, None)
+        assert IsResearcher().has_permission(request, None)
+        assert CanManageUsers().has_permission(request, None)
+
+    assert len(queries) == 0
+
+
+@pytest.mark.django_db
+def test_primary_role_tracks_highest_role(guest_user):
+    """Test that the denormalized primary role follows role changes."""
+    assert UserProfile.objects.get(user=guest_user).primary_role == 'guest'
+
+    researcher = UserRole.objects.create(user=guest_user, role='researcher')
+    manager = UserRole.objects.create(user=guest_user, role='manager')
+    assert UserProfile.objects.get(user=guest_user).primary_role == 'manager'
+
+    manager.delete()
+    assert UserProfile.objects.get(user=guest_user).primary_role == 'researcher'
+
+    researcher.delete()
+    assert UserProfile.objects.get(user=guest_user).primary_role == 'guest'
+
+
+@pytest.mark.django_db
+def test_role_checks_use_loaded_profile(guest_user):
+    """Test that hierarchy checks need no query once the profile is loaded."""
+    UserRole.objects.create(user=guest_user, role='manager')
+    user = User.objects.select_related('profile').get(pk=guest_user.pk)
+    request = _make_request(user)
+
+    with CaptureQueriesContext(connection) as queries:
+        assert not IsAdmin().has_permission(request, None)
+        assert IsLabManager().has_permission(request, None)
+        assert IsResearcher().has_permission(request, None)
+
+    assert len(queries) == 0
+
+
+@pytest.mark.django_db
+def test_rbac_cache_invalidated_on_grant(guest_user):
+    """Test that cached RBAC sets are dropped when a permission is granted."""
+    assert not CanManageUsers().has_permission(_make_request(guest_user), None)
+
+    # A fresh request is served from the cache without querying
+    with CaptureQueriesContext(connection) as queries:
+        assert not CanManageUsers().has_permission(_make_request(guest_user), None)
+    assert len(queries) == 0
+
+    UserPermission.objects.create(user=guest_user, permission='can_manage_users')
+    assert CanManageUsers().has_permission(_make_request(guest_user), None)
@@ -0,0 +1,161 @@
+"""
+Unit tests for media backups to S3.
+"""
+
+import gzip
+import io
+import multiprocessing
+import os
+import tarfile
+import tempfile
+from unittest.mock import patch, MagicMock
+
+import pytest
+from django.test import override_settings
+
+pytest.importorskip("boto3")
+
+from api.backup import restore as backup_restore
+from api.backup import tasks as backup_tasks
+
+
+def _media_dir(root):
+    """Create a media directory with one large file and a few small ones."""
+    media_dir = os.path.join(root, 'media')
+    os.makedirs(os.path.join(media_dir, 'figures'))
+    files = {
+        'large.bin': os.urandom(backup_tasks.MEDIA_SHARD_THRESHOLD + 10),
+        'notes.txt': b'small file',
+        os.path.join('figures', 'fig1.png'): b'\x89PNG figure',
+    }
+    for relative_path, content in files.items():
+        with open(os.path.join(media_dir, relative_path), 'wb') as f:
+            f.write(content)
+    return media_dir, files
+
+
+def _recording_s3_client(uploads):
+    """Mock S3 client that keeps uploaded object bodies by key."""
+    def upload_file(filename, bucket, key, Config=None):
+        with open(filename, 'rb') as f:
+            uploads[key] = f.read()
+
+    def put_object(Bucket, Key, Body, ContentType=None):
+        uploads[Key] = Body
+
+    def get_object(Bucket, Key):
+        return {'Body': io.BytesIO(uploads[Key])}
+
+    def download_fileobj(bucket, key, fileobj):
+        fileobj.write(uploads[key])
+
+    s3_client = MagicMock()
+    s3_client.upload_file.side_effect = upload_file
+    s3_client.put_object.side_effect = put_object
+    s3_client.get_object.side_effect = get_object
+    s3_client.download_fileobj.side_effect = download_fileobj
+    return s3_client
+
+
+def _upload_in_daemon(media_dir, results):
+    uploads = {}
+    with patch.object(backup_tasks, 'get_s3_client', return_value=_recording_s3_client(uploads)):
+        manifest = backup_tasks.upload_media_files_to_s3(media_dir, 'media/test', 'bucket')
+    results.put(len(manifest['files']))
+
+
+def test_upload_media_files_to_s3():
+    """Test that every media file is uploaded and listed in the manifest."""
+    uploads = {}
+    s3_client = _recording_s3_client(uploads)
+
+    with tempfile.TemporaryDirectory() as root:
+        media_dir, files = _media_dir(root)
+        with patch.object(backup_tasks, 'get_s3_client', return_value=s3_client):
+            manifest = backup_tasks.upload_media_files_to_s3(media_dir, 'media/test', 'bucket')
+
+    entries = {entry['path']: entry for entry in manifest['files']}
+    assert set(entries) == set(files)
+
+    # Large files are gzipped objects of their own
+    large = entries['large.bin']
+    assert large['key'] == 'media/test/files/large.bin.gz'
+    assert gzip.decompress(uploads[large['key']]) == files['large.bin']
+
+    # Small files are bundled into a shard
+    shard_key = entries['notes.txt']['key']
+    assert shard_key.startswith('media/test/shards/')
+    with tarfile.open(fileobj=io.BytesIO(uploads[shard_key]), mode='r:gz') as tar:
+        for relative_path in ('notes.txt', os.path.join('figures', 'fig1.png')):
+            assert tar.extractfile(relative_path).read() == files[relative_path]
+
+    # The manifest is written last
+    s3_client.put_object.assert_called_once()
+    assert s3_client.put_object.call_args.kwargs['Key'] == 'media/test/manifest.json'
+
+
+@pytest.mark.skipif(
+    'fork' not in multiprocessing.get_all_start_methods(),
+    reason="Requires the fork start method"
+)
+def test_upload_media_files_to_s3_in_daemonic_process():
+    """Test the upload from a daemonic process, like a Celery prefork child."""
+    context = multiprocessing.get_context('fork')
+    results = context.Queue()
+
+    with tempfile.TemporaryDirectory() as root:
+        media_dir, files = _media_dir(root)
+        process = context.Process(target=_upload_in_daemon, args=(media_dir, results), daemon=True)
+        process.start()
+        process.join(timeout=60)
+
+    assert process.exitcode == 0
+    assert results.get(timeout=5) == len(files)
+
+
+def test_restore_media_from_s3_verifies_checksums():
+    """Test that restored files match the backup and corrupt ones are rejected."""
+    uploads = {}
+    s3_client = _recording_s3_client(uploads)
+
+    with tempfile.TemporaryDirectory() as root:
+        media_dir, files = _media_dir(root)
+        restore_dir = os.path.join(root, 'restored')
+        with patch.object(backup_tasks, 'get_s3_client', return_value=s3_client), \
+             patch.object(backup_restore, 'get_s3_client', return_value=s3_client), \
+             override_settings(MEDIA_ROOT=restore_dir):
+            manifest = backup_tasks.upload_media_files_to_s3(media_dir, 'media/test', 'bucket')
+            result = backup_restore.restore_media_from_s3('test', bucket_name='bucket')
+
+            assert result['file_count'] == len(files)
+            for relative_path, content in files.items():
+                with open(os.path.join(restore_dir, relative_path), 'rb') as f:
+                    assert f.read() == content
+
+            # A file whose content doesn't match the manifest is not written
+            large_key = next(entry['key'] for entry in manifest['files'] if entry['path'] == 'large.bin')
+            uploads[large_key] = gzip.compress(b'corrupted')
+            with pytest.raises(Exception, match='Checksum mismatch'):
+                backup_restore.restore_media_from_s3('test', paths=['large.bin'], bucket_name='bucket')
+            with open(os.path.join(restore_dir, 'large.bin'), 'rb') as f:
+                assert f.read() == files['large.bin']
+            assert not [name for name in os.listdir(restore_dir) if name.startswith('.restore_')]
+
+
+def test_finalize_full_backup_records_media_manifest():
+    """Test that a per-file S3 media backup is recorded by its manifest key."""
+    postgres = {'status': 'success', 'backup_file': '/backups/postgres/db.sql.gz'}
+    weaviate = {'status': 'success', 'path': 'weaviate_backup_1'}
+    media = {
+        'status': 'success',
+        'backup_name': 'media_backup_1',
+        'manifest_key': 'media/media_backup_1/manifest.json',
+        'file_count': 3,
+    }
+
+    with patch.object(backup_tasks, 'AuditCollector') as audit_collector:
+        summary = backup_tasks.finalize_full_backup([postgres, weaviate, media])
+
+    assert summary['media'] == 'media/media_backup_1/manifest.json'
+    assert summary['media_file_count'] == 3
+    assert audit_collector.record_audit_event.call_args.kwargs['details'] == summary
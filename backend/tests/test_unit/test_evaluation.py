@@ -0,0 +1,188 @@
+"""
+Unit tests for the evaluation pipeline, with OpenAI and Weaviate mocked.
+"""
+
+import json
+import random
+import sys
+import types
+from unittest.mock import patch, MagicMock, AsyncMock
+
+import pytest
+from django.test import override_settings
+
+from api.models import EvaluationSet, ReferenceQuestion, EvaluationRun, QuestionResult
+from api.evaluation import evaluation_utils
+from api.evaluation.evaluation_utils import (
+    calculate_source_overlap,
+    calculate_source_overlap_batch,
+    resume_evaluation,
+    run_evaluation,
+    _parse_relevance_batch_scores,
+)
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+class FakeQueryView:
+    """Stands in for QueryView's RAG pipeline steps."""
+
+    def rerank_results(self, question_text, results):
+        return results
+
+    def build_prompt(self, question_text, results):
+        return f"Answer: {question_text}"
+
+    def extract_sources(self, results):
+        return [{"title": result["title"]} for result in results]
+
+    def select_model(self, question_text, results):
+        return "gpt-4o"
+
+    def calculate_confidence_score(self, answer, results):
+        return 0.9
+
+
+def _completion(content):
+    return MagicMock(choices=[MagicMock(message=MagicMock(content=content))])
+
+
+def _openai_client(answer_calls, failing=()):
+    """Mock AsyncOpenAI client answering questions and grading every answer 0.8."""
+    async def create(**request):
+        if request.get("response_format"):
+            count = int(request["messages"][-1]["content"].split()[0])
+            return _completion(json.dumps({"scores": [0.8] * count}))
+        prompt = request["messages"][-1]["content"]
+        answer_calls.append(prompt)
+        if any(prompt.endswith(question) for question in failing):
+            raise ValueError("Unexpected response")
+        return _completion(f"Answer to {prompt}")
+
+    client = MagicMock()
+    client.chat.completions.create = AsyncMock(side_effect=create)
+    client.close = AsyncMock()
+    return client
+
+
+def _search_results(query_texts, **kwargs):
+    """Mock batched Weaviate search, one result per query."""
+    return [[{"content": f"About {text}", "title": "Paper A"}] for text in query_texts]
+
+
+@pytest.fixture
+def evaluation_set(db):
+    evaluation_set = EvaluationSet.objects.create(name="Test set")
+    for number in range(5):
+        ReferenceQuestion.objects.create(
+            evaluation_set=evaluation_set,
+            question_text=f"Question {number}",
+            question_type="factoid",
+            expected_answer=f"Expected answer {number}",
+            expected_sources=[{"title": "Paper A"}],
+        )
+    return evaluation_set
+
+
+def _run_mocked(function, *args, answer_calls, failing=()):
+    with patch.dict(sys.modules, {'api.views': types.SimpleNamespace(QueryView=FakeQueryView)}), \
+         patch.object(evaluation_utils, 'search_weaviate_batch', side_effect=_search_results), \
+         patch.object(evaluation_utils, 'get_embeddings_with_cache', side_effect=lambda texts: [None] * len(texts)), \
+         patch.object(evaluation_utils, 'create_async_openai_client',
+                      return_value=_openai_client(answer_calls, failing)):
+        return function(*args)
+
+
+@pytest.mark.django_db(transaction=True)
+@override_settings(CACHES=LOCMEM_CACHE)
+def test_run_evaluation_saves_results_and_counters(evaluation_set):
+    """Test that a sync run saves each answered question and counts outcomes."""
+    answer_calls = []
+    evaluation_run = _run_mocked(
+        run_evaluation, evaluation_set.id, answer_calls=answer_calls, failing=("Question 4",)
+    )
+
+    evaluation_run.refresh_from_db()
+    assert evaluation_run.status == 'completed'
+    assert evaluation_run.total_questions == 5
+    assert evaluation_run.success_count == 4
+    assert evaluation_run.failure_count == 1
+
+    results = QuestionResult.objects.filter(evaluation_run=evaluation_run)
+    assert results.count() == 4
+    for result in results:
+        assert result.answer == f"Answer to Answer: {result.reference_question.question_text}"
+        assert result.answer_relevance == 0.8
+        assert result.retrieval_precision == 1.0
+    assert evaluation_run.average_answer_relevance == pytest.approx(0.8)
+
+
+@pytest.mark.django_db(transaction=True)
+@override_settings(CACHES=LOCMEM_CACHE)
+def test_resume_evaluation_skips_answered_questions(evaluation_set):
+    """Test that resuming a run only evaluates questions without a result."""
+    evaluation_run = EvaluationRun.objects.create(
+        evaluation_set=evaluation_set, status='running', mode='sync', total_questions=5
+    )
+    answered = list(evaluation_set.questions.order_by('id')[:2])
+    for question in answered:
+        QuestionResult.objects.create(
+            evaluation_run=evaluation_run, reference_question=question, answer="Saved answer",
+            sources=[], confidence_score=0.9, retrieval_precision=1.0, answer_relevance=0.8
+        )
+
+    answer_calls = []
+    evaluation_run = _run_mocked(resume_evaluation, evaluation_run.id, answer_calls=answer_calls)
+
+    assert len(answer_calls) == 3
+    assert not any(prompt.endswith(question.question_text) for prompt in answer_calls for question in answered)
+
+    evaluation_run.refresh_from_db()
+    assert evaluation_run.status == 'completed'
+    assert evaluation_run.success_count == 5
+    assert evaluation_run.failure_count == 0
+    assert QuestionResult.objects.filter(evaluation_run=evaluation_run).count() == 5
+
+
+@pytest.mark.django_db
+def test_resume_evaluation_requires_running_sync_run(evaluation_set):
+    """Test that only running sync runs can be resumed."""
+    evaluation_run = EvaluationRun.objects.create(
+        evaluation_set=evaluation_set, status='completed', mode='sync', total_questions=5
+    )
+    with pytest.raises(ValueError):
+        resume_evaluation(evaluation_run.id)
+
+
+def test_parse_relevance_batch_scores():
+    """Test parsing of batch grading replies, including malformed ones."""
+    assert _parse_relevance_batch_scores('{"scores": [0.2, 1.5, -1]}', 3) == [0.2, 1.0, 0.0]
+
+    # Malformed JSON or a missing scores list leaves every score ungraded
+    assert _parse_relevance_batch_scores('{"scores": [0.2,', 2) == [None, None]
+    assert _parse_relevance_batch_scores('[0.2, 0.4]', 2) == [None, None]
+    assert _parse_relevance_batch_scores('{"grades": [0.2]}', 1) == [None]
+
+    # Short arrays and non-numeric entries leave just those scores ungraded
+    assert _parse_relevance_batch_scores('{"scores": [0.4]}', 3) == [0.4, None, None]
+    assert _parse_relevance_batch_scores('{"scores": [0.4, "n/a", null]}', 3) == [0.4, None, None]
+
+
+def test_calculate_source_overlap_batch_matches_single():
+    """Test that the vectorized overlap matches calculate_source_overlap."""
+    rng = random.Random(0)
+    titles = ["Paper A", "paper a", "Paper B", "Protocol C", "Thesis D", ""]
+
+    def random_sources():
+        return [{"title": rng.choice(titles)} for _ in range(rng.randint(0, 5))]
+
+    sources_list = [random_sources() for _ in range(200)]
+    expected_list = [random_sources() for _ in range(200)]
+
+    batch_scores = calculate_source_overlap_batch(sources_list, expected_list)
+    single_scores = [
+        calculate_source_overlap(sources, expected_sources)
+        for sources, expected_sources in zip(sources_list, expected_list)
+    ]
+    assert batch_scores == pytest.approx(single_scores)
+    assert calculate_source_overlap_batch([], []) == []